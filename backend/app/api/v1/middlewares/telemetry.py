@@ -0,0 +1,44 @@
+import time
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.core.telemetry import start_request_summary
+
+INSTRUMENTED_PREFIX = "/api/v1/"
+
+
+class TelemetryMiddleware(BaseHTTPMiddleware):
+    """Attach a per-request LLM/stage summary to API responses.
+
+    Headers:
+        X-LLM-Calls, X-LLM-Prompt-Tokens, X-LLM-Completion-Tokens,
+        X-LLM-Cached-Tokens, X-LLM-Retries, X-LLM-Cost-USD,
+        X-Embedding-Tokens, X-Embedding-Cost-USD
+        Server-Timing: llm, each timed stage (embedding, qdrant, neo4j, ...) and total
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if not request.url.path.startswith(INSTRUMENTED_PREFIX):
+            return await call_next(request)
+
+        summary = start_request_summary()
+        start = time.perf_counter()
+        response = await call_next(request)
+        total = time.perf_counter() - start
+
+        # Streaming responses send headers before the body is produced, so for
+        # them these values only cover work done before the first byte.
+        with summary.lock:
+            response.headers["X-LLM-Calls"] = str(summary.llm_calls)
+            response.headers["X-LLM-Prompt-Tokens"] = str(summary.prompt_tokens)
+            response.headers["X-LLM-Completion-Tokens"] = str(summary.completion_tokens)
+            response.headers["X-LLM-Cached-Tokens"] = str(summary.cached_tokens)
+            response.headers["X-LLM-Retries"] = str(summary.retries)
+            response.headers["X-LLM-Cost-USD"] = f"{summary.cost_usd:.6f}"
+            response.headers["X-Embedding-Tokens"] = str(summary.embedding_tokens)
+            response.headers["X-Embedding-Cost-USD"] = f"{summary.embedding_cost_usd:.6f}"
+            timings = [f"llm;dur={summary.llm_seconds * 1000:.1f}"]
+            timings += [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in summary.stages.items()]
+            timings.append(f"total;dur={total * 1000:.1f}")
+            response.headers["Server-Timing"] = ", ".join(timings)
+        return response
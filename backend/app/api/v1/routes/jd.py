@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from typing import Optional, Union
-import shutil
-import os
-from app.modules.loaders import load_file
-from app.prompts.job_description import extract_jd
-from app.llms.azure_openai_client import azure_client
+import asyncio
+from app.modules.loaders import load_urls
 from app.core.security import get_current_user
+from app.core.telemetry import timed
 from app.db.neo4j import (
     Neo4jDB,
     get_db
 )
-import uuid
 from app.services.crawl_jd_service import crawl_and_extract
+from app.services.jd_service import ingest_jd
+from app.services.parsing_service import ParseError, get_parsing_service
 
 router = APIRouter(prefix="/api/v1", tags=["Job descripton"])
 
@@ -27,33 +26,41 @@ async def get_jd_from_file(
     """
     
     try:
-        jobs = await crawl_and_extract(job_title, "Vietnam", max_pages=2, sleep_between=(2, 5))
+        crawl = await crawl_and_extract(job_title, "Vietnam", max_pages=2, db=db)
         results = []
-        for job in jobs:
+        failed = []
+        retry = []
+        for job in crawl.jobs:
             title = job.get("title")
             company = job.get("company")
             description = job.get("description")
             link = job.get("link")
-
-            prompt = extract_jd(description)
-            llm_response = azure_client.invoke_model(prompt)
-
-            db.create_job_description(
-                jd_id=str(uuid.uuid4()),
-                file_path="None",
-                url=link,
-                type_="",
-                jd=llm_response
-            )
+            if not description:
+                # Kept on the crawl cursor, so the next crawl fetches it again.
+                retry.append(job)
+                failed.append({"title": title, "company": company, "url": link, "error": "No job description found"})
+                continue
+
+            # LLM extraction may block on rate-limit waits; keep it off the event loop.
+            try:
+                stored = await asyncio.to_thread(ingest_jd, db, description, url=link, file_path="None", type_="")
+            except ValueError as e:
+                # One unparseable JD must not abort the rest of the batch.
+                retry.append(job)
+                failed.append({"title": title, "company": company, "url": link, "error": str(e)})
+                continue
 
             results.append({
+                "jd_id": stored["jd_id"],
+                "status": stored["status"],
                 "title": title,
                 "company": company,
                 "url": link,
-                "processed_jd": llm_response
+                "processed_jd": stored["jd"]
             })
 
-        return {"status": "success", "count": len(results), "data": results}
+        await crawl.save_cursor(db, failed=retry)
+        return {"status": "success", "count": len(results), "data": results, "failed": failed}
 
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -72,18 +79,21 @@ async def upload_jd(
     """
     file_path = None
     jd_text = None
-    UPLOAD_DIR = "uploads"
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
     if file and isinstance(file, UploadFile) and file.filename:
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        documents = load_file(file_path)
+        # Parsed from memory; only the original file name is recorded.
+        file_path = file.filename
+        content = await file.read()
+
+        with timed("parse"):
+            try:
+                documents = await get_parsing_service().parse(content, file.filename)
+            except ParseError as e:
+                return {"error": "Could not read JD content", "detail": e.as_dict()}
         jd_text = " ".join([doc.text for doc in documents]) if documents else None
 
     elif url:
-        documents = load_file([url])
+        with timed("parse"):
+            documents = await load_urls([url])
         jd_text = " ".join([doc.text for doc in documents]) if documents else None
 
     else:
@@ -92,20 +102,18 @@ async def upload_jd(
     if not jd_text:
         return {"error": "Could not read JD content"}
 
-    prompt = extract_jd(jd_text)
-    llm_response = azure_client.invoke_model(prompt)
-
-    db.create_job_description(
-        jd_id=str(uuid.uuid4()),
-        file_path=file_path,
-        url=url,
-        type_=type_,
-        jd=llm_response
-    )
-    db.close()
+    try:
+        stored = await asyncio.to_thread(ingest_jd, db, jd_text, url=url, file_path=file_path, type_=type_)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Could not extract a job description: {e}")
+    finally:
+        db.close()
 
     return {
-        "message": "JD uploaded successfully",
+        "message": "JD already stored" if stored["status"] == "unchanged" else "JD uploaded successfully",
+        "jd_id": stored["jd_id"],
+        "status": stored["status"],
+        "version_of": stored["version_of"],
         "file_path": file_path,
         "url": url,
         "type": type_,
@@ -126,6 +134,7 @@ async def list_jds(limit: int = Query(20, description="Maximum number of JDs to
             "file_path": jd.get("file_path"),
             "url": jd.get("url"),
             "type": jd.get("type"),
+            "version": jd.get("version"),
             "jd_preview": jd.get("jd"),
         })
 
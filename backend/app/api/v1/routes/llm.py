@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from app.core.security import get_current_user
+from app.llms.router import get_llm_router
+
+router = APIRouter(prefix="/api/v1/llm", tags=["LLM"])
+
+
+@router.get("/routing-stats")
+async def get_routing_stats(current_user: str = Depends(get_current_user)):
+    """
+    Rolling p50/p95 latency, error rate and health per LLM provider
+    """
+    return get_llm_router().get_stats()
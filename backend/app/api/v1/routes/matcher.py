@@ -1,20 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 from llama_index.core.schema import Document
-from typing import List, Optional, Union
+from dataclasses import replace
+from typing import List, Literal, Optional, Union
 import shutil
 import os
 import uuid
 import json
+import asyncio
 from datetime import datetime
-from app.services.evaluation_candidate_service import openai_service
-from app.llms.azure_openai_client import azure_client
+from app.services.evaluation_candidate_service import get_evaluation_service
+from app.services.pre_scoring_service import PreScoringGate, GateDecision
+from app.services.fast_scoring_service import get_fast_scorer
 from app.core.config import settings
+from app.core.telemetry import timed, get_request_summary
 from app.core.security import get_current_user
 from app.db.neo4j import (
     Neo4jDB,
     get_db
 )
-from app.db.qdrant import vector_search
+from app.db.qdrant import get_vector_search
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/v1", tags=["Matcher"])
@@ -23,6 +28,108 @@ class MatchRequest(BaseModel):
     question: Union[str, dict]
     number_candidate: int = 5
     job_description: Optional[str] = ""
+    use_gate: bool = settings.PRESCORE_ENABLED
+    gate_threshold: Optional[float] = None
+    gate_top_m: Optional[int] = None
+    scoring_mode: Literal["llm", "fast"] = "llm"
+
+
+def _query_text(req: MatchRequest) -> str:
+    if isinstance(req.question, dict):
+        return json.dumps(req.question, ensure_ascii=False)
+    return req.question
+
+
+async def _fetch_resume_texts(results) -> List[Optional[str]]:
+    vector_search = get_vector_search()
+    return await asyncio.gather(*[
+        asyncio.to_thread(vector_search.get_resume_text_by_talent_id, candidate_info["talent_id"])
+        for candidate_info, _ in results
+    ])
+
+
+def _gate_active(req: MatchRequest) -> bool:
+    # Fast mode is already cheap enough to score everyone.
+    return req.use_gate and req.scoring_mode == "llm"
+
+
+def _retrieval_size(req: MatchRequest) -> int:
+    """Over-fetch when gating, so the gate has more than ``number_candidate`` to choose from."""
+    if _gate_active(req):
+        return req.number_candidate * max(1, settings.PRESCORE_OVERFETCH)
+    return req.number_candidate
+
+
+def _gate(req: MatchRequest, results, resume_texts):
+    """Shortlist ``number_candidate`` candidates (similarity order kept) and their gate decisions.
+
+    Returns:
+        Tuple[list, list, list]: results, resume texts and decisions (None when not gating).
+    """
+    if req.use_gate and req.scoring_mode == "fast":
+        # Everyone is fast-scored; gate scores are reported (preScore) but skip nobody.
+        decisions = PreScoringGate(threshold=req.gate_threshold, top_m=req.gate_top_m).select(
+            req.job_description,
+            [(similarity_score, resume_text) for (_, similarity_score), resume_text in zip(results, resume_texts)],
+        )
+        return results, resume_texts, [replace(decision, passed=True) for decision in decisions]
+    if not _gate_active(req):
+        return results, resume_texts, [None] * len(results)
+    gate = PreScoringGate(threshold=req.gate_threshold, top_m=req.gate_top_m)
+    decisions = gate.select(
+        req.job_description,
+        [(similarity_score, resume_text) for (_, similarity_score), resume_text in zip(results, resume_texts)],
+        limit=req.number_candidate,
+    )
+    kept = [i for i, decision in enumerate(decisions) if decision is not None]
+    return [results[i] for i in kept], [resume_texts[i] for i in kept], [decisions[i] for i in kept]
+
+
+def _pre_score(decision: Optional[GateDecision]) -> dict:
+    return {"preScore": decision.score, "preScoreDetails": decision.details} if decision else {}
+
+
+async def _score_candidate(candidate_info, similarity_score, resume_text: Optional[str],
+                           job_description: str, decision: Optional[GateDecision] = None,
+                           mode: str = "llm") -> dict:
+    pre_score = _pre_score(decision)
+    if not resume_text:
+        return {
+            **candidate_info,
+            "similarityScore": similarity_score,
+            **pre_score,
+            "qualificationScore": None,
+            "scoringDetails": {}
+        }
+    if decision and not decision.passed:
+        return {
+            **candidate_info,
+            "similarityScore": similarity_score,
+            **pre_score,
+            "qualificationScore": None,
+            "scoringDetails": {"skipped": "Below pre-scoring gate"}
+        }
+
+    try:
+        scoring_result = await get_evaluation_service().score_candidate_qualifications(
+            candidate_resume=resume_text,
+            job_description=job_description,
+            mode=mode
+        )
+    except Exception as e:
+        scoring_result = {"error": str(e)}
+
+    return {
+        **candidate_info,
+        "similarityScore": similarity_score,
+        **pre_score,
+        "qualificationScore": scoring_result.get("totalScore") if isinstance(scoring_result, dict) else None,
+        "scoringDetails": scoring_result
+    }
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
 
 
 @router.post("/find_matching_candidates_score/")
@@ -32,47 +139,113 @@ async def retrieve_score(
     current_user: str = Depends(get_current_user)
 ):
 
-    if isinstance(req.question, dict):
-        query_text = json.dumps(req.question, ensure_ascii=False)
-    else:
-        query_text = req.question
-    results = vector_search.retrieve_from_qdrant_neo4j(query_text=query_text,
-                                                       number_candidate=req.number_candidate)
+    query_text = _query_text(req)
+    results = get_vector_search().retrieve_from_qdrant_neo4j(query_text=query_text,
+                                                       number_candidate=_retrieval_size(req))
     print(f"Retrieved results: {results}")
     if not results:
         raise HTTPException(status_code=404, detail="No results found")
 
-    enriched_results = []
-    for candidate_info, similarity_score in results:
-        talent_id = candidate_info["talent_id"]
+    resume_texts = await _fetch_resume_texts(results)
+    results, resume_texts, decisions = _gate(req, results, resume_texts)
 
-        resume_text = vector_search.get_resume_text_by_talent_id(talent_id)
-        if not resume_text:
-            enriched_results.append({
+    if req.scoring_mode == "fast":
+        # One similarity matrix for the whole candidate list instead of one per candidate.
+        scored = await asyncio.to_thread(get_fast_scorer().score_many, req.job_description,
+                                         [text or "" for text in resume_texts])
+        enriched_results = [
+            {
                 **candidate_info,
                 "similarityScore": similarity_score,
-                "qualificationScore": None,
-                "scoringDetails": {}
-            })
-            continue
+                **_pre_score(decision),
+                "qualificationScore": scoring_result["totalScore"] if resume_text else None,
+                "scoringDetails": scoring_result if resume_text else {},
+            }
+            for (candidate_info, similarity_score), resume_text, scoring_result, decision
+            in zip(results, resume_texts, scored, decisions)
+        ]
+    else:
+        enriched_results = []
+        for (candidate_info, similarity_score), resume_text, decision in zip(results, resume_texts, decisions):
+            enriched_results.append(
+                await _score_candidate(candidate_info, similarity_score, resume_text, req.job_description, decision)
+            )
+    with timed("neo4j_write"):
+        db.upload_matching_results({"results": enriched_results})
+    print(f"Enriched results: {enriched_results}")
+    return {"results": enriched_results}
 
+@router.post("/find_matching_candidates_score/stream")
+async def retrieve_score_stream(
+    req: MatchRequest,
+    db: Neo4jDB = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Server-sent events variant of /find_matching_candidates_score/.
+
+    Events:
+        candidates: similarity-ranked candidates, sent as soon as retrieval finishes
+        shortlist: with the pre-scoring gate, the ranks (in "candidates") that will be scored
+        score: one candidate's scoring result (with its "rank" in the candidates list)
+        done: the complete result set (after it has been persisted) and the request's telemetry summary
+    """
+    query_text = _query_text(req)
+    results = await asyncio.to_thread(get_vector_search().retrieve_from_qdrant_neo4j,
+                                      query_text=query_text,
+                                      number_candidate=_retrieval_size(req))
+    if not results:
+        raise HTTPException(status_code=404, detail="No results found")
+
+    async def score_at(rank, candidate_info, similarity_score, resume_text, decision):
+        return rank, await _score_candidate(candidate_info, similarity_score, resume_text,
+                                            req.job_description, decision, req.scoring_mode)
+
+    async def event_stream():
+        # Retrieval results go out before resumes are fetched and gated.
+        yield _sse_event("candidates", {"results": [
+            {**candidate_info, "similarityScore": similarity_score}
+            for candidate_info, similarity_score in results
+        ]})
+
+        resume_texts = await _fetch_resume_texts(results)
+        shortlist, resume_texts, decisions = _gate(req, results, resume_texts)
+        # _gate returns a subset of the same result objects; ranks stay those of "candidates".
+        rank_of = {id(result): rank for rank, result in enumerate(results)}
+        ranks = [rank_of[id(result)] for result in shortlist]
+        if _gate_active(req):
+            yield _sse_event("shortlist", {"ranks": ranks})
+
+        enriched_results = [None] * len(shortlist)
+        tasks = [
+            asyncio.create_task(score_at(index, candidate_info, similarity_score, resume_text, decision))
+            for index, ((candidate_info, similarity_score), resume_text, decision)
+            in enumerate(zip(shortlist, resume_texts, decisions))
+        ]
         try:
-            scoring_result = await openai_service.score_candidate_qualifications(
-                candidate_resume=resume_text,
-                job_description=req.job_description
-            )
-        except Exception as e:
-            scoring_result = {"error": str(e)}
+            for next_done in asyncio.as_completed(tasks):
+                index, enriched = await next_done
+                enriched_results[index] = enriched
+                yield _sse_event("score", {"rank": ranks[index], **enriched})
+        finally:
+            # Client disconnected mid-stream: stop paying for the remaining LLM calls.
+            for task in tasks:
+                task.cancel()
 
-        enriched_results.append({
-            **candidate_info,
-            "similarityScore": similarity_score,
-            "qualificationScore": scoring_result.get("totalScore") if isinstance(scoring_result, dict) else None,
-            "scoringDetails": scoring_result
+        with timed("neo4j_write"):
+            await asyncio.to_thread(db.upload_matching_results, {"results": enriched_results})
+        # Response headers went out before scoring started, so the full summary rides on "done".
+        summary = get_request_summary()
+        yield _sse_event("done", {
+            "results": enriched_results,
+            "telemetry": summary.as_dict() if summary else None,
         })
-    db.upload_matching_results({"results": enriched_results})
-    print(f"Enriched results: {enriched_results}")
-    return {"results": enriched_results}
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/matching-results/")
 async def get_matching_results(
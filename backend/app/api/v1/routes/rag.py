@@ -110,7 +110,7 @@ async def upload_jd_from_file(
     """
     
     try:
-        jobs = await crawl_and_extract(job_title, "Vietnam", max_pages=2, sleep_between=(2, 5))
+        jobs = (await crawl_and_extract(job_title, "Vietnam", max_pages=2)).jobs
         results = []
         for job in jobs:
             title = job.get("title")
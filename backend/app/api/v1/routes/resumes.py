@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
-from llama_index.core.schema import Document
+from fastapi.responses import JSONResponse
 from typing import List, Optional, Union
-import shutil
-import os
 import uuid
-import json
-from datetime import datetime
-from app.modules.loaders import load_file
-from app.prompts.resumes import extract_resume
-from app.llms.azure_openai_client import azure_client
+import asyncio
 from app.core.config import settings
 from app.core.security import get_current_user
 from app.db.neo4j import (
     Neo4jDB,
     get_db
 )
-from app.db.qdrant import vector_search
+from app.db.qdrant import get_vector_search
+from app.services.resume_ingest_service import (
+    IngestionError,
+    VectorIndexError,
+    ingest_resume_file,
+    update_resume_file
+)
+from app.services.ingestion_queue import get_ingestion_queue
 
 router = APIRouter(prefix="/api/v1", tags=["Resumes"])
 
@@ -23,67 +24,61 @@ router = APIRouter(prefix="/api/v1", tags=["Resumes"])
 @router.post("/upload-resume/")
 async def load_documents(
     files: List[UploadFile] = File(...),
+    background: bool = Query(False, description="Queue files and return a job id instead of waiting "
+                                                "(single API worker only)"),
+    force: bool = Query(False, description="Re-process files that match an existing candidate"),
     db: Neo4jDB = Depends(get_db),
     current_user: str = Depends(get_current_user)
 ):
-    temp_dir = "temp"
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
     processing_results = []
+    queued_files = []
     if len(files) > 10:
         raise HTTPException(status_code=400, detail="Too many files. Maximum 10 files allowed.")
     for file in files:
         file_result = {"filename": file.filename, "status": "processing"}
+        processing_results.append(file_result)
         if not file.filename:
             file_result.update({"status": "error", "error": "Filename is required"})
-            processing_results.append(file_result)
             continue
-        unique_filename = f"{uuid.uuid4()}_{file.filename}"
-        file_path = os.path.join(temp_dir, unique_filename)
-        talent_id = str(uuid.uuid4())
         try:
-            with open(file_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
+            content = await file.read()
         except Exception as e:
-            file_result.update({"status": "error", "error": f"Error saving file: {e}"})
-            processing_results.append(file_result)
+            file_result.update({"status": "error", "error": f"Error reading file: {e}"})
             continue
+        file_size = file.size if hasattr(file, 'size') else len(content)
+        queued_files.append({"content": content, "filename": file.filename, "file_size": file_size,
+                             "result": file_result})
+
+    async def process(entry):
+        file_result = entry["result"]
         try:
-            documents = load_file(file_path)
-            if not documents:
-                file_result.update({"status": "error", "error": "No documents found in file"})
-                processing_results.append(file_result)
-                continue
-            prompt = extract_resume(documents)
-            llm_response = azure_client.invoke_model(prompt)
-            parse_json_llm = azure_client.parse_json_string(llm_response)
-            print(f"Parsed JSON from LLM: {llm_response}")
-            full_name = parse_json_llm.get("full_name")
-
-            db.process_cv(parse_json_llm, talent_id, full_name)
-
-            doc_metadata = {
-                "source_file": file.filename,
-                "talent_id": talent_id,
-                "full_name": full_name,
-                "processing_timestamp": datetime.now().isoformat(),
-                "file_type": file.filename.split('.')[-1].lower() if '.' in file.filename else "unknown",
-                "file_size": file.size if hasattr(file, 'size') else None,
-            }
-
-            docs = [Document(text=json.dumps(parse_json_llm, ensure_ascii=False), metadata=doc_metadata)]
-            vector_search.create_vector_index(docs, settings.QDRANT_COLLECTION_NAME)
-
-            file_result.update({"status": "success", "metadata": doc_metadata})
+            metadata = await ingest_resume_file(entry["content"], entry["filename"], entry["file_size"], db=db,
+                                                force=force)
+            file_result.update({"status": "success", "metadata": metadata})
         except Exception as e:
             file_result.update({"status": "error", "error": f"Error processing file: {e}"})
-        finally:
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception as cleanup_error:
-                    print(f"Warning: Could not remove {file_path}: {cleanup_error}")
-        processing_results.append(file_result)
+
+    if background:
+        rejected_files = [r for r in processing_results if r["status"] == "error"]
+        if not queued_files:
+            raise HTTPException(status_code=400, detail={"file_results": rejected_files})
+        try:
+            job = get_ingestion_queue().submit([
+                {**{key: entry[key] for key in ("content", "filename", "file_size")}, "force": force}
+                for entry in queued_files
+            ])
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=f"{e}; retry with background=false")
+        return JSONResponse(status_code=202, content={
+            "message": f"Queued {len(queued_files)} files for ingestion",
+            "job_id": job.job_id,
+            "status_url": f"/api/v1/jobs/{job.job_id}",
+            "rejected_files": rejected_files,
+        })
+
+    # All files run through the pipeline at once; results stay in upload order.
+    await asyncio.gather(*[process(entry) for entry in queued_files])
+
     successful_files = [r for r in processing_results if r["status"] == "success"]
     failed_files = [r for r in processing_results if r["status"] == "error"]
 
@@ -95,9 +90,42 @@ async def load_documents(
         "file_results": processing_results
     }
 
+
+@router.get("/jobs/{job_id}")
+def get_ingestion_job(job_id: str, current_user: str = Depends(get_current_user)):
+    job = get_ingestion_queue().get(job_id)
+    if not job:
+        # Jobs are kept in this process only and are lost on restart.
+        raise HTTPException(status_code=404, detail=f"job_id {job_id} not found (job status is not kept "
+                                                    f"across restarts).")
+    return job.as_dict()
+
+@router.put("/resume/{talent_id}")
+async def update_resume(
+    talent_id: str,
+    file: UploadFile = File(...),
+    force: bool = Query(False, description="Re-extract even if the file content is unchanged"),
+    db: Neo4jDB = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Replace an existing candidate's resume, keeping its talent_id
+    """
+    content = await file.read()
+    try:
+        metadata = await update_resume_file(talent_id, content, file.filename, len(content), db=db, force=force)
+    except IngestionError as e:
+        status_code = 404 if (e.detail or {}).get("code") == "not_found" else 400
+        raise HTTPException(status_code=status_code, detail=e.detail or str(e))
+    except VectorIndexError as e:
+        raise HTTPException(status_code=503, detail=f"{e}. Retry the upload to finish the update.")
+    finally:
+        db.close()
+    return {"status": "unchanged" if metadata.get("unchanged") else "updated", "metadata": metadata}
+
 @router.get("/resume/{talent_id}")
 def get_resume(talent_id: str):
-    resume = vector_search.get_resume_by_talent_id(settings.QDRANT_COLLECTION_NAME, 
+    resume = get_vector_search().get_resume_by_talent_id(settings.QDRANT_COLLECTION_NAME, 
                                                    talent_id)
     if not resume:
         raise HTTPException(status_code=404, detail=f"talent_id {talent_id} not found.")
@@ -105,15 +133,20 @@ def get_resume(talent_id: str):
 
 @router.get("/resumes/all")
 def get_all_resumes():
-    resumes = vector_search.get_all_resumes(settings.QDRANT_COLLECTION_NAME)
+    resumes = get_vector_search().get_all_resumes(settings.QDRANT_COLLECTION_NAME)
     if not resumes:
         raise HTTPException(status_code=404, detail="There is no resume in the system.")
     return {"resumes": resumes}
 
 @router.delete("/candidates/{talent_id}")
-async def delete_candidate(talent_id: str):
+async def delete_candidate(talent_id: str, db: Neo4jDB = Depends(get_db)):
 
-    message = vector_search.delete_candidate_by_talent_id(settings.QDRANT_COLLECTION_NAME, 
-                                                          talent_id)
+    try:
+        message = get_vector_search().delete_candidate_by_talent_id(settings.QDRANT_COLLECTION_NAME, 
+                                                              talent_id)
+        # Without this the Employee subgraph is left behind and still matches retrieval.
+        db.delete_employee(talent_id)
+    finally:
+        db.close()
 
     return {"message": message}
\ No newline at end of file
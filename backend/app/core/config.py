@@ -2,14 +2,19 @@ import os
 from dotenv import load_dotenv
 from llama_index.core import Settings
 from llama_index.core.constants import DEFAULT_TEMPERATURE
-from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
-from llama_index.llms.azure_openai import AzureOpenAI
-from llama_index.embeddings.bedrock import BedrockEmbedding
-from llama_index.llms.bedrock import Bedrock
 from typing import Dict
-from llama_index.core.settings import Settings
 load_dotenv()
 
+
+def _parse_mapping(value: str, cast=str) -> Dict:
+    """Parse ``"key=value,key2=value2"`` env strings into a dict."""
+    mapping = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            key, val = item.split("=", 1)
+            mapping[key.strip()] = cast(val.strip())
+    return mapping
+
 class Config:
     NEO4J_URI = os.getenv("NEO4J_URI")
     NEO4J_USER = os.getenv("NEO4J_USERNAME")
@@ -30,7 +35,93 @@ class Config:
     AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
     API_VERSION = os.getenv("API_VERSION")
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    
+    MODEL = os.getenv("MODEL", "gpt-4o")
+
+    # LLM rate limiting / retries. Per-provider overrides: "azure-openai=300,bedrock=50"
+    LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", 60))
+    LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", 90000))
+    LLM_RPM_LIMITS = _parse_mapping(os.getenv("LLM_RPM_LIMITS"), int)
+    LLM_TPM_LIMITS = _parse_mapping(os.getenv("LLM_TPM_LIMITS"), int)
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 5))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 1.0))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", 60.0))
+    LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", 5))
+    LLM_CIRCUIT_RECOVERY_SECONDS = float(os.getenv("LLM_CIRCUIT_RECOVERY_SECONDS", 30.0))
+
+    # LLM routing. Providers in preference order; pin tasks with "score=azure-openai,jd_extract=gemini"
+    LLM_PROVIDERS = [p.strip() for p in os.getenv("LLM_PROVIDERS", "azure-openai,bedrock,gemini").split(",") if p.strip()]
+    LLM_TASK_PROVIDERS = _parse_mapping(os.getenv("LLM_TASK_PROVIDERS"))
+    LLM_ROUTER_WINDOW = int(os.getenv("LLM_ROUTER_WINDOW", 100))
+    LLM_ROUTER_MAX_ERROR_RATE = float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", 0.5))
+    # Errors older than this stop counting, so an unhealthy provider gets probed again
+    LLM_ROUTER_ERROR_TTL_SECONDS = float(os.getenv("LLM_ROUTER_ERROR_TTL_SECONDS", 300))
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", 2.0))
+    LLM_HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", 16))
+
+    # Maximum document tokens pasted into each extraction prompt
+    RESUME_INPUT_TOKEN_BUDGET = int(os.getenv("RESUME_INPUT_TOKEN_BUDGET", 6000))
+    JD_INPUT_TOKEN_BUDGET = int(os.getenv("JD_INPUT_TOKEN_BUDGET", 3000))
+
+    # Bedrock prompt caching: model ids (substring match) that support cache_control,
+    # and the smallest prefix worth marking (shorter prefixes are never cached)
+    BEDROCK_CACHE_MODELS = [m.strip() for m in os.getenv(
+        "BEDROCK_CACHE_MODELS",
+        "anthropic.claude-3-7-sonnet,anthropic.claude-3-5-haiku,anthropic.claude-sonnet-4,anthropic.claude-opus-4",
+    ).split(",") if m.strip()]
+    BEDROCK_CACHE_MIN_TOKENS = int(os.getenv("BEDROCK_CACHE_MIN_TOKENS", 1024))
+
+    # Deterministic pre-scoring gate in front of LLM qualification scoring
+    PRESCORE_ENABLED = os.getenv("PRESCORE_ENABLED", "true").lower() == "true"
+    PRESCORE_THRESHOLD = float(os.getenv("PRESCORE_THRESHOLD", 0.5))
+    PRESCORE_TOP_M = int(os.getenv("PRESCORE_TOP_M", 3))
+    # Candidates retrieved per requested candidate when the gate is on (the gate keeps the best N)
+    PRESCORE_OVERFETCH = int(os.getenv("PRESCORE_OVERFETCH", 2))
+    PRESCORE_WEIGHT_SIMILARITY = float(os.getenv("PRESCORE_WEIGHT_SIMILARITY", 0.4))
+    PRESCORE_WEIGHT_SKILLS = float(os.getenv("PRESCORE_WEIGHT_SKILLS", 0.4))
+    PRESCORE_WEIGHT_EXPERIENCE = float(os.getenv("PRESCORE_WEIGHT_EXPERIENCE", 0.2))
+
+    # Embedding-based "fast" qualification scoring (no LLM)
+    FAST_SCORE_THRESHOLD_PARTIAL = float(os.getenv("FAST_SCORE_THRESHOLD_PARTIAL", 0.45))
+    FAST_SCORE_THRESHOLD_STRONG = float(os.getenv("FAST_SCORE_THRESHOLD_STRONG", 0.6))
+    FAST_SCORE_CACHE_SIZE = int(os.getenv("FAST_SCORE_CACHE_SIZE", 50000))
+
+    # Background resume ingestion. Job state is per process, so it is refused when the
+    # API runs more than one worker (WEB_CONCURRENCY, read by uvicorn and gunicorn).
+    API_WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 4))
+    INGEST_MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", 2))
+    INGEST_MAX_JOBS = int(os.getenv("INGEST_MAX_JOBS", 1000))
+    INGEST_LLM_CONCURRENCY = int(os.getenv("INGEST_LLM_CONCURRENCY", 8))
+    INGEST_IO_CONCURRENCY = int(os.getenv("INGEST_IO_CONCURRENCY", 4))
+
+    # Sandboxed document parsing
+    PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+    PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", 60))
+    # Resident memory (RSS) per parser worker, not address space: the native
+    # readers reserve far more virtual memory than they touch.
+    PARSE_MAX_MEMORY_MB = int(os.getenv("PARSE_MAX_MEMORY_MB", 1024))
+    PARSE_MAX_TASKS_PER_WORKER = int(os.getenv("PARSE_MAX_TASKS_PER_WORKER", 50))
+
+    # Resumes are indexed one point per section; fetch this many hits per requested candidate
+    RETRIEVAL_SECTION_OVERSAMPLE = int(os.getenv("RETRIEVAL_SECTION_OVERSAMPLE", 5))
+
+    # Selenium browser pool used to load URLs
+    BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))
+    BROWSER_MAX_PAGES_PER_DRIVER = int(os.getenv("BROWSER_MAX_PAGES_PER_DRIVER", 50))
+    BROWSER_BLOCK_RESOURCES = os.getenv("BROWSER_BLOCK_RESOURCES", "true").lower() == "true"
+    BROWSER_WARM_ON_STARTUP = os.getenv("BROWSER_WARM_ON_STARTUP", "true").lower() == "true"
+
+    # URLs are fetched over plain HTTP first; the browser is only used for JS-rendered pages
+    URL_FETCH_TIMEOUT_SECONDS = float(os.getenv("URL_FETCH_TIMEOUT_SECONDS", 10))
+    URL_MIN_TEXT_CHARS = int(os.getenv("URL_MIN_TEXT_CHARS", 500))
+    URL_JS_HOSTS = [host for host in os.getenv(
+        "URL_JS_HOSTS", "myworkdayjobs.com,successfactors.com,taleo.net,icims.com").split(",") if host.strip()]
+
+    # LinkedIn JD crawler: detail pages fetched at once; min seconds between requests to one host
+    CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", 4))
+    CRAWL_HOST_INTERVAL_SECONDS = float(os.getenv("CRAWL_HOST_INTERVAL_SECONDS", 1.5))
+
 settings = Config()
 
 def init_settings():
@@ -49,6 +140,10 @@ def init_settings():
     Settings.chunk_overlap = 0
 
 def init_azure_openai():
+    # Provider packages are imported only for the selected MODEL_PROVIDER.
+    from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
+    from llama_index.llms.azure_openai import AzureOpenAI
+
     llm_deployment = os.environ["MODEL"]
     embedding_deployment = os.environ["EMBEDDING_MODEL"]
     max_tokens = os.getenv("LLM_MAX_TOKENS")
@@ -77,6 +172,8 @@ def init_azure_openai():
     print("Settings Azure Openai susscess!") 
 
 def init_bedrock():
+    from llama_index.embeddings.bedrock import BedrockEmbedding
+    from llama_index.llms.bedrock import Bedrock
 
     Settings.llm = Bedrock(
         model=os.getenv("MODEL_LLM"),
@@ -0,0 +1,195 @@
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (prompt, cached prompt, completion). Unknown models cost 0.
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "anthropic.claude-3-5-sonnet-20240620-v1:0": (3.00, 0.30, 15.00),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+}
+
+# USD per 1M input tokens for embedding models. Unknown models cost 0.
+EMBEDDING_PRICES = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+    "amazon.titan-embed-text-v2:0": 0.02,
+    "amazon.titan-embed-text-v1": 0.10,
+    "cohere.embed-multilingual-v3": 0.10,
+    "text-embedding-004": 0.0,
+}
+
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLM call latency including rate-limit waits and retries",
+    ["task", "provider", "model", "status"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128),
+)
+LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens by kind", ["task", "provider", "model", "kind"])
+LLM_RETRIES = Counter("llm_retries_total", "LLM call retries", ["task", "provider", "model"])
+LLM_COST = Counter("llm_cost_usd_total", "Estimated LLM spend in USD", ["task", "provider", "model"])
+LLM_TOKENS_SAVED = Counter("llm_input_tokens_saved_total", "Prompt tokens removed by input budgeting",
+                           ["task", "provider"])
+EMBEDDING_TOKENS = Counter("embedding_tokens_total", "Estimated embedding input tokens", ["model"])
+EMBEDDING_COST = Counter("embedding_cost_usd_total", "Estimated embedding spend in USD", ["model"])
+CRAWL_RESPONSES = Counter("crawl_responses_total", "Crawler page loads by page kind and outcome",
+                          ["page", "outcome"])
+STAGE_LATENCY = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Duration of non-LLM pipeline stages (embedding, Qdrant, Neo4j, parsing)",
+    ["stage"],
+)
+
+_current_task: ContextVar[str] = ContextVar("llm_task", default="unknown")
+
+
+@dataclass
+class RequestSummary:
+    """Per-request totals, surfaced as response headers by the telemetry middleware."""
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    retries: int = 0
+    cost_usd: float = 0.0
+    embedding_tokens: int = 0
+    embedding_cost_usd: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def as_dict(self) -> dict:
+        return {
+            "llm_calls": self.llm_calls,
+            "llm_seconds": round(self.llm_seconds, 3),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "retries": self.retries,
+            "cost_usd": round(self.cost_usd, 6),
+            "embedding_tokens": self.embedding_tokens,
+            "embedding_cost_usd": round(self.embedding_cost_usd, 6),
+            "stages": {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+        }
+
+
+_request_summary: ContextVar[Optional[RequestSummary]] = ContextVar("request_summary", default=None)
+
+
+def start_request_summary() -> RequestSummary:
+    summary = RequestSummary()
+    _request_summary.set(summary)
+    return summary
+
+
+def get_request_summary() -> Optional[RequestSummary]:
+    return _request_summary.get()
+
+
+@contextmanager
+def llm_task(task: Optional[str]):
+    """Tag every LLM call made inside the block with ``task``."""
+    token = _current_task.set(task or "unknown")
+    try:
+        yield
+    finally:
+        _current_task.reset(token)
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    prompt_price, cached_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0, 0.0))
+    return (
+        (prompt_tokens - cached_tokens) * prompt_price
+        + cached_tokens * cached_price
+        + completion_tokens * completion_price
+    ) / 1_000_000
+
+
+def observe_llm_call(provider: str, model: str, latency: float, prompt_tokens: int = 0,
+                     completion_tokens: int = 0, cached_tokens: int = 0, retries: int = 0,
+                     status: str = "ok"):
+    """Export one LLM call to Prometheus and add it to the current request summary."""
+    task = _current_task.get()
+    cost = estimate_cost(model, prompt_tokens, cached_tokens, completion_tokens)
+
+    LLM_LATENCY.labels(task, provider, model, status).observe(latency)
+    LLM_TOKENS.labels(task, provider, model, "prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(task, provider, model, "completion").inc(completion_tokens)
+    LLM_TOKENS.labels(task, provider, model, "cached").inc(cached_tokens)
+    LLM_RETRIES.labels(task, provider, model).inc(retries)
+    LLM_COST.labels(task, provider, model).inc(cost)
+
+    summary = _request_summary.get()
+    if summary is not None:
+        with summary.lock:
+            summary.llm_calls += 1
+            summary.llm_seconds += latency
+            summary.prompt_tokens += prompt_tokens
+            summary.completion_tokens += completion_tokens
+            summary.cached_tokens += cached_tokens
+            summary.retries += retries
+            summary.cost_usd += cost
+
+
+def embedding_model_name() -> str:
+    from llama_index.core import Settings
+
+    embed_model = Settings.embed_model
+    return getattr(embed_model, "model_name", None) or type(embed_model).__name__
+
+
+def observe_tokens_saved(task: str, provider: str, tokens: int):
+    """Export the prompt tokens that input budgeting trimmed for ``task``."""
+    LLM_TOKENS_SAVED.labels(task, provider).inc(tokens)
+
+
+def observe_embedding(model: str, tokens: int):
+    """Export one embedding call's (estimated) tokens and cost and add them to the request summary."""
+    cost = tokens * EMBEDDING_PRICES.get(model, 0.0) / 1_000_000
+    EMBEDDING_TOKENS.labels(model).inc(tokens)
+    EMBEDDING_COST.labels(model).inc(cost)
+    summary = _request_summary.get()
+    if summary is not None:
+        with summary.lock:
+            summary.embedding_tokens += tokens
+            summary.embedding_cost_usd += cost
+
+
+@contextmanager
+def embedding_call(texts: Sequence[str], stage: str = "embedding", model: Optional[str] = None):
+    """Time an embedding call as ``stage`` and record the tokens and cost of embedding ``texts``.
+
+    Embedding APIs called through llama-index do not report usage, so tokens
+    are counted locally (tiktoken for OpenAI models, a character estimate otherwise).
+    """
+    from app.llms.tokens import count_embedding_tokens
+
+    model = model or embedding_model_name()
+    with timed(stage):
+        yield
+    observe_embedding(model, count_embedding_tokens(texts, model))
+
+
+@contextmanager
+def timed(stage: str):
+    """Time a non-LLM stage (e.g. "embedding", "qdrant_neo4j_retrieval")."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.labels(stage).observe(elapsed)
+        summary = _request_summary.get()
+        if summary is not None:
+            with summary.lock:
+                summary.stages[stage] = summary.stages.get(stage, 0.0) + elapsed
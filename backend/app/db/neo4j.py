@@ -1,5 +1,6 @@
 from typing import Optional, List, Dict
 from neo4j import GraphDatabase
+from neo4j.exceptions import ConstraintError
 
 from app.core.config import settings
 from typing import Optional, List, Dict
@@ -96,16 +97,69 @@ class Neo4jDB:
             session.run("MATCH (n) DETACH DELETE n")
             print("Database cleared")
 
-    def create_employee(self, talent_id, full_name):
-        """Create an Employee node with talent_id"""
+    _employee_indexes_ready = False
+
+    def ensure_employee_indexes(self):
+        """Indexes backing resume dedupe lookups; created once per process."""
+        if Neo4jDB._employee_indexes_ready:
+            return
+        with self.driver.session(default_access_mode="WRITE") as session:
+            session.run("CREATE INDEX employee_talent_id IF NOT EXISTS FOR (e:Employee) ON (e.talent_id)")
+            session.run("CREATE INDEX employee_file_hash IF NOT EXISTS FOR (e:Employee) ON (e.file_hash)")
+            session.run("CREATE INDEX employee_text_hash IF NOT EXISTS FOR (e:Employee) ON (e.text_hash)")
+        Neo4jDB._employee_indexes_ready = True
+
+    def get_employee(self, talent_id: str) -> Optional[Dict]:
+        with self.driver.session(default_access_mode="READ") as session:
+            record = session.run(
+                "MATCH (e:Employee {talent_id: $talent_id}) RETURN e",
+                talent_id=talent_id
+            ).single()
+            return dict(record["e"]) if record else None
+
+    def find_employee_by_hash(self, file_hash: str = None, text_hash: str = None) -> Optional[Dict]:
+        """Employee whose source file (sha256 of raw bytes) or normalized text hash matches."""
+        self.ensure_employee_indexes()
+        with self.driver.session(default_access_mode="READ") as session:
+            for key, value in (("file_hash", file_hash), ("text_hash", text_hash)):
+                if not value:
+                    continue
+                record = session.run(
+                    f"MATCH (e:Employee {{{key}: $value}}) RETURN e LIMIT 1",
+                    value=value
+                ).single()
+                if record:
+                    return {**dict(record["e"]), "match": key}
+        return None
+
+    def create_employee(self, talent_id, full_name, file_hash=None, text_hash=None):
+        """Create (or merge into) the Employee node with talent_id"""
         with self.driver.session(default_access_mode="WRITE") as session:
             session.run(
-                "CREATE (e:Employee {talent_id: $talent_id, full_name: $full_name})",
+                """
+                MERGE (e:Employee {talent_id: $talent_id})
+                SET e.full_name = $full_name, e.file_hash = $file_hash, e.text_hash = $text_hash
+                """,
                 talent_id=talent_id,
-                full_name=full_name
+                full_name=full_name,
+                file_hash=file_hash,
+                text_hash=text_hash
             )
             print(f"Created Employee with talent_id: {talent_id}, full_name: {full_name}")
 
+    def set_employee_hashes(self, talent_id, file_hash=None, text_hash=None):
+        """Record the dedupe hashes once the candidate is fully ingested."""
+        with self.driver.session(default_access_mode="WRITE") as session:
+            session.run(
+                """
+                MATCH (e:Employee {talent_id: $talent_id})
+                SET e.file_hash = $file_hash, e.text_hash = $text_hash
+                """,
+                talent_id=talent_id,
+                file_hash=file_hash,
+                text_hash=text_hash
+            )
+
     def create_company(self, company_name):
         """Create a Company node with name property"""
         with self.driver.session(default_access_mode="WRITE") as session:
@@ -205,9 +259,16 @@ class Neo4jDB:
             )
             print(f"Created HAS_SKILLS relationship: Employee {talent_id} -> {skill_name}")
 
-    def process_cv(self, cv_json, talent_id, full_name):
-        """Process CV data and create nodes and relationships"""
-        self.create_employee(talent_id, full_name)
+    def process_cv(self, cv_json, talent_id, full_name, file_hash=None, text_hash=None):
+        """Process CV data and create nodes and relationships.
+
+        Idempotent per talent_id: if an earlier attempt already wrote this Employee,
+        its subgraph is brought in line with ``cv_json`` instead of added to.
+        """
+        if self.get_employee(talent_id) is not None:
+            self.update_cv(cv_json, talent_id, full_name, file_hash=file_hash, text_hash=text_hash)
+            return
+        self.create_employee(talent_id, full_name, file_hash=file_hash, text_hash=text_hash)
         
         for exp in cv_json.get("experience", []):
             company_name = exp.get("company")
@@ -236,34 +297,317 @@ class Neo4jDB:
             self.create_skill(skill)
             self.create_skill_relationship(talent_id, skill)
     
+    # Employee -> tech node edges: relationship type -> (node label, node key property, cv_json field)
+    SKILL_EDGES = {
+        "HAS_PROGRAMMING_LANGUAGE": ("ProgrammingLanguage", "lang", "programming_languages"),
+        "HAS_FRAMEWORKS": ("Framework", "framework", "frameworks"),
+        "HAS_SKILLS": ("Skill", "skill", "skills"),
+    }
+
+    @staticmethod
+    def _work_history(cv_json) -> set:
+        """(company, position, duration, description) tuples, named the way process_cv names them."""
+        rows = set()
+        for exp in cv_json.get("experience", []):
+            company_name = exp.get("company")
+            if company_name is None:
+                company_name = f"Unknown Company ({exp.get('position', 'Unknown Position')})"
+            rows.add((company_name, exp.get("position", "") or "", exp.get("duration", "") or "",
+                      exp.get("description", "") or ""))
+        return rows
+
+    def update_cv(self, cv_json, talent_id, full_name, file_hash=None, text_hash=None) -> dict:
+        """Bring an existing Employee subgraph in line with ``cv_json``.
+
+        Reads the current edges, writes only the ones that were added or removed,
+        all in one transaction. Returns {"added": {...}, "removed": {...}} counts
+        per relationship type.
+        """
+        tech_skills = cv_json.get("technical_skills", {})
+        desired = {rel: {v for v in tech_skills.get(field, []) if v} for rel, (_, _, field) in self.SKILL_EDGES.items()}
+        desired_jobs = self._work_history(cv_json)
+
+        def as_rows(jobs):
+            return [dict(zip(("company", "position", "duration", "description"), job)) for job in sorted(jobs)]
+
+        def work(tx):
+            employee = tx.run(
+                """
+                MATCH (e:Employee {talent_id: $talent_id})
+                SET e.full_name = $full_name,
+                    e.file_hash = coalesce($file_hash, e.file_hash),
+                    e.text_hash = coalesce($text_hash, e.text_hash),
+                    e.updated_at = datetime()
+                RETURN e
+                """,
+                talent_id=talent_id, full_name=full_name, file_hash=file_hash, text_hash=text_hash
+            ).single()
+            if employee is None:
+                raise ValueError(f"talent_id {talent_id} not found")
+
+            added, removed = {}, {}
+            for rel, (label, key, _) in self.SKILL_EDGES.items():
+                current = {
+                    record["value"] for record in tx.run(
+                        f"MATCH (:Employee {{talent_id: $talent_id}})-[:{rel}]->(n:{label}) RETURN n.{key} AS value",
+                        talent_id=talent_id
+                    )
+                }
+                to_remove, to_add = sorted(current - desired[rel]), sorted(desired[rel] - current)
+                if to_remove:
+                    tx.run(
+                        f"""
+                        MATCH (:Employee {{talent_id: $talent_id}})-[r:{rel}]->(n:{label})
+                        WHERE n.{key} IN $values
+                        DELETE r
+                        """,
+                        talent_id=talent_id, values=to_remove
+                    )
+                if to_add:
+                    tx.run(
+                        f"""
+                        MATCH (e:Employee {{talent_id: $talent_id}})
+                        UNWIND $values AS value
+                        MERGE (n:{label} {{{key}: value}})
+                        MERGE (e)-[:{rel}]->(n)
+                        """,
+                        talent_id=talent_id, values=to_add
+                    )
+                added[rel], removed[rel] = len(to_add), len(to_remove)
+
+            current_jobs = {
+                (record["company"], record["position"] or "", record["duration"] or "", record["description"] or "")
+                for record in tx.run(
+                    """
+                    MATCH (:Employee {talent_id: $talent_id})-[r:WORKED_AT]->(c:Company)
+                    RETURN c.name AS company, r.position AS position, r.duration AS duration,
+                           r.description AS description
+                    """,
+                    talent_id=talent_id
+                )
+            }
+            to_remove, to_add = current_jobs - desired_jobs, desired_jobs - current_jobs
+            if to_remove:
+                tx.run(
+                    """
+                    UNWIND $rows AS row
+                    MATCH (:Employee {talent_id: $talent_id})-[r:WORKED_AT]->(:Company {name: row.company})
+                    WHERE coalesce(r.position, '') = row.position AND coalesce(r.duration, '') = row.duration
+                      AND coalesce(r.description, '') = row.description
+                    DELETE r
+                    """,
+                    talent_id=talent_id, rows=as_rows(to_remove)
+                )
+            if to_add:
+                tx.run(
+                    """
+                    MATCH (e:Employee {talent_id: $talent_id})
+                    UNWIND $rows AS row
+                    MERGE (c:Company {name: row.company})
+                    MERGE (e)-[:WORKED_AT {position: row.position, duration: row.duration,
+                                          description: row.description}]->(c)
+                    """,
+                    talent_id=talent_id, rows=as_rows(to_add)
+                )
+            added["WORKED_AT"], removed["WORKED_AT"] = len(to_add), len(to_remove)
+            return {"added": added, "removed": removed}
+
+        with self.driver.session(default_access_mode="WRITE") as session:
+            changes = session.execute_write(work)
+        print(f"Updated Employee {talent_id}: {changes}")
+        return changes
+
+    def delete_employee(self, talent_id: str) -> bool:
+        """Delete an Employee and its relationships; shared Company/Skill/... nodes stay."""
+        with self.driver.session(default_access_mode="WRITE") as session:
+            record = session.run(
+                """
+                MATCH (e:Employee {talent_id: $talent_id})
+                DETACH DELETE e
+                RETURN count(e) AS deleted
+                """,
+                talent_id=talent_id
+            ).single()
+            return bool(record and record["deleted"])
+
     # ===== JOB DESCRIPTION MANAGEMENT METHODS =====
 
-    def create_job_description(self, file_path: str = None, url: str = None, type_: str = None, jd: str = None, jd_id: str = None):
+    _jd_indexes_ready = False
+
+    def ensure_jd_indexes(self):
+        """Indexes backing JD dedupe lookups; created once per process."""
+        if Neo4jDB._jd_indexes_ready:
+            return
+        with self.driver.session(default_access_mode="WRITE") as session:
+            session.run("CREATE INDEX jd_content_hash IF NOT EXISTS FOR (j:JobDescription) ON (j.content_hash)")
+            session.run("CREATE INDEX jd_canonical_url IF NOT EXISTS FOR (j:JobDescription) ON (j.canonical_url)")
+            # Only the latest version of a JD carries latest_key, so at most one latest node per URL / content.
+            session.run("CREATE CONSTRAINT jd_latest_key IF NOT EXISTS FOR (j:JobDescription) REQUIRE j.latest_key IS UNIQUE")
+            session.run("CREATE CONSTRAINT crawl_cursor_key IF NOT EXISTS FOR (c:CrawlCursor) REQUIRE c.key IS UNIQUE")
+        Neo4jDB._jd_indexes_ready = True
+
+    def find_job_description(self, content_hash: str = None, canonical_url: str = None) -> Optional[Dict]:
+        """Latest JD version with this content hash, else the latest version posted at this URL."""
+        self.ensure_jd_indexes()
+        with self.driver.session(default_access_mode="READ") as session:
+            if content_hash:
+                record = session.run(
+                    """
+                    MATCH (j:JobDescription {content_hash: $content_hash})
+                    WHERE coalesce(j.is_latest, true)
+                    RETURN j ORDER BY j.version DESC LIMIT 1
+                    """,
+                    content_hash=content_hash
+                ).single()
+                if record:
+                    return {**dict(record["j"]), "match": "content_hash"}
+            if canonical_url:
+                record = session.run(
+                    """
+                    MATCH (j:JobDescription {canonical_url: $canonical_url})
+                    WHERE coalesce(j.is_latest, true)
+                    RETURN j ORDER BY j.version DESC LIMIT 1
+                    """,
+                    canonical_url=canonical_url
+                ).single()
+                if record:
+                    return {**dict(record["j"]), "match": "canonical_url"}
+        return None
+
+    def find_known_jd_urls(self, canonical_urls: List[str]) -> set:
+        """Subset of ``canonical_urls`` already stored as a JobDescription (any version)."""
+        if not canonical_urls:
+            return set()
+        self.ensure_jd_indexes()
+        with self.driver.session(default_access_mode="READ") as session:
+            result = session.run(
+                """
+                UNWIND $urls AS url
+                MATCH (j:JobDescription {canonical_url: url})
+                RETURN DISTINCT url
+                """,
+                urls=list(canonical_urls)
+            )
+            return {record["url"] for record in result}
+
+    def get_crawl_cursor(self, key: str) -> Optional[Dict]:
+        self.ensure_jd_indexes()
+        with self.driver.session(default_access_mode="READ") as session:
+            record = session.run(
+                """
+                MATCH (c:CrawlCursor {key: $key})
+                RETURN c {.*, last_crawled_at: toString(c.last_crawled_at)} AS c
+                """,
+                key=key
+            ).single()
+            return dict(record["c"]) if record else None
+
+    def save_crawl_cursor(self, key: str, job_title: str, location: str, pages_crawled: int,
+                          new_jobs: int, known_jobs: int, newest_url: Optional[str] = None,
+                          retry_jobs: str = "[]"):
+        """Record where the last crawl for (job_title, location) stopped; ``retry_jobs`` is a JSON list of cards."""
+        self.ensure_jd_indexes()
         with self.driver.session(default_access_mode="WRITE") as session:
             session.run(
                 """
-                CREATE (j:JobDescription {
-                    jd_id: $jd_id,
-                    file_path: $file_path,
-                    url: $url,
-                    type: $type,
-                    jd: $jd,
-                    created_at: datetime()
-                })
+                MERGE (c:CrawlCursor {key: $key})
+                SET c.job_title = $job_title,
+                    c.location = $location,
+                    c.last_crawled_at = datetime(),
+                    c.last_crawled_epoch = datetime().epochSeconds,
+                    c.pages_crawled = $pages_crawled,
+                    c.new_jobs = $new_jobs,
+                    c.known_jobs = $known_jobs,
+                    c.newest_url = coalesce($newest_url, c.newest_url),
+                    c.retry_jobs = $retry_jobs
                 """,
-                jd_id = jd_id,
+                key=key,
+                job_title=job_title,
+                location=location,
+                pages_crawled=pages_crawled,
+                new_jobs=new_jobs,
+                known_jobs=known_jobs,
+                newest_url=newest_url,
+                retry_jobs=retry_jobs
+            )
+
+    def create_job_description(self, file_path: str = None, url: str = None, type_: str = None, jd: str = None,
+                               jd_id: str = None, content_hash: str = None, canonical_url: str = None,
+                               previous_jd_id: str = None) -> Dict:
+        """Create a JobDescription; with ``previous_jd_id`` it becomes the next version of that JD.
+
+        The latest version is keyed by its canonical URL (or content hash) under a
+        uniqueness constraint and created with MERGE, so concurrent ingests of the
+        same JD create one node. Returns {"jd_id", "jd", "created"}; when another
+        ingest won the race, that node is returned with created=False.
+        """
+        self.ensure_jd_indexes()
+        latest_key = canonical_url or (f"sha256:{content_hash}" if content_hash else None)
+        if latest_key is None:
+            # Nothing to dedupe on (no URL, no text hash): always a new node.
+            latest_key = f"jd:{jd_id}"
+
+        def create(tx):
+            return tx.run(
+                """
+                OPTIONAL MATCH (prev:JobDescription {jd_id: $previous_jd_id})
+                FOREACH (_ IN CASE WHEN prev IS NULL THEN [] ELSE [1] END |
+                    SET prev.is_latest = false
+                    REMOVE prev.latest_key
+                )
+                WITH prev
+                MERGE (j:JobDescription {latest_key: $latest_key})
+                ON CREATE SET
+                    j.jd_id = $jd_id,
+                    j.file_path = $file_path,
+                    j.url = $url,
+                    j.type = $type,
+                    j.jd = $jd,
+                    j.content_hash = $content_hash,
+                    j.canonical_url = $canonical_url,
+                    j.version = coalesce(prev.version, 0) + 1,
+                    j.is_latest = true,
+                    j.created_at = datetime()
+                WITH j, prev, j.jd_id = $jd_id AS created
+                FOREACH (_ IN CASE WHEN created AND prev IS NOT NULL THEN [1] ELSE [] END |
+                    CREATE (j)-[:PREVIOUS_VERSION]->(prev)
+                )
+                RETURN j.jd_id AS jd_id, j.jd AS jd, created
+                """,
+                jd_id=jd_id,
                 file_path=file_path,
                 url=url,
                 type=type_,
-                jd=jd
-            )
+                jd=jd,
+                content_hash=content_hash,
+                canonical_url=canonical_url,
+                previous_jd_id=previous_jd_id,
+                latest_key=latest_key,
+            ).single()
+
+        def winner(tx):
+            return tx.run(
+                "MATCH (j:JobDescription {latest_key: $latest_key}) "
+                "RETURN j.jd_id AS jd_id, j.jd AS jd, false AS created",
+                latest_key=latest_key,
+            ).single()
+
+        with self.driver.session(default_access_mode="WRITE") as session:
+            try:
+                record = session.execute_write(create)
+            except ConstraintError:
+                # Lost a race on the same latest_key: the winner's node is the JD.
+                record = session.execute_read(winner)
+        if record["created"]:
             print(f"Created JobDescription node: type={type_}, url={url}, file_path={file_path}")
+        return dict(record)
 
     def get_job_descriptions(self, limit: int = 20):
         with self.driver.session(default_access_mode="READ") as session:
             result = session.run(
                 """
                 MATCH (j:JobDescription)
+                WHERE coalesce(j.is_latest, true)
                 RETURN j
                 ORDER BY j.created_at DESC
                 LIMIT $limit
@@ -1,15 +1,19 @@
 from qdrant_client import QdrantClient, AsyncQdrantClient, models
 from llama_index.core import VectorStoreIndex, StorageContext
-from llama_index.vector_stores.qdrant import QdrantVectorStore
 from app.core.config import settings
+from app.core.telemetry import embedding_call, timed
 from llama_index.core import Settings
-from neo4j_graphrag.retrievers import QdrantNeo4jRetriever
+from llama_index.core.schema import MetadataMode
+from functools import lru_cache
 from typing import List
 from neo4j import GraphDatabase
 import json
 
 
 class VectorSearchQdant:
+    # Payload fields filtered on by exact match.
+    KEYWORD_INDEXES = ("talent_id", "file_hash", "text_hash", "section")
+
     def __init__(self):
         self.client = QdrantClient(settings.QDRANT_URL)
         self.aclient = AsyncQdrantClient(settings.QDRANT_URL)
@@ -17,9 +21,24 @@ class VectorSearchQdant:
             settings.NEO4J_URI,
             auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
         )
+        self.indexed_collections = set()
+
+    def ensure_payload_indexes(self, collection_name):
+        if collection_name in self.indexed_collections:
+            return
+        for field_name in self.KEYWORD_INDEXES:
+            # No-op when the index already exists.
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+        self.indexed_collections.add(collection_name)
 
-    def create_vector_index(self, documents, collection_name):
-        vector_store = QdrantVectorStore(
+    def _vector_store(self, collection_name):
+        from llama_index.vector_stores.qdrant import QdrantVectorStore
+
+        return QdrantVectorStore(
             client=self.client,
             aclient=self.aclient,
             collection_name=collection_name,
@@ -27,27 +46,91 @@ class VectorSearchQdant:
             fastembed_sparse_model="Qdrant/bm25",
         )
 
+    def create_vector_index(self, documents, collection_name, transformations=None):
+        vector_store = self._vector_store(collection_name)
         storage_context = StorageContext.from_defaults(vector_store=vector_store)
 
-        index = VectorStoreIndex.from_documents(
-            documents,
-            storage_context=storage_context,
-        )
+        # Estimated from the documents; transformations may split them before embedding.
+        texts = [document.get_content(metadata_mode=MetadataMode.EMBED) for document in documents]
+        with embedding_call(texts, stage="embedding_index"):
+            index = VectorStoreIndex.from_documents(
+                documents,
+                storage_context=storage_context,
+                transformations=transformations,
+            )
+        for document in documents:
+            self._set_resume_json(collection_name, document.metadata.get("talent_id"), document.get_content())
+        self.ensure_payload_indexes(collection_name)
 
         return index
 
+    def _set_resume_json(self, collection_name, talent_id, text):
+        """Store the resume JSON once, as a payload key of the candidate's profile point."""
+        from app.modules.node_parsers import parse_resume, profile_id
+
+        if not talent_id or parse_resume(text) is None:
+            return
+        self.client.set_payload(collection_name=collection_name, payload={"resume_json": text},
+                                points=[profile_id(talent_id)])
+
+    @staticmethod
+    def _candidate_filter(talent_id: str = None):
+        """One point per candidate: the section-index "profile" point, or a legacy whole-resume point."""
+        must = []
+        if talent_id:
+            must.append(models.FieldCondition(key="talent_id", match=models.MatchValue(value=talent_id)))
+        return models.Filter(must=must, should=[
+            models.FieldCondition(key="section", match=models.MatchValue(value="profile")),
+            models.IsEmptyCondition(is_empty=models.PayloadField(key="section")),
+        ])
+
+    def upsert_candidate(self, collection_name, talent_id, text, metadata):
+        """Re-index a candidate in place.
+
+        Section nodes have deterministic ids, so re-embedding overwrites the
+        candidate's existing points; points no longer produced (fewer experience
+        entries, a legacy whole-resume point) are deleted.
+        """
+        from llama_index.core import Document
+        from app.modules.node_parsers import CVSectionNodeParser
+
+        document = Document(id_=talent_id, text=text, metadata={**metadata, "talent_id": talent_id})
+        nodes = CVSectionNodeParser().get_nodes_from_documents([document])
+        keep = {node.id_ for node in nodes}
+
+        talent_filter = models.Filter(must=[
+            models.FieldCondition(key="talent_id", match=models.MatchValue(value=talent_id))
+        ])
+        points, _ = self.client.scroll(collection_name=collection_name, scroll_filter=talent_filter,
+                                       limit=1000, with_payload=False, with_vectors=False)
+        stale = [point.id for point in points if str(point.id) not in keep]
+        if stale:
+            self.client.delete(collection_name=collection_name,
+                               points_selector=models.PointIdsList(points=stale))
+
+        vector_store = self._vector_store(collection_name)
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        with embedding_call(texts, stage="embedding_index"):
+            VectorStoreIndex.from_vector_store(vector_store).insert_nodes(nodes)
+        self._set_resume_json(collection_name, talent_id, text)
+        self.ensure_payload_indexes(collection_name)
+        return sorted(keep)
+
     def retrieve_from_qdrant_neo4j(self, 
                                    query_text: str,
                                    number_candidate: int
                                    ):
         try:
-            query_vector = Settings.embed_model.get_text_embedding(query_text)
+            with embedding_call([query_text]):
+                query_vector = Settings.embed_model.get_text_embedding(query_text)
             print(f"Query text: '{query_text}'")
             print(f"Query vector dimension: {len(query_vector)}")
         except Exception as e:
             print(f"Error generating embedding: {e}")
             return []
 
+        from neo4j_graphrag.retrievers import QdrantNeo4jRetriever
+
         retriever = QdrantNeo4jRetriever(
             driver=self.driver,
             client=self.client,
@@ -58,19 +141,23 @@ class VectorSearchQdant:
         )
 
         try:
-            results = retriever.get_search_results(
-                query_vector=query_vector,
-                top_k=number_candidate
-            )
+            with timed("qdrant_neo4j_retrieval"):
+                # Several section points can belong to one candidate: over-fetch, then keep
+                # each candidate's best-matching section.
+                results = retriever.get_search_results(
+                    query_vector=query_vector,
+                    top_k=number_candidate * settings.RETRIEVAL_SECTION_OVERSAMPLE
+                )
             
             print(f"QdrantNeo4jRetriever results type: {type(results)}")
             print(f"QdrantNeo4jRetriever results: {results}")
             
             if hasattr(results, 'records') and results.records:
                 print(f"Found {len(results.records)} records")
-                for i, record in enumerate(results.records):
+                records = self._best_per_candidate(results.records, number_candidate)
+                for i, record in enumerate(records):
                     print(f"Record {i}: {record}")
-                return results.records
+                return records
             else:
                 print("No records found in QdrantNeo4jRetriever results")
                 return []
@@ -78,22 +165,31 @@ class VectorSearchQdant:
         except Exception as e:
             print(f"QdrantNeo4jRetriever error: {e}")
 
+    @staticmethod
+    def _best_per_candidate(records, number_candidate: int):
+        """Collapse section hits to one record per talent_id, keeping the highest score."""
+        best = {}
+        for record in records:
+            talent_id = record[0].get("talent_id") or id(record)
+            if talent_id not in best or record[1] > best[talent_id][1]:
+                best[talent_id] = record
+        return sorted(best.values(), key=lambda record: record[1], reverse=True)[:number_candidate]
+
     def get_resume_text_by_talent_id(self, talent_id: str) -> str | None:
         try:
-            hits = self.client.scroll(
-                collection_name=settings.QDRANT_COLLECTION_NAME,
-                scroll_filter={
-                    "must": [
-                        {"key": "talent_id", "match": {"value": talent_id}}
-                    ]
-                },
-                limit=1
-            )
+            with timed("qdrant_fetch"):
+                hits = self.client.scroll(
+                    collection_name=settings.QDRANT_COLLECTION_NAME,
+                    scroll_filter=self._candidate_filter(talent_id),
+                    limit=1
+                )
 
             if not hits or not hits[0]:
                 return None
 
             point = hits[0][0]
+            if point.payload.get("resume_json"):
+                return point.payload["resume_json"]
             node_content = point.payload.get("_node_content")
             if not node_content:
                 return None
@@ -141,14 +237,7 @@ class VectorSearchQdant:
     def get_resume_by_talent_id(self, collection_name: str, talent_id: str):
         scroll_res, _ = self.client.scroll(
             collection_name=collection_name,
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="talent_id",
-                        match=models.MatchValue(value=talent_id)
-                    )
-                ]
-            ),
+            scroll_filter=self._candidate_filter(talent_id),
             limit=1
         )
         if not scroll_res:
@@ -162,6 +251,7 @@ class VectorSearchQdant:
         while True:
             scroll_res, next_page = self.client.scroll(
                 collection_name=collection_name,
+                scroll_filter=self._candidate_filter(),
                 offset=offset,
                 limit=100
             )
@@ -178,4 +268,14 @@ class VectorSearchQdant:
 
         return resumes
     
-vector_search = VectorSearchQdant()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_vector_search() -> VectorSearchQdant:
+    """Create the Qdrant / Neo4j clients on first use instead of at import time."""
+    return VectorSearchQdant()
+
+
+def __getattr__(name):
+    # Keeps `from app.db.qdrant import vector_search` working without eager connections.
+    if name == "vector_search":
+        return get_vector_search()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
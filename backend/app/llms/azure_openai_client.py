@@ -1,10 +1,23 @@
 import os
 import json
+import time
+from functools import lru_cache
 from openai import AzureOpenAI
-from openai import OpenAIError
-import re
-import ast
+from openai import OpenAIError, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 from app.core.config import settings
+from app.llms.json_utils import parse_json_response
+from app.llms.usage import LLMUsage, record_usage
+from app.prompts.base import CacheablePrompt
+from app.llms.rate_limiter import (
+    get_rate_limiter,
+    estimate_tokens,
+    parse_retry_after,
+    RetryableError,
+    CircuitOpenError,
+    RetryExhaustedError,
+)
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
 
 
 class AzureOpenAIClient:
@@ -34,41 +47,46 @@ class AzureOpenAIClient:
             api_key=self.api_key,
             api_version=self.api_version,
             base_url=f"{self.api_base}/openai/deployments/{self.model}",
+            # Retries are handled by the shared rate limiter so they respect the quota.
+            max_retries=0,
         )
+        self.rate_limiter = get_rate_limiter("azure-openai", self.model)
     
     def invoke_model(self, prompt, system_message="You are a helpful assistant.", 
-                     max_tokens=2000, temperature=0.7):
+                     max_tokens=2000, temperature=0.7, response_model=None):
         """Invoke Azure OpenAI with a given prompt and return the response text.
         
         Args:
-            prompt (str): The prompt to send to the model.
+            prompt (str or CacheablePrompt): The prompt to send to the model.
             system_message (str): System message to set model behavior.
             max_tokens (int): Maximum number of tokens to generate. Defaults to 2000.
             temperature (float): Temperature for response generation. Defaults to 0.7.
+            response_model (Type[BaseModel]): If given, JSON mode is enabled so the
+                response is a bare JSON object (requires API_VERSION >= 2023-12-01-preview).
             
         Returns:
             str or None: The generated text if successful, None otherwise.
         """
+        def call():
+            try:
+                return self._create_completion(prompt, system_message, max_tokens, temperature, response_model)
+            except RETRYABLE_ERRORS as e:
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                raise RetryableError(e, parse_retry_after(headers))
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                        ],
-                    },
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
+            start = time.perf_counter()
+            response, retries = self.rate_limiter.call(call, estimate_tokens(system_message) + estimate_tokens(prompt))
+            record_usage("azure-openai", self.model, self._usage(response),
+                         latency=time.perf_counter() - start, retries=retries)
             
             # Extract the generated text from response
             generated_text = response.choices[0].message.content
             return generated_text
 
+        except (CircuitOpenError, RetryExhaustedError) as e:
+            print(f"OpenAI API unavailable: {e}")
+            return None
         except OpenAIError as e:
             print(f"OpenAI API Error: {e}")
             return None
@@ -76,12 +94,54 @@ class AzureOpenAIClient:
             print(f"An error occurred: {e}")
             return None
 
+    def _create_completion(self, prompt, system_message, max_tokens, temperature, response_model=None):
+        extra = {}
+        if response_model is not None:
+            extra["response_format"] = {"type": "json_object"}
+        return self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {
+                    "role": "user",
+                    "content": self._user_content(prompt),
+                },
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **extra,
+        )
+
+    @staticmethod
+    def _user_content(prompt):
+        # Azure caches identical prompt prefixes automatically (>= 1024 tokens);
+        # keeping the static part first in its own block is all that is needed.
+        if isinstance(prompt, CacheablePrompt):
+            return [
+                {"type": "text", "text": prompt.prefix},
+                {"type": "text", "text": prompt.suffix},
+            ]
+        return [{"type": "text", "text": prompt}]
+
+    @staticmethod
+    def _usage(response) -> LLMUsage:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return LLMUsage()
+        details = getattr(usage, "prompt_tokens_details", None)
+        return LLMUsage(
+            prompt_tokens=usage.prompt_tokens or 0,
+            completion_tokens=usage.completion_tokens or 0,
+            cached_tokens=(getattr(details, "cached_tokens", None) or 0) if details else 0,
+        )
+
     @staticmethod
-    def parse_json_string(entry):
+    def parse_json_string(entry, schema=None):
         """Parse a JSON string from a raw model response.
 
         Args:
             entry (str or tuple): The raw model response.
+            schema (Type[BaseModel]): Optional Pydantic model to validate against.
 
         Returns:
             dict: Parsed JSON object.
@@ -89,23 +149,17 @@ class AzureOpenAIClient:
         Raises:
             ValueError: If no JSON block is found or parsing fails.
         """
-        if isinstance(entry, tuple):
-            entry = entry[0]
-        
-        if "```json" in entry:
-            match = re.search(r"```json\s*(\{.*?\})\s*```", entry, re.DOTALL)
-            if match:
-                json_block = match.group(1)
-                cleaned = json_block.replace('""', '"')
-                return json.loads(cleaned)
-            else:
-                raise ValueError("No JSON block found in text containing markdown.")
-        
-        try:
-            cleaned = ast.literal_eval(f"'''{entry}'''")
-            return json.loads(cleaned)
-        except Exception as e:
-            raise ValueError(f"Error parsing JSON: {e}")
+        return parse_json_response(entry, schema)
+
+
+@lru_cache(maxsize=1)
+def get_azure_client() -> AzureOpenAIClient:
+    """Build the shared client on first use, so unused providers need no credentials."""
+    return AzureOpenAIClient()
 
 
-azure_client = AzureOpenAIClient()
+def __getattr__(name):
+    # Keeps `from app.llms.azure_openai_client import azure_client` working without eager construction.
+    if name == "azure_client":
+        return get_azure_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,55 +1,117 @@
 import boto3
 import json
+import time
+from functools import lru_cache
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
-import re
-import ast
+from app.core.config import settings
+from app.llms.json_utils import parse_json_response
+from app.llms.tokens import count_tokens
+from app.llms.usage import LLMUsage, record_usage
+from app.prompts.base import CacheablePrompt
+from app.llms.rate_limiter import (
+    get_rate_limiter,
+    estimate_tokens,
+    parse_retry_after,
+    RetryableError,
+    CircuitOpenError,
+    RetryExhaustedError,
+)
+
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException",
+}
 
 
 class BedrockClient:
     """A client class for interacting with Amazon Bedrock."""
     
-    def __init__(self, region="ap-northeast-1"):
+    def __init__(self, region="ap-northeast-1", model="anthropic.claude-3-5-sonnet-20240620-v1:0"):
         """Initialize the Bedrock Runtime client with the specified region.
         
         Args:
             region (str): AWS region name. Defaults to "ap-northeast-1".
+            model (str): Default model ID. Defaults to Claude 3.5 Sonnet.
         """
         self.region = region
-        self.client = boto3.client("bedrock-runtime", region_name=region)
+        self.model = model
+        # Retries are handled by the shared rate limiter so they respect the quota.
+        self.client = boto3.client(
+            "bedrock-runtime",
+            region_name=region,
+            config=BotoConfig(retries={"total_max_attempts": 1}),
+        )
     
-    def invoke_model(self, prompt, model_id="anthropic.claude-3-5-sonnet-20240620-v1:0", max_tokens=4096):
+    def invoke_model(self, prompt, model_id=None, max_tokens=4096,
+                     response_model=None, system_message=None, temperature=None):
         """Invoke Amazon Bedrock with a given prompt and return the response text.
         
         Args:
-            prompt (str): The prompt to send to the model.
-            model_id (str): The model ID to use. Defaults to Claude 3.5 Sonnet.
+            prompt (str or CacheablePrompt): The prompt to send to the model. The
+                prefix of a CacheablePrompt is marked with an Anthropic cache_control block
+                when the model supports prompt caching and the prefix is long enough.
+            model_id (str): The model ID to use. Defaults to ``self.model``.
             max_tokens (int): Maximum number of tokens to generate. Defaults to 4096.
+            response_model (Type[BaseModel]): If given, the assistant turn is prefilled
+                with "{" so Claude answers with a bare JSON object.
+            system_message (str): Optional system prompt.
+            temperature (float): Optional sampling temperature.
             
         Returns:
             str or None: The generated text if successful, None otherwise.
         """
+        model_id = model_id or self.model
+        messages = [{"role": "user", "content": self._user_content(prompt, model_id)}]
+        if response_model is not None:
+            messages.append({"role": "assistant", "content": "{"})
         messages_API_body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": max_tokens,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": messages,
         }
+        if system_message:
+            messages_API_body["system"] = system_message
+        if temperature is not None:
+            messages_API_body["temperature"] = temperature
 
         body = json.dumps(messages_API_body)
         accept = "application/json"
         contentType = "application/json"
 
+        def call():
+            try:
+                return self.client.invoke_model(
+                    modelId=model_id,
+                    body=body,
+                    contentType=contentType,
+                    accept=accept
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in RETRYABLE_ERROR_CODES:
+                    raise
+                headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders")
+                raise RetryableError(e, parse_retry_after(headers))
+
         try:
-            response = self.client.invoke_model(
-                modelId=model_id,
-                body=body,
-                contentType=contentType,
-                accept=accept
-            )
+            rate_limiter = get_rate_limiter("bedrock", model_id)
+            start = time.perf_counter()
+            response, retries = rate_limiter.call(call, estimate_tokens(prompt))
 
             response_body = json.loads(response["body"].read())
+            record_usage("bedrock", model_id, self._usage(response_body),
+                         latency=time.perf_counter() - start, retries=retries)
             generated_text = response_body["content"][0]["text"]            
+            if response_model is not None:
+                generated_text = "{" + generated_text
             return generated_text
 
+        except (CircuitOpenError, RetryExhaustedError) as e:
+            print(f"Bedrock unavailable: {e}")
+            return None
         except ClientError as e:
             print(f"ClientError: {e.response['Error']['Message']}")
             return None
@@ -58,11 +120,39 @@ class BedrockClient:
             return None
 
     @staticmethod
-    def parse_json_string(entry):
+    def _cacheable(prompt, model_id) -> bool:
+        return (isinstance(prompt, CacheablePrompt)
+                and any(model in model_id for model in settings.BEDROCK_CACHE_MODELS)
+                and count_tokens(prompt.prefix, "bedrock") >= settings.BEDROCK_CACHE_MIN_TOKENS)
+
+    @classmethod
+    def _user_content(cls, prompt, model_id):
+        if cls._cacheable(prompt, model_id):
+            return [
+                {"type": "text", "text": prompt.prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt.suffix},
+            ]
+        return str(prompt)
+
+    @staticmethod
+    def _usage(response_body) -> LLMUsage:
+        usage = response_body.get("usage", {})
+        cached = usage.get("cache_read_input_tokens", 0) or 0
+        return LLMUsage(
+            # input_tokens excludes tokens read from or written to the cache.
+            prompt_tokens=(usage.get("input_tokens", 0) or 0) + cached
+            + (usage.get("cache_creation_input_tokens", 0) or 0),
+            completion_tokens=usage.get("output_tokens", 0) or 0,
+            cached_tokens=cached,
+        )
+
+    @staticmethod
+    def parse_json_string(entry, schema=None):
         """Parse a JSON string from a raw model response.
 
         Args:
             entry (str or tuple): The raw model response.
+            schema (Type[BaseModel]): Optional Pydantic model to validate against.
 
         Returns:
             dict: Parsed JSON object.
@@ -70,23 +160,17 @@ class BedrockClient:
         Raises:
             ValueError: If no JSON block is found or parsing fails.
         """
-        if isinstance(entry, tuple):
-            entry = entry[0]
-        
-        if "```json" in entry:
-            match = re.search(r"```json\s*(\{.*?\})\s*```", entry, re.DOTALL)
-            if match:
-                json_block = match.group(1)
-                cleaned = json_block.replace('""', '"')
-                return json.loads(cleaned)
-            else:
-                raise ValueError("No JSON block found in text containing markdown.")
-        
-        try:
-            cleaned = ast.literal_eval(f"'''{entry}'''")
-            return json.loads(cleaned)
-        except Exception as e:
-            raise ValueError(f"Error parsing JSON: {e}")
+        return parse_json_response(entry, schema)
+
+
+@lru_cache(maxsize=1)
+def get_bedrock_client() -> BedrockClient:
+    """Build the shared client on first use, so unused providers need no credentials."""
+    return BedrockClient()
 
 
-bedrock = BedrockClient()
+def __getattr__(name):
+    # Keeps `from app.llms.bedrock_client import bedrock` working without eager construction.
+    if name == "bedrock":
+        return get_bedrock_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,23 @@
 import os
 import json
+import time
+from functools import lru_cache
 from google import genai
-import re
-import ast
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
 from app.core.config import settings
+from app.llms.json_utils import parse_json_response
+from app.llms.usage import LLMUsage, record_usage
+from app.llms.rate_limiter import (
+    get_rate_limiter,
+    estimate_tokens,
+    parse_retry_after,
+    RetryableError,
+    CircuitOpenError,
+    RetryExhaustedError,
+)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 class GeminiClient:
@@ -16,36 +30,79 @@ class GeminiClient:
         if not self.api_key:
             raise ValueError("Gemini API key is required")
         self.client = genai.Client()
+        self.rate_limiter = get_rate_limiter("gemini", self.model)
     
-    def invoke_model(self, prompt, max_tokens=2000, temperature=0.7):
-        """Invoke Azure OpenAI with a given prompt and return the response text.
+    def invoke_model(self, prompt, max_tokens=2000, temperature=0.7, response_model=None, system_message=None):
+        """Invoke Gemini with a given prompt and return the response text.
         
         Args:
-            prompt (str): The prompt to send to the model.
+            prompt (str or CacheablePrompt): The prompt to send to the model. Gemini 2.5
+                caches repeated prefixes implicitly, so the prompt is sent prefix-first.
             max_tokens (int): Maximum number of tokens to generate. Defaults to 2000.
             temperature (float): Temperature for response generation. Defaults to 0.7.
+            response_model (Type[BaseModel]): If given, Gemini returns JSON constrained
+                to this schema.
+            system_message (str): Optional system instruction.
             
         Returns:
             str or None: The generated text if successful, None otherwise.
         """
+        def call():
+            try:
+                return self.client.models.generate_content(
+                    model=self.model,
+                    contents=str(prompt),
+                    config=self._generation_config(max_tokens, temperature, response_model, system_message),
+                )
+            except genai_errors.APIError as e:
+                if e.code not in RETRYABLE_STATUS_CODES:
+                    raise
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                raise RetryableError(e, parse_retry_after(headers))
+
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-            )
+            start = time.perf_counter()
+            response, retries = self.rate_limiter.call(call, estimate_tokens(prompt))
+            record_usage("gemini", self.model, self._usage(response),
+                         latency=time.perf_counter() - start, retries=retries)
             generated_text = response.text
             return generated_text
 
+        except (CircuitOpenError, RetryExhaustedError) as e:
+            print(f"Gemini unavailable: {e}")
+            return None
         except Exception as e:
             print(f"Gemini API Error: {e}")
             return None
 
     @staticmethod
-    def parse_json_string(entry):
+    def _generation_config(max_tokens, temperature, response_model=None, system_message=None):
+        config = {"max_output_tokens": max_tokens, "temperature": temperature}
+        if system_message:
+            config["system_instruction"] = system_message
+        if response_model is not None:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = response_model
+        return genai_types.GenerateContentConfig(**config)
+
+    @staticmethod
+    def _usage(response) -> LLMUsage:
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata is None:
+            return LLMUsage()
+        return LLMUsage(
+            prompt_tokens=metadata.prompt_token_count or 0,
+            completion_tokens=metadata.candidates_token_count or 0,
+            cached_tokens=metadata.cached_content_token_count or 0,
+        )
+
+    @staticmethod
+    def parse_json_string(entry, schema=None):
         """Parse a JSON string from a raw model response.
 
         Args:
             entry (str or tuple): The raw model response.
+            schema (Type[BaseModel]): Optional Pydantic model to validate against.
 
         Returns:
             dict: Parsed JSON object.
@@ -53,23 +110,17 @@ class GeminiClient:
         Raises:
             ValueError: If no JSON block is found or parsing fails.
         """
-        if isinstance(entry, tuple):
-            entry = entry[0]
-        
-        if "```json" in entry:
-            match = re.search(r"```json\s*(\{.*?\})\s*```", entry, re.DOTALL)
-            if match:
-                json_block = match.group(1)
-                cleaned = json_block.replace('""', '"')
-                return json.loads(cleaned)
-            else:
-                raise ValueError("No JSON block found in text containing markdown.")
-        
-        try:
-            cleaned = ast.literal_eval(f"'''{entry}'''")
-            return json.loads(cleaned)
-        except Exception as e:
-            raise ValueError(f"Error parsing JSON: {e}")
+        return parse_json_response(entry, schema)
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client() -> GeminiClient:
+    """Build the shared client on first use, so unused providers need no credentials."""
+    return GeminiClient()
 
 
-gemini_client = GeminiClient()
+def __getattr__(name):
+    # Keeps `from app.llms.gemini_client import gemini_client` working without eager construction.
+    if name == "gemini_client":
+        return get_gemini_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,57 @@
+import json
+from typing import Optional, Type
+
+from pydantic import BaseModel
+
+
+def _extract_json_text(entry: str) -> str:
+    """Return the JSON object text inside a model response.
+
+    Structured-output calls return bare JSON, which is used as-is. Otherwise the
+    first fenced block or the outermost ``{...}`` span is taken, without regexes.
+    """
+    text = entry.strip()
+    if text.startswith("{"):
+        return text
+    fence = text.find("```")
+    if fence != -1:
+        start = text.find("\n", fence)
+        end = text.find("```", start + 1)
+        if start != -1 and end != -1:
+            return text[start + 1:end].strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("No JSON object found in model response.")
+    return text[start:end + 1]
+
+
+def parse_json_response(entry, schema: Optional[Type[BaseModel]] = None) -> dict:
+    """Parse (and optionally validate) the JSON object in a raw model response.
+
+    Args:
+        entry (str or tuple): The raw model response.
+        schema (Type[BaseModel]): Optional Pydantic model used to validate the payload.
+
+    Returns:
+        dict: Parsed JSON object, normalized through ``schema`` when given.
+
+    Raises:
+        ValueError: If no JSON object is found, parsing fails or validation fails.
+    """
+    if isinstance(entry, tuple):
+        entry = entry[0]
+    if not entry:
+        raise ValueError("Model returned no response to parse.")
+
+    text = _extract_json_text(entry)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Error parsing JSON: {e}")
+
+    if schema is None:
+        return data
+    try:
+        return schema.model_validate(data).model_dump()
+    except Exception as e:
+        raise ValueError(f"Model response does not match {schema.__name__}: {e}")
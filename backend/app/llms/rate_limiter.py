@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit breaker is open and calls are rejected."""
+
+
+class RetryExhaustedError(Exception):
+    """Raised when a call still fails with a retryable error after every retry."""
+
+
+class RetryableError(Exception):
+    """Wraps a provider error that may succeed if the call is repeated.
+
+    Args:
+        original (Exception): The error raised by the provider SDK.
+        retry_after (float): Seconds the provider asked us to wait, if any.
+    """
+
+    def __init__(self, original: Exception, retry_after: Optional[float] = None):
+        super().__init__(str(original))
+        self.original = original
+        self.retry_after = retry_after
+
+
+def estimate_tokens(text) -> int:
+    """Cheap prompt-size estimate (~4 characters per token) used for TPM accounting."""
+    if not text:
+        return 0
+    return max(1, len(str(text)) // 4)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``capacity`` per minute."""
+
+    def __init__(self, capacity: int):
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.refill_rate = self.capacity / 60.0
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return how long the caller must wait before using them.
+
+        Requests larger than the bucket are clamped to its capacity so they can
+        still go through once the bucket is full.
+        """
+        amount = min(float(amount), self.capacity)
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_rate
+
+    def drain(self, seconds: float):
+        """Empty the bucket so no new work starts for roughly ``seconds``."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.refill_rate)
+
+
+class CircuitBreaker:
+    """Stops calling a provider after repeated failures and probes it again after a cool-down.
+
+    Once the cool-down has passed, exactly one caller is let through as a probe;
+    everyone else is still rejected until that probe succeeds (closing the
+    circuit) or fails (re-opening it for another cool-down).
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def release_probe(self):
+        """Let another caller probe; used when the probe ended without a verdict."""
+        with self.lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class RateLimiter:
+    """RPM + TPM limiter with adaptive retry and circuit breaking for one deployment.
+
+    Args:
+        name (str): Label used in logs, e.g. ``"azure-openai:gpt-4o"``.
+        rpm (int): Requests per minute allowed by the quota.
+        tpm (int): Tokens per minute allowed by the quota.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.LLM_CIRCUIT_RECOVERY_SECONDS,
+        )
+
+    def acquire(self, estimated_tokens: int):
+        """Block until both the request and token budgets allow one more call."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            logger.info(f"[{self.name}] rate limit reached, waiting {wait:.2f}s")
+            time.sleep(wait)
+
+    def call(self, fn: Callable, estimated_tokens: int = 0):
+        """Run ``fn`` under the limiter, retrying ``RetryableError`` with jittered backoff.
+
+        Returns:
+            Tuple[Any, int]: The result of ``fn`` and the number of retries performed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+            RetryExhaustedError: If the call still fails after ``LLM_MAX_RETRIES`` retries.
+        """
+        max_retries = settings.LLM_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {self.name}")
+            self.acquire(estimated_tokens)
+            try:
+                result = fn()
+            except RetryableError as e:
+                self.breaker.record_failure()
+                if attempt == max_retries:
+                    raise RetryExhaustedError(
+                        f"{self.name} still failing after {max_retries} retries: {e.original}"
+                    ) from e.original
+                delay = self.backoff(attempt, e.retry_after)
+                if e.retry_after:
+                    # The provider told us the whole deployment is saturated:
+                    # hold back every caller sharing this limiter, not only this one.
+                    self.requests.drain(delay)
+                logger.warning(f"[{self.name}] retryable error ({e.original}); retry {attempt + 1} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            except Exception:
+                # Not a provider-health signal (e.g. a bad request): don't leave a probe hanging.
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            return result, attempt
+
+    @staticmethod
+    def backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, never shorter than ``Retry-After``."""
+        delay = min(settings.LLM_BACKOFF_MAX_SECONDS, settings.LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+        delay = random.uniform(0, delay)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Read ``retry-after-ms`` / ``Retry-After`` (seconds) from a response header mapping."""
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return float(value) / 1000.0
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value is not None:
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, deployment: str) -> RateLimiter:
+    """Return the shared limiter for a (provider, deployment) pair, creating it on first use."""
+    key = (provider, deployment)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(
+                name=f"{provider}:{deployment}",
+                rpm=settings.LLM_RPM_LIMITS.get(provider, settings.LLM_RPM_LIMIT),
+                tpm=settings.LLM_TPM_LIMITS.get(provider, settings.LLM_TPM_LIMIT),
+            )
+        return _limiters[key]
@@ -0,0 +1,242 @@
+import threading
+import time
+import logging
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.telemetry import llm_task, observe_llm_call
+from app.llms.json_utils import parse_json_response
+from app.llms.usage import get_usage_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _load_client(provider: str):
+    """Import and build the client for ``provider``; its SDK is only imported here."""
+    if provider == "azure-openai":
+        from app.llms.azure_openai_client import get_azure_client
+        return get_azure_client()
+    if provider == "bedrock":
+        from app.llms.bedrock_client import get_bedrock_client
+        return get_bedrock_client()
+    if provider == "gemini":
+        from app.llms.gemini_client import get_gemini_client
+        return get_gemini_client()
+    raise ValueError(f"Invalid model provider: {provider}")
+
+
+class ProviderStats:
+    """Rolling latency / error window for one provider.
+
+    Error samples older than ``error_ttl`` seconds no longer count towards the
+    error rate, so a provider demoted during an outage becomes eligible again
+    and its next call acts as a probe.
+    """
+
+    def __init__(self, window: int, error_ttl: float = 300.0):
+        self.samples = deque(maxlen=window)
+        self.error_ttl = error_ttl
+        self.lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self.lock:
+            self.samples.append((time.monotonic(), latency, ok))
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self.lock:
+            latencies = sorted(latency for _, latency, ok in self.samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(pct * len(latencies)))]
+
+    @property
+    def error_rate(self) -> float:
+        cutoff = time.monotonic() - self.error_ttl
+        with self.lock:
+            recent = [ok for recorded_at, _, ok in self.samples if recorded_at >= cutoff]
+        if not recent:
+            return 0.0
+        return sum(1 for ok in recent if not ok) / len(recent)
+
+    @property
+    def healthy(self) -> bool:
+        return self.error_rate < settings.LLM_ROUTER_MAX_ERROR_RATE
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": len(self.samples),
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "error_rate": self.error_rate,
+            "healthy": self.healthy,
+        }
+
+
+class LLMRouter:
+    """Routes LLM calls to the fastest healthy provider among all configured clients.
+
+    Clients are built the first time they are routed to. A client that cannot be
+    constructed (missing key, missing SDK) is marked unavailable and skipped, so
+    the router works with any subset of Azure OpenAI, Bedrock and Gemini.
+    """
+
+    def __init__(self, providers: Optional[List[str]] = None):
+        self.providers = list(providers or settings.LLM_PROVIDERS)
+        self.clients = {}
+        self.unavailable: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.stats: Dict[str, ProviderStats] = {
+            provider: ProviderStats(settings.LLM_ROUTER_WINDOW, settings.LLM_ROUTER_ERROR_TTL_SECONDS)
+            for provider in self.providers
+        }
+        # Built on the first hedged call, so routers that never hedge start no threads.
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def _client(self, provider: str):
+        with self.lock:
+            if provider not in self.clients and provider not in self.unavailable:
+                try:
+                    self.clients[provider] = _load_client(provider)
+                except Exception as e:
+                    logger.warning(f"LLM provider {provider} not available: {e}")
+                    self.unavailable[provider] = str(e)
+            return self.clients.get(provider)
+
+    def ranked_providers(self, task: Optional[str] = None) -> List[str]:
+        """Providers in the order they should be tried for ``task``.
+
+        A pinned provider always goes first. The rest are ordered healthy-first,
+        then by p95 latency. Providers with no successful call yet have no
+        latency to compare, so they follow the measured ones in configured
+        preference order (and on a cold start the order is simply the preference).
+        """
+        order = [provider for provider in self.providers if provider not in self.unavailable]
+        pinned = settings.LLM_TASK_PROVIDERS.get(task) if task else None
+
+        def key(provider):
+            stats = self.stats[provider]
+            p95 = stats.percentile(0.95)
+            return (
+                provider != pinned,
+                not stats.healthy,
+                p95 is None,
+                p95 or 0.0,
+                order.index(provider),
+            )
+
+        return sorted(order, key=key)
+
+    def _call(self, provider: str, prompt, **kwargs):
+        client = self._client(provider)
+        if client is None:
+            return None
+        start = time.perf_counter()
+        text = None
+        try:
+            text = client.invoke_model(prompt, **kwargs)
+        finally:
+            latency = time.perf_counter() - start
+            self.stats[provider].record(latency, text is not None)
+            if text is None:
+                # Successful calls are exported by the client together with token usage.
+                observe_llm_call(provider, getattr(client, "model", "unknown"), latency, status="error")
+        return text
+
+    def _hedge_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=settings.LLM_HEDGE_MAX_WORKERS,
+                                                   thread_name_prefix="llm-hedge")
+            return self.executor
+
+    def close(self):
+        """Stop the hedging threads; a later hedged call starts a new pool."""
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _hedged_call(self, primary: str, backup: str, prompt, **kwargs):
+        """Start ``primary``; if it is slower than its usual p95, race ``backup`` against it."""
+        executor = self._hedge_executor()
+        delay = max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, self.stats[primary].percentile(0.95) or 0.0)
+        # copy_context keeps the task label and request summary visible in executor threads.
+        pending = {executor.submit(contextvars.copy_context().run, self._call, primary, prompt, **kwargs)}
+        done, pending = wait(pending, timeout=delay)
+        if not done:
+            logger.info(f"Hedging slow {primary} call with {backup} after {delay:.2f}s")
+            pending.add(executor.submit(contextvars.copy_context().run, self._call, backup, prompt, **kwargs))
+        while pending or done:
+            for future in done:
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.error(f"Hedged LLM call failed: {e}")
+                    continue
+                if text is not None:
+                    return text
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        return None
+
+    def invoke_model(self, prompt, task: Optional[str] = None, hedge: Optional[bool] = None,
+                     system_message="You are a helpful assistant.", max_tokens=2000,
+                     temperature=0.7, response_model=None):
+        """Invoke the best provider for ``task``, failing over down the ranking.
+
+        Args:
+            prompt (str or CacheablePrompt): The prompt to send to the model.
+            task (str): Task label used for pinning and stats (e.g. "score").
+            hedge (bool): Race a backup provider against a slow primary.
+                Defaults to ``LLM_HEDGE_ENABLED``.
+            system_message (str): System message to set model behavior.
+            max_tokens (int): Maximum number of tokens to generate.
+            temperature (float): Temperature for response generation.
+            response_model (Type[BaseModel]): Schema for structured JSON output.
+
+        Returns:
+            str or None: The generated text if any provider succeeded, None otherwise.
+        """
+        kwargs = dict(system_message=system_message, max_tokens=max_tokens,
+                      temperature=temperature, response_model=response_model)
+        hedge = settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        ranked = self.ranked_providers(task)
+
+        with llm_task(task):
+            if hedge and len(ranked) > 1:
+                text = self._hedged_call(ranked[0], ranked[1], prompt, **kwargs)
+                if text is not None:
+                    return text
+                ranked = ranked[2:]
+
+            for provider in ranked:
+                text = self._call(provider, prompt, **kwargs)
+                if text is not None:
+                    return text
+                logger.warning(f"LLM provider {provider} failed for task {task}; failing over")
+        return None
+
+    @staticmethod
+    def parse_json_string(entry, schema=None):
+        """Parse a JSON string from a raw model response. See ``parse_json_response``."""
+        return parse_json_response(entry, schema)
+
+    def get_stats(self) -> dict:
+        return {
+            "providers": {provider: stats.snapshot() for provider, stats in self.stats.items()},
+            "unavailable": dict(self.unavailable),
+            "ranking": self.ranked_providers(),
+            "task_pins": settings.LLM_TASK_PROVIDERS,
+            "hedging": settings.LLM_HEDGE_ENABLED,
+            "usage": get_usage_stats(),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_llm_router() -> LLMRouter:
+    return LLMRouter()
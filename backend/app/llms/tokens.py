@@ -0,0 +1,200 @@
+import re
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.telemetry import observe_tokens_saved
+
+logger = logging.getLogger(__name__)
+
+# Average characters per token for providers without a local tokenizer.
+CHARS_PER_TOKEN = {
+    "azure-openai": 4.0,
+    "bedrock": 3.5,
+    "gemini": 4.0,
+}
+
+# Kana, CJK ideographs and Hangul run close to one token per character in every
+# tokenizer we use, far from the ~4 characters per token of Latin text.
+CJK_CHARS = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff66-\uff9f]")
+TOKENS_PER_CJK_CHAR = 1.0
+
+# Lines that carry no information for extraction: navigation chrome, page furniture.
+BOILERPLATE_LINE = re.compile(
+    r"^(sign in|sign up|join now|log in|skip to main content|show more|show less|see more|see less"
+    r"|accept( all)? cookies|cookie policy|privacy policy|user agreement|terms of service"
+    r"|report this job|easy apply|©.*|copyright.*|page \d+ of \d+|[\W_]+)$",
+    re.IGNORECASE,
+)
+
+# Shorter lines (section labels such as "Responsibilities:") may legitimately repeat.
+# Repeated lines are only dropped when the text is over budget: they are usually
+# page headers/footers, but can be real content (identical spreadsheet rows).
+MIN_DEDUPE_CHARS = 16
+
+# Blocks that start with one of these headings are dropped first when over budget.
+LOW_VALUE_HEADINGS = (
+    "similar jobs",
+    "people also viewed",
+    "more jobs",
+    "explore collaborative articles",
+    "similar searches",
+    "referrals increase your chances",
+    "about the company",
+    "references",
+    "hobbies",
+    "interests",
+)
+
+
+@dataclass
+class BudgetResult:
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, provider: Optional[str] = None, model: Optional[str] = None) -> int:
+    """Count tokens for ``provider``'s model.
+
+    Azure OpenAI uses tiktoken when it is installed; other providers (and Azure
+    without tiktoken) use a per-provider characters-per-token estimate, with
+    CJK characters counted separately at about one token each.
+    """
+    if not text:
+        return 0
+    provider = provider or settings.LLM_PROVIDERS[0]
+    if provider == "azure-openai":
+        encoding = _tiktoken_encoding(model or settings.MODEL)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    return _estimate_tokens(text, CHARS_PER_TOKEN.get(provider, 4.0))
+
+
+def _estimate_tokens(text: str, chars_per_token: float) -> int:
+    cjk = len(CJK_CHARS.findall(text))
+    return max(1, int(cjk * TOKENS_PER_CJK_CHAR + (len(text) - cjk) / chars_per_token))
+
+
+def count_embedding_tokens(texts, model: str) -> int:
+    """Tokens billed for embedding ``texts`` with ``model``."""
+    encoding = _tiktoken_encoding(model) if model.startswith("text-embedding") else None
+    if encoding is not None:
+        return sum(len(encoding.encode(text, disallowed_special=())) for text in texts if text)
+    return sum(_estimate_tokens(text, 4.0) for text in texts if text)
+
+
+def provider_for_task(task: str) -> str:
+    """The provider whose tokenizer should be used to budget ``task``."""
+    return settings.LLM_TASK_PROVIDERS.get(task) or settings.LLM_PROVIDERS[0]
+
+
+def _clean_lines(text: str) -> List[str]:
+    """Collapse whitespace and drop boilerplate lines."""
+    lines = []
+    for raw in text.splitlines():
+        line = " ".join(raw.split())
+        if not line:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        if BOILERPLATE_LINE.match(line):
+            continue
+        lines.append(line)
+    return lines
+
+
+def _dedupe_lines(lines: List[str]) -> List[str]:
+    """Drop repeated lines (page headers/footers)."""
+    kept, seen = [], set()
+    for line in lines:
+        if len(line) >= MIN_DEDUPE_CHARS:
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return kept
+
+
+def _drop_low_value_blocks(lines: List[str]) -> List[str]:
+    kept, skipping, block_start = [], False, True
+    for line in lines:
+        if not line:
+            skipping, block_start = False, True
+        elif block_start:
+            skipping, block_start = line.lower().startswith(LOW_VALUE_HEADINGS), False
+        if not skipping:
+            kept.append(line)
+    return kept
+
+
+def fit_to_budget(text: str, max_tokens: int, provider: Optional[str] = None) -> BudgetResult:
+    """Shrink ``text`` to at most ``max_tokens``.
+
+    Boilerplate lines are always removed. If the text is still too long,
+    repeated lines are dropped, then low-value sections, then trailing lines are cut.
+    """
+    original_tokens = count_tokens(text, provider)
+    lines = _clean_lines(text)
+    result = "\n".join(lines).strip()
+    tokens = count_tokens(result, provider)
+
+    if tokens > max_tokens:
+        lines = _dedupe_lines(lines)
+        result = "\n".join(lines).strip()
+        tokens = count_tokens(result, provider)
+
+    if tokens > max_tokens:
+        lines = _drop_low_value_blocks(lines)
+        result = "\n".join(lines).strip()
+        tokens = count_tokens(result, provider)
+
+    if tokens > max_tokens:
+        kept, used = [], 0
+        for line in lines:
+            line_tokens = count_tokens(line, provider) + 1
+            if used + line_tokens > max_tokens:
+                # Keep the part of the overflowing line that still fits, so a
+                # single huge line (e.g. PDF text without newlines) is not lost entirely.
+                remaining = max_tokens - used
+                if remaining > 0:
+                    kept.append(line[:int(len(line) * remaining / line_tokens)])
+                break
+            kept.append(line)
+            used += line_tokens
+        result = "\n".join(kept).strip()
+        tokens = count_tokens(result, provider)
+
+    return BudgetResult(text=result, original_tokens=original_tokens, tokens=tokens)
+
+
+def budget_input(text: str, task: str, max_tokens: int) -> str:
+    """Fit a task's document text into its input budget; the tokens saved are logged and exported."""
+    provider = provider_for_task(task)
+    result = fit_to_budget(text, max_tokens, provider)
+    if result.tokens_saved:
+        observe_tokens_saved(task, provider, result.tokens_saved)
+        logger.info(
+            f"[{task}] input trimmed from {result.original_tokens} to {result.tokens} tokens "
+            f"({result.tokens_saved} saved)"
+        )
+    return result.text
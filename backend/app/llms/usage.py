@@ -0,0 +1,68 @@
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from app.core.telemetry import observe_llm_call
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+_totals: Dict[Tuple[str, str], UsageTotals] = {}
+_lock = threading.Lock()
+
+
+def record_usage(provider: str, model: str, usage: LLMUsage, latency: float = 0.0, retries: int = 0):
+    """Accumulate one successful call's token usage and export it to telemetry."""
+    with _lock:
+        totals = _totals.setdefault((provider, model), UsageTotals())
+        totals.calls += 1
+        totals.prompt_tokens += usage.prompt_tokens
+        totals.completion_tokens += usage.completion_tokens
+        totals.cached_tokens += usage.cached_tokens
+    logger.info(
+        f"[{provider}:{model}] prompt={usage.prompt_tokens} cached={usage.cached_tokens} "
+        f"completion={usage.completion_tokens} latency={latency:.2f}s retries={retries}"
+    )
+    observe_llm_call(
+        provider,
+        model,
+        latency,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        cached_tokens=usage.cached_tokens,
+        retries=retries,
+    )
+
+
+def get_usage_stats() -> dict:
+    with _lock:
+        return {
+            f"{provider}:{model}": {
+                "calls": totals.calls,
+                "prompt_tokens": totals.prompt_tokens,
+                "cached_tokens": totals.cached_tokens,
+                "completion_tokens": totals.completion_tokens,
+                "cache_hit_ratio": totals.cache_hit_ratio,
+            }
+            for (provider, model), totals in _totals.items()
+        }
@@ -0,0 +1,106 @@
+"""
+Pool of warm Selenium WebDrivers.
+
+Drivers are started on demand up to ``size``, handed out one caller at a time,
+and replaced after ``max_pages`` page loads or after an error.
+
+"""
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Resource types that never matter for text extraction.
+BLOCKED_URL_PATTERNS = [
+    "*.css", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.mp4", "*.webm",
+]
+
+
+class _PooledDriver:
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """Thread-safe pool of WebDrivers built by ``factory``."""
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_pages: int = 50):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.idle: "queue.LifoQueue[_PooledDriver]" = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def warm(self, count: Optional[int] = None):
+        """Start up to ``count`` (default: all) drivers ahead of the first request."""
+        for _ in range(min(count or self.size, self.size)):
+            with self.lock:
+                if self.created >= self.size:
+                    return
+                self.created += 1
+            self.idle.put(self._start())
+
+    def _start(self) -> _PooledDriver:
+        try:
+            return _PooledDriver(self.factory())
+        except Exception:
+            with self.lock:
+                self.created -= 1
+            raise
+
+    def _retire(self, pooled: _PooledDriver):
+        with self.lock:
+            self.created -= 1
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+
+    def _acquire(self) -> _PooledDriver:
+        while True:
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                can_start = self.created < self.size
+                if can_start:
+                    self.created += 1
+            if can_start:
+                return self._start()
+            try:
+                # Short waits: a retired driver frees a slot without anything being put back.
+                return self.idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Borrow a driver for one page load; blocks while all drivers are busy."""
+        pooled = self._acquire()
+
+        healthy = False
+        try:
+            yield pooled.driver
+            healthy = True
+        finally:
+            pooled.pages += 1
+            if self.closed or not healthy or pooled.pages >= self.max_pages:
+                self._retire(pooled)
+            else:
+                self.idle.put(pooled)
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self._retire(self.idle.get_nowait())
+            except queue.Empty:
+                break
@@ -5,23 +5,33 @@ Pandas parser for .xlsx files.
 
 """
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
 
 from llama_index.core.readers.base import BaseReader
 from llama_index.core.schema import Document
 
+# Separates cells while joining a row; never present in cell text.
+_CELL_SEP = "\x1f"
+
 
 class PandasExcelReader(BaseReader):
-    r"""Pandas-based CSV parser.
+    r"""Pandas-based Excel parser.
 
-    Parses CSVs using the separator detection from Pandas `read_csv`function.
-    If special parameters are required, use the `pandas_config` dict.
+    Rows are joined column-wise (no per-cell Python loop). With ``stream=True``,
+    .xlsx workbooks are read row by row through openpyxl's read-only mode and
+    emitted as one Document per ``rows_per_document`` rows, so neither the
+    workbook's cell objects nor a DataFrame are ever held in full. The extracted
+    text itself is not bounded: ``load_data`` (and the ingestion pipeline, which
+    needs the whole text) still collects every Document; only callers iterating
+    ``lazy_load_data`` keep one chunk at a time.
 
     Args:
 
         pandas_config (dict): Options for the `pandas.read_excel` function call.
             Refer to https://pandas.pydata.org/docs/reference/api/pandas.read_excel.html
             for more information. Set to empty dict by default, this means defaults will be used.
+        stream (bool): Use openpyxl read-only streaming for .xlsx input.
+        rows_per_document (int): Rows per Document; None puts each sheet in one Document.
 
     """
 
@@ -31,6 +41,8 @@ class PandasExcelReader(BaseReader):
         pandas_config: Optional[dict] = None,
         concat_rows: bool = True,
         row_joiner: str = "\n",
+        stream: bool = False,
+        rows_per_document: Optional[int] = None,
         **kwargs: Any
     ) -> None:
         """Init params."""
@@ -38,55 +50,119 @@ class PandasExcelReader(BaseReader):
         self._pandas_config = pandas_config or {}
         self._concat_rows = concat_rows
         self._row_joiner = row_joiner if row_joiner else "\n"
+        self._stream = stream
+        self._rows_per_document = rows_per_document
+
+    @staticmethod
+    def _file_name(file) -> Optional[str]:
+        name = file if isinstance(file, (str, Path)) else getattr(file, "name", None)
+        return Path(name).name if isinstance(name, (str, Path)) else None
+
+    @staticmethod
+    def _is_xlsx(file) -> bool:
+        name = file if isinstance(file, (str, Path)) else getattr(file, "name", None)
+        if isinstance(name, (str, Path)) and Path(name).suffix:
+            return Path(name).suffix.lower() in (".xlsx", ".xlsm")
+        if hasattr(file, "read"):
+            # Unnamed buffer: .xlsx is a zip container, legacy .xls is not.
+            position = file.tell()
+            magic = file.read(4)
+            file.seek(position)
+            return magic == b"PK\x03\x04"
+        return False
+
+    def _documents(self, rows: Iterable[str], sheet_name, file_name, extra_info) -> Iterator[Document]:
+        def make(chunk: List[str]) -> Optional[Document]:
+            text = self._row_joiner.join(chunk)
+            if not text.strip():
+                return None
+            doc_extra_info = {
+                'file_name': file_name,
+                'sheet_name': sheet_name
+            }
+            if extra_info:
+                doc_extra_info.update(extra_info)
+            return Document(text=text, extra_info=doc_extra_info)
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if self._rows_per_document and len(chunk) >= self._rows_per_document:
+                doc = make(chunk)
+                if doc:
+                    yield doc
+                chunk = []
+        doc = make(chunk)
+        if doc:
+            yield doc
+
+    @staticmethod
+    def _frame_rows(df) -> List[str]:
+        """Non-empty row texts of ``df``, cells stripped and space-joined, without iterrows."""
+        if df.empty:
+            return []
+        cells = df.fillna('').astype(str).apply(lambda col: col.str.strip())
+        joined = cells.iloc[:, 0].str.cat([cells.iloc[:, i] for i in range(1, cells.shape[1])], sep=_CELL_SEP)
+        # Empty cells leave runs of separators; collapse them to single spaces.
+        joined = joined.str.replace(f"{_CELL_SEP}+", " ", regex=True).str.strip()
+        return joined[joined != ''].tolist()
+
+    def _stream_rows(self, file, sheet_name) -> Iterator[tuple]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            if sheet_name is None:
+                names = workbook.sheetnames
+            elif isinstance(sheet_name, list):
+                names = [workbook.sheetnames[s] if isinstance(s, int) else s for s in sheet_name]
+            else:
+                names = [workbook.sheetnames[sheet_name] if isinstance(sheet_name, int) else sheet_name]
+            for name in names:
+                rows = (
+                    ' '.join(str(cell).strip() for cell in row if cell is not None and str(cell).strip())
+                    for row in workbook[name].iter_rows(values_only=True)
+                )
+                yield name, (row for row in rows if row)
+        finally:
+            workbook.close()
+
+    def lazy_load_data(
+        self,
+        file: Union[Path, BinaryIO],
+        sheet_name: Optional[Union[str, int, list]] = None,
+        extra_info: Optional[Dict] = None,
+    ) -> Iterator[Document]:
+        """Yield Documents sheet by sheet (and chunk by chunk when streaming)."""
+        file_name = self._file_name(file)
+        if self._stream and self._is_xlsx(file):
+            for name, rows in self._stream_rows(file, sheet_name):
+                yield from self._documents(rows, name, file_name, extra_info)
+            return
+
+        import pandas as pd
+
+        dfs = pd.read_excel(file, sheet_name=sheet_name, **self._pandas_config)
+        # Handle both single and multiple sheets
+        if not isinstance(dfs, dict):
+            dfs = {sheet_name if sheet_name else 0: dfs}
+        for name, df in dfs.items():
+            yield from self._documents(self._frame_rows(df), name, file_name, extra_info)
 
     def load_data(
     self,
-    file: Path,
+    file: Union[Path, BinaryIO],
     sheet_name: Optional[Union[str, int, list]] = None,
     extra_info: Optional[Dict] = None,
 ) -> List[Document]:
         """Parse Excel file and extract data.
 
         Args:
-            file (Path): The path to the Excel file to read.
+            file (Path | BinaryIO): The path to the Excel file to read, or an open binary buffer.
             sheet_name (Union[str, int, list, None]): The specific sheet to read from, default is None which reads all sheets.
             extra_info (Dict): Additional information to be added to the Document object.
 
         Returns:
             List[Document]: A list of Document objects containing the processed text from Excel sheets.
         """
-        import pandas as pd
-
-        dfs = pd.read_excel(file, sheet_name=sheet_name, **self._pandas_config)
-        documents = []
-        
-        # Handle both single and multiple sheets
-        if not isinstance(dfs, dict):
-            dfs = {sheet_name if sheet_name else 0: dfs}
-            
-        for sheet_name, df in dfs.items():
-            df = df.fillna('')
-            
-            rows = []
-            for _, row in df.iterrows():
-                row_text = ' '.join(str(cell).strip() for cell in row if str(cell).strip())
-                if row_text:
-                    rows.append(row_text)
-            
-            text = self._row_joiner.join(rows)
-            
-            if text.strip():
-                doc_extra_info = {
-                    'file_name': file.name,
-                    'sheet_name': sheet_name
-                }
-                if extra_info:
-                    doc_extra_info.update(extra_info)
-                    
-                doc = Document(
-                    text=text,
-                    extra_info=doc_extra_info
-                )
-                documents.append(doc)
-        
-        return documents
\ No newline at end of file
+        return list(self.lazy_load_data(file, sheet_name=sheet_name, extra_info=extra_info))
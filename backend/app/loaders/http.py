@@ -0,0 +1,296 @@
+"""
+Tiered web reader.
+
+Fetches URLs with a pooled HTTP/2 client first and only hands a URL to the
+Selenium browser pool when the static HTML does not carry the page content.
+
+"""
+import asyncio
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from llama_index.core.readers.base import BaseReader
+from llama_index.core.schema import Document
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.8",
+}
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+_BLOCK_TAGS = {"p", "div", "section", "article", "li", "ul", "ol", "br", "tr", "table",
+               "h1", "h2", "h3", "h4", "h5", "h6", "header", "footer", "main", "aside"}
+
+
+class _PageParser(HTMLParser):
+    """One pass over the HTML: visible text, title, meta description and lang."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title = ""
+        self.description = ""
+        self.language = ""
+        self._skip = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "html":
+            self.language = dict(attrs).get("lang") or ""
+        elif tag == "meta":
+            attrs = dict(attrs)
+            if (attrs.get("name") or "").lower() == "description":
+                self.description = attrs.get("content") or ""
+        elif tag == "title":
+            self._in_title = True
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if tag in _SKIP_TAGS and self._skip:
+            self._skip -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self.parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def _parse(html: str) -> _PageParser:
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+class TieredWebReader(BaseReader):
+    """Load URLs over plain HTTP, falling back to a browser for JS-rendered pages.
+
+    The HTTP tier keeps one connection-pooled HTTP/2 client with compression and
+    revalidates previously fetched pages with ETag / Last-Modified, so unchanged
+    pages come back as 304s. A URL goes to the browser when its host is listed in
+    ``js_hosts``, the response is not a successful HTML page, or the visible text
+    is shorter than ``min_text_chars`` or less than ``min_text_ratio`` of the HTML.
+
+    Args:
+        browser_config (dict): Kwargs for the fallback ``SeleniumWebReader``.
+        js_hosts (Sequence[str]): Hosts (and their subdomains) that always need a browser.
+        min_text_chars (int): Minimum visible text for static HTML to count as content.
+        min_text_ratio (float): Minimum visible-text / HTML size ratio.
+        timeout (float): Per-request timeout in seconds.
+        max_connections (int): Connection pool size, also the number of concurrent fetches.
+        cache_size (int): Pages kept for conditional revalidation.
+    """
+
+    def __init__(
+            self,
+            browser_config: Optional[Dict[str, Any]] = None,
+            js_hosts: Sequence[str] = (),
+            min_text_chars: int = 500,
+            min_text_ratio: float = 0.02,
+            timeout: float = 10,
+            max_connections: int = 20,
+            cache_size: int = 256,
+    ) -> None:
+        """Init params."""
+        self.browser_config = browser_config or {}
+        self.js_hosts = tuple(host.strip().lower() for host in js_hosts if host.strip())
+        self.min_text_chars = min_text_chars
+        self.min_text_ratio = min_text_ratio
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Dict[str, str], Document]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._browser = None
+        self._client = None
+        # An AsyncClient is bound to the loop it first ran on: one per loop.
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = \
+            weakref.WeakKeyDictionary()
+
+    @property
+    def browser(self):
+        with self._lock:
+            if self._browser is None:
+                from app.loaders.url import SeleniumWebReader
+
+                self._browser = SeleniumWebReader(**self.browser_config)
+            return self._browser
+
+    def warm(self):
+        """Start the fallback browsers now instead of on the first page that needs one."""
+        self.browser.pool.warm()
+
+    def _client_kwargs(self) -> dict:
+        import httpx
+
+        return {
+            "http2": True,
+            "headers": HEADERS,
+            "follow_redirects": True,
+            "timeout": self.timeout,
+            "limits": httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections),
+        }
+
+    def _sync_client(self):
+        import httpx
+
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(**self._client_kwargs())
+            return self._client
+
+    def _aclient(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(**self._client_kwargs())
+            return client
+
+    def _needs_browser_host(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == js or host.endswith("." + js) for js in self.js_hosts)
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            cached = self._cache.get(url)
+        return dict(cached[0]) if cached else {}
+
+    def _remember(self, url: str, response, doc: Document):
+        validators = {}
+        if etag := response.headers.get("etag"):
+            validators["If-None-Match"] = etag
+        if modified := response.headers.get("last-modified"):
+            validators["If-Modified-Since"] = modified
+        if not validators:
+            return
+        with self._lock:
+            self._cache[url] = (validators, doc)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _handle(self, url: str, response) -> Optional[Document]:
+        """Document for a static response, or None when the page needs a browser."""
+        if response.status_code == 304:
+            with self._lock:
+                cached = self._cache.get(url)
+                if cached:
+                    self._cache.move_to_end(url)
+                    return cached[1]
+            return None
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or "html" not in content_type:
+            return None
+
+        html = response.text
+        page = _parse(html)
+        text = page.text()
+        if len(text) < self.min_text_chars or len(text) < self.min_text_ratio * len(html):
+            return None
+        doc = Document(text=text, metadata={
+            "source": url,
+            "title": page.title.strip() or "No title found.",
+            "description": page.description or "No description found.",
+            "language": page.language or "No language found.",
+        })
+        self._remember(url, response, doc)
+        return doc
+
+    def _fetch(self, url: str) -> Optional[Document]:
+        if self._needs_browser_host(url):
+            return None
+        try:
+            response = self._sync_client().get(url, headers=self._conditional_headers(url))
+            return self._handle(url, response)
+        except Exception as e:
+            logger.info(f"HTTP fetch failed for {url}, falling back to browser: {e}")
+            return None
+
+    async def _afetch(self, url: str) -> Optional[Document]:
+        if self._needs_browser_host(url):
+            return None
+        try:
+            response = await self._aclient().get(url, headers=self._conditional_headers(url))
+            return self._handle(url, response)
+        except Exception as e:
+            logger.info(f"HTTP fetch failed for {url}, falling back to browser: {e}")
+            return None
+
+    def _merge(self, urls: List[str], docs: List[Optional[Document]], rendered: List[Document]) -> List[Document]:
+        by_url = {doc.metadata.get("source"): doc for doc in rendered}
+        merged = [doc if doc is not None else by_url.get(url) for url, doc in zip(urls, docs)]
+        return [doc for doc in merged if doc is not None]
+
+    def load_data(self, urls: List[str]) -> List[Document]:
+        """Load ``urls`` in order; static pages over HTTP, the rest through the browser pool."""
+        if len(urls) <= 1:
+            docs = [self._fetch(url) for url in urls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_connections, len(urls))) as executor:
+                docs = list(executor.map(self._fetch, urls))
+        pending = [url for url, doc in zip(urls, docs) if doc is None]
+        rendered = self.browser.load_data(pending) if pending else []
+        return self._merge(urls, docs, rendered)
+
+    async def aload_data(self, urls: List[str]) -> List[Document]:
+        """Async ``load_data``: concurrent HTTP fetches, browser fallback off the event loop."""
+        docs = await asyncio.gather(*[self._afetch(url) for url in urls])
+        pending = [url for url, doc in zip(urls, docs) if doc is None]
+        rendered = await asyncio.to_thread(self.browser.load_data, pending) if pending else []
+        return self._merge(urls, list(docs), rendered)
+
+    async def aclose(self):
+        """Close the async client of the running loop."""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        """Close the HTTP clients (async ones on their own loops) and quit the browsers."""
+        with self._lock:
+            sync_client, self._client = self._client, None
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        if sync_client is not None:
+            sync_client.close()
+        for loop, client in async_clients:
+            if loop.is_closed():
+                continue  # its connections went down with the loop
+            try:
+                current = asyncio.get_running_loop()
+            except RuntimeError:
+                current = None
+            if loop is current:
+                loop.create_task(client.aclose())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=self.timeout)
+            else:
+                loop.run_until_complete(client.aclose())
+        if self._browser is not None:
+            self._browser.close()
@@ -0,0 +1,43 @@
+"""
+OpenDocument Text reader.
+
+Reads paragraphs and headings from .odt files with the standard library only.
+
+"""
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from llama_index.core.readers.base import BaseReader
+from llama_index.core.schema import Document
+
+TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+BLOCKS = {f"{{{TEXT_NS}}}p", f"{{{TEXT_NS}}}h"}
+
+
+class OdtReader(BaseReader):
+    """Extracts text from an .odt file's content.xml, one line per paragraph or heading."""
+
+    def load_data(
+        self,
+        file: Union[Path, BinaryIO],
+        extra_info: Optional[Dict] = None,
+    ) -> List[Document]:
+        with zipfile.ZipFile(file) as archive:
+            root = ET.fromstring(archive.read("content.xml"))
+
+        lines = []
+        for element in root.iter():
+            if element.tag in BLOCKS:
+                line = "".join(element.itertext()).strip()
+                if line:
+                    lines.append(line)
+        if not lines:
+            return []
+
+        name = file if isinstance(file, (str, Path)) else getattr(file, "name", None)
+        metadata = {"file_name": Path(name).name if isinstance(name, (str, Path)) else None}
+        if extra_info:
+            metadata.update(extra_info)
+        return [Document(text="\n".join(lines), extra_info=metadata)]
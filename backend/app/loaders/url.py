@@ -1,8 +1,8 @@
 """Beautiful Soup Web scraper."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, List, Literal, Optional, Union
-from unstructured.partition.html import partition_html
 
 if TYPE_CHECKING:
     from selenium.webdriver import Chrome, Firefox
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 from llama_index.core.readers.base import BaseReader
 from llama_index.core.schema import Document
 
+from app.loaders.browser_pool import BLOCKED_URL_PATTERNS, BrowserPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,10 @@ class SeleniumWebReader(BaseReader):
         website_extractor (Optional[Dict[str, Callable]]): A mapping of website
             hostname (e.g. google.com) to a function that specifies how to
             extract text from the BeautifulSoup obj. See DEFAULT_WEBSITE_EXTRACTOR.
+        pool_size (int): Browsers kept warm and used to fetch URLs concurrently.
+        max_pages_per_driver (int): Page loads before a browser is restarted.
+        block_resources (bool): Skip images, fonts and stylesheets.
+        page_load_timeout (float): Seconds before a page load is abandoned.
     """
 
     def __init__(
@@ -33,6 +39,10 @@ class SeleniumWebReader(BaseReader):
             executable_path: Optional[str] = None,
             headless: bool = True,
             arguments: object = None,
+            pool_size: int = 2,
+            max_pages_per_driver: int = 50,
+            block_resources: bool = True,
+            page_load_timeout: float = 30,
     ) -> None:
         
         """Load a list of URLs using Selenium and unstructured."""
@@ -60,6 +70,9 @@ class SeleniumWebReader(BaseReader):
         self.executable_path = executable_path
         self.headless = headless
         self.arguments = arguments
+        self.block_resources = block_resources
+        self.page_load_timeout = page_load_timeout
+        self.pool = BrowserPool(self._get_driver, size=pool_size, max_pages=max_pages_per_driver)
 
     def _get_driver(self) -> Union["Chrome", "Firefox"]:
         """Create and return a WebDriver instance based on the specified browser.
@@ -76,9 +89,16 @@ class SeleniumWebReader(BaseReader):
             from selenium.webdriver.chrome.service import Service
 
             chrome_options = ChromeOptions()
+            # Return once the DOM is parsed instead of waiting for every subresource.
+            chrome_options.page_load_strategy = "eager"
 
             for arg in self.arguments:
                 chrome_options.add_argument(arg)
+            if self.block_resources:
+                chrome_options.add_experimental_option("prefs", {
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.managed_default_content_settings.fonts": 2,
+                })
 
             if self.headless:
                 chrome_options.add_argument("--headless")
@@ -86,31 +106,45 @@ class SeleniumWebReader(BaseReader):
             if self.binary_location is not None:
                 chrome_options.binary_location = self.binary_location
             if self.executable_path is None:
-                return Chrome(options=chrome_options)
-            return Chrome(
-                options=chrome_options,
-                service=Service(executable_path=self.executable_path),
-            )
+                driver = Chrome(options=chrome_options)
+            else:
+                driver = Chrome(
+                    options=chrome_options,
+                    service=Service(executable_path=self.executable_path),
+                )
+            if self.block_resources:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            driver.set_page_load_timeout(self.page_load_timeout)
+            return driver
         elif self.browser.lower() == "firefox":
             from selenium.webdriver import Firefox
             from selenium.webdriver.firefox.options import Options as FirefoxOptions
             from selenium.webdriver.firefox.service import Service
 
             firefox_options = FirefoxOptions()
+            firefox_options.page_load_strategy = "eager"
 
             for arg in self.arguments:
                 firefox_options.add_argument(arg)
+            if self.block_resources:
+                firefox_options.set_preference("permissions.default.image", 2)
+                firefox_options.set_preference("permissions.default.stylesheet", 2)
+                firefox_options.set_preference("browser.display.use_document_fonts", 0)
 
             if self.headless:
                 firefox_options.add_argument("--headless")
             if self.binary_location is not None:
                 firefox_options.binary_location = self.binary_location
             if self.executable_path is None:
-                return Firefox(options=firefox_options)
-            return Firefox(
-                options=firefox_options,
-                service=Service(executable_path=self.executable_path),
-            )
+                driver = Firefox(options=firefox_options)
+            else:
+                driver = Firefox(
+                    options=firefox_options,
+                    service=Service(executable_path=self.executable_path),
+                )
+            driver.set_page_load_timeout(self.page_load_timeout)
+            return driver
         else:
             raise ValueError("Invalid browser specified. Use 'chrome' or 'firefox'.")
 
@@ -146,32 +180,42 @@ class SeleniumWebReader(BaseReader):
             pass
         return metadata
 
+    def _load_url(self, url: str) -> Optional[Document]:
+        from unstructured.partition.html import partition_html
+
+        try:
+            with self.pool.driver() as driver:
+                driver.get(url)
+                page_content = driver.page_source
+                metadata = self._build_metadata(url, driver)
+            elements = partition_html(text=page_content)
+            text = "\n\n".join([str(el) for el in elements])
+            return Document(text=text, metadata=metadata)
+        except Exception as e:
+            if self.continue_on_failure:
+                logger.error(f"Error fetching or processing {url}, exception: {e}")
+                return None
+            raise e
+
     def load_data(
         self,
         urls: list[str],
     ) -> List[Document]:
         """Load the specified URLs using Selenium and create Document instances.
 
+        URLs are fetched concurrently on the reader's browser pool; browsers stay
+        open for the next call.
+
         Returns:
-            List[Document]: A list of Document instances with loaded content.
+            List[Document]: A list of Document instances with loaded content, in URL order.
         """
+        if len(urls) <= 1:
+            docs = [self._load_url(url) for url in urls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.pool.size, len(urls))) as executor:
+                docs = list(executor.map(self._load_url, urls))
+        return [doc for doc in docs if doc is not None]
 
-        docs: List[Document] = list()
-        driver = self._get_driver()
-
-        for url in urls:
-            try:
-                driver.get(url)
-                page_content = driver.page_source
-                elements = partition_html(text=page_content)
-                text = "\n\n".join([str(el) for el in elements])
-                metadata = self._build_metadata(url, driver)
-                docs.append(Document(text=text, metadata=metadata))
-            except Exception as e:
-                if self.continue_on_failure:
-                    logger.error(f"Error fetching or processing {url}, exception: {e}")
-                else:
-                    raise e
-
-        driver.quit()
-        return docs
\ No newline at end of file
+    def close(self):
+        """Quit all pooled browsers."""
+        self.pool.close()
@@ -2,22 +2,51 @@ from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from prometheus_client import make_asgi_app
 from app.api.v1.routes import (auth,
                             matcher, 
                             jd, 
-                            resumes
+                            resumes,
+                            llm
                             )
-from app.core.config import init_settings
+from app.core.config import init_settings, settings
+from app.api.v1.middlewares.telemetry import TelemetryMiddleware
+from app.llms.router import get_llm_router
+from app.modules.loaders import get_loader
 
 init_settings()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.BROWSER_WARM_ON_STARTUP:
+        # Browser startup takes seconds; pay it here rather than on the first URL upload.
+        try:
+            await asyncio.to_thread(get_loader(".url").warm)
+        except Exception as e:
+            logging.warning(f"Could not warm the browser pool: {e}")
+    yield
+    # Only shut down what was actually built during the app's lifetime.
+    if get_llm_router.cache_info().currsize:
+        get_llm_router().close()
+    if get_loader.cache_info().currsize:
+        url_loader = get_loader(".url")
+        await url_loader.aclose()
+        await asyncio.to_thread(url_loader.close)
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(auth.router)
 app.include_router(resumes.router)
 app.include_router(jd.router)
 app.include_router(matcher.router)
+app.include_router(llm.router)
 # app.include_router(rag.router)
+app.add_middleware(TelemetryMiddleware)
+app.mount("/metrics", make_asgi_app())
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
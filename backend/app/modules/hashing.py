@@ -0,0 +1,8 @@
+import hashlib
+import unicodedata
+
+
+def content_hash(text: str) -> str:
+    """sha256 of text after Unicode, case and whitespace normalization."""
+    normalized = " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -1,61 +1,166 @@
-from llama_index.readers.file import (
-    DocxReader,
-    PDFReader,
-    MarkdownReader,
-    PptxReader,
-    UnstructuredReader,
-    XMLReader,
-    CSVReader
-)
-
 from llama_index.core import Document
-from app.loaders.excel import PandasExcelReader
-from app.loaders.url import SeleniumWebReader
-from typing import List
+from app.core.config import settings
+from functools import lru_cache
+from importlib import import_module
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
 from pathlib import Path
+import io
+import os
+import shutil
+import tempfile
+
+
+class UnsupportedFileError(ValueError):
+    """The file type has no reader, or in-memory content came without a file name."""
+
+
+# Rows per Document when reading .xlsx sheets through openpyxl's read-only mode.
+EXCEL_ROWS_PER_DOCUMENT = 1000
 
+_FILE_READERS = "llama_index.readers.file"
+
+# Extension -> ("module:ReaderClass", reader kwargs). Reader modules are imported,
+# and readers built, the first time an extension is actually loaded.
 LOADERS = {
-    ".csv": (CSVReader, {}),
-    ".docx": (DocxReader, {}),
-    ".eml": (UnstructuredReader, {}),
-    ".epub": (UnstructuredReader, {}),
-    ".html": (UnstructuredReader, {}),
-    ".md": (MarkdownReader, {}),
-    ".odt": (PandasExcelReader, {}),
-    ".pdf": (PDFReader, {}),
-    ".pptx": (PptxReader, {}),
-    ".txt": (UnstructuredReader, {}),
-    ".xls": (PandasExcelReader, {}),
-    ".xlsx": (PandasExcelReader, {}),
-    ".xml": (XMLReader, {}),
-    ".url": (SeleniumWebReader, {"browser": "chrome", "headless": True}),
+    ".csv": (f"{_FILE_READERS}:CSVReader", {}),
+    ".docx": (f"{_FILE_READERS}:DocxReader", {}),
+    ".eml": (f"{_FILE_READERS}:UnstructuredReader", {}),
+    ".epub": (f"{_FILE_READERS}:UnstructuredReader", {}),
+    ".html": (f"{_FILE_READERS}:UnstructuredReader", {}),
+    ".md": (f"{_FILE_READERS}:MarkdownReader", {}),
+    ".ods": ("app.loaders.excel:PandasExcelReader", {"pandas_config": {"engine": "odf"}}),
+    ".odt": ("app.loaders.odt:OdtReader", {}),
+    ".pdf": (f"{_FILE_READERS}:PDFReader", {}),
+    ".pptx": (f"{_FILE_READERS}:PptxReader", {}),
+    ".txt": (f"{_FILE_READERS}:UnstructuredReader", {}),
+    ".xls": ("app.loaders.excel:PandasExcelReader", {}),
+    ".xlsx": ("app.loaders.excel:PandasExcelReader", {"stream": True, "rows_per_document": EXCEL_ROWS_PER_DOCUMENT}),
+    ".xml": (f"{_FILE_READERS}:XMLReader", {}),
+    ".url": ("app.loaders.http:TieredWebReader", {
+        "js_hosts": settings.URL_JS_HOSTS,
+        "min_text_chars": settings.URL_MIN_TEXT_CHARS,
+        "timeout": settings.URL_FETCH_TIMEOUT_SECONDS,
+        "browser_config": {
+            "browser": "chrome",
+            "headless": True,
+            "pool_size": settings.BROWSER_POOL_SIZE,
+            "max_pages_per_driver": settings.BROWSER_MAX_PAGES_PER_DRIVER,
+            "block_resources": settings.BROWSER_BLOCK_RESOURCES,
+        },
+    }),
+}
+
+
+@lru_cache(maxsize=None)
+def get_loader(ext: str):
+    """Reader instance for ``ext``, imported and built once per process."""
+    if ext not in LOADERS:
+        raise UnsupportedFileError(f"Unsupported file extension: {ext}")
+    target, loader_config = LOADERS[ext]
+    module_name, class_name = target.split(":")
+    loader_class = getattr(import_module(module_name), class_name)
+    return loader_class(**loader_config)
+
+
+def _read_pdf(buffer: BinaryIO, file_name: str) -> List[Document]:
+    import pypdf
+
+    pdf = pypdf.PdfReader(buffer)
+    return [
+        Document(text=page.extract_text() or "", metadata={"page_label": pdf.page_labels[i], "file_name": file_name})
+        for i, page in enumerate(pdf.pages)
+    ]
+
+
+def _read_docx(buffer: BinaryIO, file_name: str) -> List[Document]:
+    import docx2txt
+
+    return [Document(text=docx2txt.process(buffer), metadata={"file_name": file_name})]
+
+
+def _read_excel(buffer: BinaryIO, file_name: str) -> List[Document]:
+    return get_loader(Path(file_name).suffix.lower()).load_data(buffer, extra_info={"file_name": file_name})
+
+
+def _read_odt(buffer: BinaryIO, file_name: str) -> List[Document]:
+    return get_loader(".odt").load_data(buffer, extra_info={"file_name": file_name})
+
+
+def _read_text(buffer: BinaryIO, file_name: str) -> List[Document]:
+    return [Document(text=buffer.read().decode("utf-8", errors="replace"), metadata={"file_name": file_name})]
+
+
+# Formats parsed straight from an in-memory buffer; everything else goes through a temp file.
+MEMORY_LOADERS: Dict[str, Callable[[BinaryIO, str], List[Document]]] = {
+    ".pdf": _read_pdf,
+    ".docx": _read_docx,
+    ".xls": _read_excel,
+    ".xlsx": _read_excel,
+    ".ods": _read_excel,
+    ".odt": _read_odt,
+    ".md": _read_text,
+    ".txt": _read_text,
 }
 
-def load_file(file_path: str, **kwargs) -> List[Document]:
+
+def _load_path(file_path: Path) -> List[Document]:
+    return get_loader(file_path.suffix.lower()).load_data(file_path)
+
+
+def _load_buffer(buffer: BinaryIO, filename: str) -> List[Document]:
+    ext = Path(filename).suffix.lower()
+    if ext not in LOADERS:
+        raise UnsupportedFileError(f"Unsupported file extension: {ext}")
+    if ext in MEMORY_LOADERS:
+        return MEMORY_LOADERS[ext](buffer, Path(filename).name)
+
+    # Reader only takes paths: spill to a temp file that never outlives the call.
+    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
+        shutil.copyfileobj(buffer, tmp)
+    try:
+        return _load_path(Path(tmp.name))
+    finally:
+        os.remove(tmp.name)
+
+
+async def load_urls(urls: List[str]) -> List[Document]:
+    """Async variant of ``load_file(urls)`` for use inside the event loop."""
+    return await get_loader(".url").aload_data(urls)
+
+
+def load_file(file_path: Union[str, Path, list, bytes, BinaryIO], filename: Optional[str] = None,
+              raise_errors: bool = False, **kwargs) -> List[Document]:
     """
     Loads and processes a file using appropriate loader based on file extension.
     
     Args:
-        file_path (str): Path to the file to be loaded
+        file_path (str | Path | list | bytes | file-like): Path to the file to be loaded,
+            a list of URLs, or the file content itself (bytes, BytesIO, UploadFile.file)
+        filename (str): Original file name; required for in-memory content to pick the loader
+        raise_errors (bool): Re-raise reader errors instead of logging them and returning []
         **kwargs: Additional arguments to pass to the loader
         
     Returns:
         List[Document]: List of Document objects containing the processed content
     """
     if isinstance(file_path, list):
-        loader = SeleniumWebReader(browser="chrome", headless=True)
-        return loader.load_data(file_path)
-    file_path = Path(file_path)
-    ext = file_path.suffix.lower()
-
-    if ext not in LOADERS:
-        raise ValueError(f"Unsupported file extension: {ext}")
-    loader_class, loader_config = LOADERS[ext]
-    loader = loader_class(**loader_config)
+        return get_loader(".url").load_data(file_path)
 
     try:
-        documents = loader.load_data(file_path)
-        return documents
+        if isinstance(file_path, (str, Path)):
+            return _load_path(Path(file_path))
+        if not filename:
+            filename = getattr(file_path, "filename", None) or getattr(file_path, "name", None)
+            if not isinstance(filename, str):
+                raise UnsupportedFileError("filename is required to load in-memory content")
+        buffer = io.BytesIO(file_path) if isinstance(file_path, (bytes, bytearray)) else file_path
+        if hasattr(buffer, "seek"):
+            buffer.seek(0)
+        return _load_buffer(buffer, filename)
+    except ValueError:
+        raise
     except Exception as e:
-        print(f"Error loading file {file_path}: {e}")
-        return []
\ No newline at end of file
+        if raise_errors:
+            raise
+        print(f"Error loading file {filename or file_path}: {e}")
+        return []
@@ -0,0 +1,112 @@
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from llama_index.core.node_parser import NodeParser
+from llama_index.core.schema import BaseNode, NodeRelationship, TextNode
+
+# Namespace for deterministic section point ids: re-indexing a candidate overwrites
+# the same points instead of piling up new ones.
+SECTION_NAMESPACE = uuid.UUID("5b0c54a4-3f0e-4d8e-9a7c-2f7f4c3e8d11")
+
+# Payload keys kept out of the embedded / LLM-visible text.
+HIDDEN_METADATA = ["resume_json", "talent_id", "file_hash", "text_hash", "source_file", "file_type",
+                   "file_size", "processing_timestamp", "section_index"]
+
+SKILL_BLOCKS = {
+    "programming_languages": "Programming languages",
+    "frameworks": "Frameworks",
+    "skills": "Skills",
+}
+
+
+def section_id(talent_id: str, section: str, index: int) -> str:
+    return str(uuid.uuid5(SECTION_NAMESPACE, f"{talent_id}:{section}:{index}"))
+
+
+def profile_id(talent_id: str) -> str:
+    """Point id of a candidate's "profile" section node."""
+    return section_id(talent_id, "profile", 0)
+
+
+def parse_resume(text: str) -> Optional[Dict[str, Any]]:
+    """The resume dict if ``text`` is resume JSON from ``extract_resume``, else None."""
+    try:
+        resume = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    return resume if isinstance(resume, dict) else None
+
+
+def cv_sections(resume: Dict[str, Any]) -> List[tuple]:
+    """(section, text) pairs for one resume produced by ``extract_resume``."""
+    name = resume.get("full_name") or "Unknown"
+    sections = []
+
+    positions = [exp.get("position") for exp in resume.get("experience") or [] if exp.get("position")]
+    profile = f"Candidate: {name}"
+    if positions:
+        profile += f"\nPositions held: {', '.join(positions)}"
+    sections.append(("profile", profile))
+
+    for exp in resume.get("experience") or []:
+        header = " at ".join(part for part in (exp.get("position"), exp.get("company")) if part)
+        lines = [f"Experience: {header}" if header else "Experience"]
+        if exp.get("duration"):
+            lines.append(f"Duration: {exp['duration']}")
+        if exp.get("description"):
+            lines.append(exp["description"])
+        sections.append(("experience", "\n".join(lines)))
+
+    for edu in resume.get("education") or []:
+        parts = [edu.get(key) for key in ("degree", "major", "school", "duration") if edu.get(key)]
+        if parts:
+            sections.append(("education", f"Education: {', '.join(parts)}"))
+
+    tech = resume.get("technical_skills") or {}
+    for key, label in SKILL_BLOCKS.items():
+        items = [str(item) for item in tech.get(key) or [] if item]
+        if items:
+            sections.append(("skills", f"{label}: {', '.join(items)}"))
+
+    accomplishments = [str(item) for item in resume.get("key_accomplishments") or [] if item]
+    if accomplishments:
+        sections.append(("accomplishments", "Key accomplishments:\n" + "\n".join(f"- {a}" for a in accomplishments)))
+    return sections
+
+
+class CVSectionNodeParser(NodeParser):
+    """Split structured CV JSON documents into one node per section.
+
+    Each experience entry, education entry, skill block and the accomplishments
+    list become their own node, prefixed with the section name, so embeddings are
+    short and specific. Every node carries the document metadata (talent_id,
+    full_name, ...) plus ``section``. The full resume JSON is not put in node
+    metadata, which llama-index would serialize a second time into
+    ``_node_content``; the vector store writes it once onto the "profile" point.
+    Documents that are not resume JSON pass through as a single node.
+    """
+
+    def _parse_nodes(self, nodes: Sequence[BaseNode], show_progress: bool = False, **kwargs: Any) -> List[BaseNode]:
+        parsed = []
+        for node in nodes:
+            resume = parse_resume(node.get_content())
+            talent_id = node.metadata.get("talent_id")
+            if resume is None or not talent_id:
+                parsed.append(node)
+                continue
+
+            counts: Dict[str, int] = {}
+            for section, section_text in cv_sections(resume):
+                index = counts.get(section, 0)
+                counts[section] = index + 1
+                metadata = {**node.metadata, "section": section, "section_index": index}
+                parsed.append(TextNode(
+                    id_=section_id(talent_id, section, index),
+                    text=section_text,
+                    metadata=metadata,
+                    excluded_embed_metadata_keys=HIDDEN_METADATA,
+                    excluded_llm_metadata_keys=HIDDEN_METADATA,
+                    relationships={NodeRelationship.SOURCE: node.as_related_node_info()},
+                ))
+        return parsed
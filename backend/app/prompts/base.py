@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheablePrompt:
+    """A prompt split into a static, cacheable prefix and a per-call suffix.
+
+    Providers cache on exact prompt prefixes, so everything that is identical
+    across calls (instructions, rubric, output schema, shared JD) goes in
+    ``prefix`` and only the variable document goes in ``suffix``.
+    """
+    prefix: str
+    suffix: str
+
+    def __str__(self) -> str:
+        return self.prefix + self.suffix
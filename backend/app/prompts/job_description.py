@@ -1,5 +1,9 @@
-def extract_jd(text: str) -> str:
-    prompt = f"""
+from app.core.config import settings
+from app.llms.tokens import budget_input
+from app.prompts.base import CacheablePrompt
+
+
+JD_EXTRACTION_INSTRUCTIONS = """
 Extract the following information from this job description text. 
 Format the response as a valid JSON object with these fields:
 - title: The job title
@@ -11,7 +15,14 @@ Format the response as a valid JSON object with these fields:
 - experience_level: The experience level (entry-level, mid-level, senior, etc.)
 - employment_type: The employment type (full-time, part-time, contract, etc.)
 
-Job Description Text:
-{text}
 """
-    return prompt
\ No newline at end of file
+
+
+def extract_jd(text: str) -> CacheablePrompt:
+    text = budget_input(text, "jd_extract", settings.JD_INPUT_TOKEN_BUDGET)
+    return CacheablePrompt(
+        prefix=JD_EXTRACTION_INSTRUCTIONS,
+        suffix=f"""Job Description Text:
+{text}
+""",
+    )
\ No newline at end of file
@@ -1,14 +1,14 @@
-def extract_resume(cv: str) -> str:
-    prompt = f"""
+from app.core.config import settings
+from app.llms.tokens import budget_input
+from app.prompts.base import CacheablePrompt
+
+
+RESUME_EXTRACTION_INSTRUCTIONS = """
 You are an expert recruiter specializing in job matching.
 
 Your task is to extract structured information from a candidate's resume.
 
-The input will be the resume text provided below, which is written in Japanese:
-
----
-{cv}
----
+The input will be the resume text provided at the end of this message, which is written in Japanese.
 
 You must extract the following fields:
 
@@ -42,4 +42,17 @@ You must extract the following fields:
 - Output should still be in English, but based on Japanese content.
 
 """
-    return prompt
\ No newline at end of file
+
+
+def extract_resume(cv) -> CacheablePrompt:
+    if isinstance(cv, list):
+        cv = "\n\n".join(doc.text for doc in cv)
+    cv = budget_input(cv, "resume_extract", settings.RESUME_INPUT_TOKEN_BUDGET)
+    return CacheablePrompt(
+        prefix=RESUME_EXTRACTION_INSTRUCTIONS,
+        suffix=f"""Resume text:
+---
+{cv}
+---
+""",
+    )
\ No newline at end of file
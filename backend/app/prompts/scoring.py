@@ -0,0 +1,32 @@
+from app.prompts.base import CacheablePrompt
+
+SCORING_SYSTEM_MESSAGE = "You are a professional recruiter."
+
+
+def score_candidate(candidate_resume: str, job_description: str = "") -> CacheablePrompt:
+    prefix_parts = [
+        "You are a professional recruiter tasked with evaluating how well a candidate's resume matches the qualifications for a job.",
+        "",
+        "Please evaluate the candidate against each qualification using the following scale:",
+        "0 - Not Met",
+        "1 - Somewhat Met",
+        "2 - Strongly Met",
+        "",
+        "Please evaluate ONLY the qualifications listed in the job description, and return your response in JSON format with explanations for each score.",
+        "",
+        'Format your response as valid JSON with this structure:',
+        '{',
+        '  "requiredScores": [ { "qualification": "...", "score": 0/1/2, "explanation": "..." } ],',
+        '  "preferredScores": [ { "qualification": "...", "score": 0/1/2, "explanation": "..." } ],',
+        '  "overallFeedback": "..."',
+        '}',
+        "",
+    ]
+    if job_description:
+        prefix_parts.extend([f"JOB DESCRIPTION: {job_description}", ""])
+
+    suffix_parts = [
+        "CANDIDATE'S RESUME:",
+        candidate_resume,
+    ]
+    return CacheablePrompt(prefix="\n".join(prefix_parts) + "\n", suffix="\n".join(suffix_parts))
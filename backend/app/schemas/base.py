@@ -0,0 +1,24 @@
+from pydantic import BaseModel, model_validator
+
+
+class LLMOutputModel(BaseModel):
+    """Base model for LLM-produced JSON.
+
+    Models are told to use null / "Unknown" for missing values, so nulls fall
+    back to the field default and a bare string is accepted where a list is expected.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def _normalize_missing(cls, data):
+        if not isinstance(data, dict):
+            return data
+        normalized = {}
+        for key, value in data.items():
+            if value is None:
+                continue
+            field = cls.model_fields.get(key)
+            if field is not None and isinstance(value, str) and getattr(field.annotation, "__origin__", None) is list:
+                value = [] if value.strip().lower() in ("", "unknown") else [value]
+            normalized[key] = value
+        return normalized
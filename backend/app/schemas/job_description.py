@@ -0,0 +1,13 @@
+from typing import List, Optional
+from app.schemas.base import LLMOutputModel
+
+
+class JobDescriptionSchema(LLMOutputModel):
+    title: Optional[str] = None
+    company: str = "Unknown"
+    location: str = "Not specified"
+    required_qualifications: List[str] = []
+    preferred_qualifications: List[str] = []
+    description: Optional[str] = ""
+    experience_level: Optional[str] = None
+    employment_type: Optional[str] = None
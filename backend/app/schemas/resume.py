@@ -0,0 +1,27 @@
+from typing import List, Optional
+from app.schemas.base import LLMOutputModel
+
+
+class Experience(LLMOutputModel):
+    company: Optional[str] = None
+    position: Optional[str] = ""
+    duration: Optional[str] = ""
+    description: Optional[str] = ""
+
+class Education(LLMOutputModel):
+    school: Optional[str] = None
+    major: Optional[str] = None
+    degree: Optional[str] = None
+    duration: Optional[str] = None
+
+class TechnicalSkills(LLMOutputModel):
+    programming_languages: List[str] = []
+    frameworks: List[str] = []
+    skills: List[str] = []
+
+class ResumeSchema(LLMOutputModel):
+    full_name: str = "Unknown"
+    experience: List[Experience] = []
+    education: List[Education] = []
+    technical_skills: TechnicalSkills = TechnicalSkills()
+    key_accomplishments: List[str] = []
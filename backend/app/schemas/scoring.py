@@ -0,0 +1,14 @@
+from typing import List
+from pydantic import Field
+from app.schemas.base import LLMOutputModel
+
+
+class QualificationScore(LLMOutputModel):
+    qualification: str
+    score: int = Field(0, ge=0, le=2)
+    explanation: str = ""
+
+class ScoringResponse(LLMOutputModel):
+    requiredScores: List[QualificationScore] = []
+    preferredScores: List[QualificationScore] = []
+    overallFeedback: str = ""
@@ -1,64 +1,275 @@
-from playwright.async_api import async_playwright
-from app.modules.loaders import load_file
-import time
-import json
+from app.core.config import settings
+from app.core.telemetry import CRAWL_RESPONSES
+from app.db.neo4j import Neo4jDB
+from app.modules.loaders import load_urls
+from app.services.jd_service import canonical_url
 import asyncio, random
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Always newest first (sortBy=DD), so pages run from new to old and a page with
+# nothing new means the rest are already stored.
+SEARCH_URL = ("https://www.linkedin.com/jobs/search/?keywords={title}&location={location}"
+              "&sortBy=DD&refresh=true&start={start}")
+# Posted within the last N seconds: used once a crawl cursor exists.
+RECENT_FILTER = "&f_TPR=r{seconds}"
+PAGE_SIZE = 25
+# Overlap added to the time window since the last crawl, so late-indexed postings are not missed.
+CURSOR_OVERLAP_SECONDS = 24 * 3600
+PAGE_TIMEOUT_MS = 60000
+# Failed jobs carried on the cursor for the next crawl to retry.
+MAX_RETRY_JOBS = 200
+CARD_KEYS = ("title", "company", "location", "link")
+
+# Where LinkedIn sends anonymous clients it wants to slow down or sign in.
+AUTHWALL_PATHS = ("/authwall", "/login", "/checkpoint", "/uas/")
+
+# Requests for these never affect the text we extract.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Every card field in one round trip instead of four locator calls per <li>.
+CARD_FIELDS_JS = """
+items => items.map(li => {
+    const text = sel => (li.querySelector(sel)?.innerText || "").trim();
+    const link = li.querySelector(".base-card__full-link");
+    return {
+        title: text(".base-search-card__title"),
+        company: text(".base-search-card__subtitle a"),
+        location: text(".job-search-card__location"),
+        link: link ? link.getAttribute("href") : null,
+    };
+})
+"""
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least ``interval`` seconds apart (plus jitter)."""
+
+    def __init__(self, interval: float, jitter: float = 0.5):
+        self.interval = interval
+        self.jitter = jitter
+        self.next_slot: Dict[str, float] = {}
+        self.lock = asyncio.Lock()
+
+    async def wait(self, url: str):
+        host = urlsplit(url).hostname or ""
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval * (1 + random.uniform(0, self.jitter))
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@dataclass
+class CrawlResult:
+    """New jobs from one crawl, plus what ``save_cursor`` records about it."""
+    job_title: str
+    job_location: str
+    jobs: List[dict] = field(default_factory=list)
+    pages_crawled: int = 0
+    known_jobs: int = 0
+    newest_url: Optional[str] = None
+    # A search page was blocked, so postings may have been missed.
+    incomplete: bool = False
+
+    @property
+    def key(self) -> str:
+        return cursor_key(self.job_title, self.job_location)
+
+    async def save_cursor(self, db: Neo4jDB, failed: Optional[List[dict]] = None):
+        """Advance the CrawlCursor; call only once the jobs have been ingested.
+
+        ``failed`` are the jobs that could not be ingested (no description, LLM
+        extraction failed). The cursor moves past them, so they are kept on it and
+        the next crawl fetches them again whatever its search window.
+        """
+        if self.incomplete:
+            logger.warning(f"Crawl {self.key} was blocked on a search page; keeping the previous cursor")
+            return
+        retry_jobs = [{key: job.get(key) for key in CARD_KEYS} for job in failed or []][:MAX_RETRY_JOBS]
+        await asyncio.to_thread(db.save_crawl_cursor, self.key, self.job_title, self.job_location,
+                                self.pages_crawled, len(self.jobs), self.known_jobs, self.newest_url,
+                                json.dumps(retry_jobs, ensure_ascii=False))
+
+
+def search_window(cursor: Optional[dict], now: Optional[float] = None) -> Optional[int]:
+    """Seconds of postings to search given the last crawl's cursor; None means no limit."""
+    if not cursor or not cursor.get("last_crawled_epoch"):
+        return None
+    now = time.time() if now is None else now
+    return max(0, int(now - cursor["last_crawled_epoch"])) + CURSOR_OVERLAP_SECONDS
+
+
+def retry_cards(cursor: Optional[dict]) -> List[dict]:
+    """Cards of the jobs the last crawl could not ingest."""
+    try:
+        jobs = json.loads((cursor or {}).get("retry_jobs") or "[]")
+    except ValueError:
+        return []
+    return [job for job in jobs if isinstance(job, dict) and job.get("link")]
+
+
+def _outcome(page, response) -> str:
+    """"ok", "authwall", "no_response" or the HTTP status of a page load."""
+    if response is None:
+        return "no_response"
+    if any(marker in urlsplit(page.url).path for marker in AUTHWALL_PATHS):
+        return "authwall"
+    return "ok" if response.status == 200 else str(response.status)
+
+
+def _record(outcomes: Counter, kind: str, outcome: str, url: str) -> bool:
+    outcomes[f"{kind}:{outcome}"] += 1
+    CRAWL_RESPONSES.labels(page=kind, outcome=outcome).inc()
+    if outcome != "ok":
+        logger.warning(f"Crawler got {outcome} for {kind} page {url}")
+    return outcome == "ok"
+
+
+def cursor_key(job_title: str, job_location: str) -> str:
+    return f"linkedin:{' '.join(job_title.lower().split())}:{' '.join(job_location.lower().split())}"
+
+
+async def _search_page(context, limiter: HostRateLimiter, outcomes: Counter, job_title: str, job_location: str,
+                       start: int, since_seconds: Optional[int] = None) -> List[dict]:
+    url = SEARCH_URL.format(title=quote_plus(job_title), location=quote_plus(job_location), start=start)
+    if since_seconds:
+        url += RECENT_FILTER.format(seconds=since_seconds)
+    await limiter.wait(url)
+    page = await context.new_page()
+    try:
+        response = await page.goto(url, timeout=PAGE_TIMEOUT_MS, wait_until="domcontentloaded")
+        if not _record(outcomes, "search", _outcome(page, response), url):
+            return []
+        cards = await page.locator("li").evaluate_all(CARD_FIELDS_JS)
+    finally:
+        await page.close()
+    return [card for card in cards if all(card.get(key) for key in ("title", "company", "location", "link"))]
+
+
+async def _job_description(context, limiter: HostRateLimiter, outcomes: Counter, link: str) -> str:
+    await limiter.wait(link)
+    page = await context.new_page()
+    try:
+        response = await page.goto(link, timeout=PAGE_TIMEOUT_MS, wait_until="domcontentloaded")
+        if not _record(outcomes, "detail", _outcome(page, response), link):
+            # Blocked or rate limited: a second fetch of the same URL would be too.
+            return ""
+        desc_locator = page.locator(".show-more-less-html__markup")
+        if await desc_locator.count() > 0:
+            return (await desc_locator.first.inner_text()).strip()
+    finally:
+        await page.close()
+
+    # Markup not found: let the URL loader (HTTP first, then browser pool) try.
+    docs = await load_urls([link])
+    return docs[0].text.strip() if docs else ""
+
 
 async def crawl_and_extract(
     job_title="Software Engineer",
     job_location="Vietnam",
     max_pages=1,
-    sleep_between=(1, 3)
+    concurrency: Optional[int] = None,
+    host_interval: Optional[float] = None,
+    db: Optional[Neo4jDB] = None,
 ):
-    results = []
-    counter = 0
+    """Crawl LinkedIn job search results and their detail pages.
+
+    Result pages are read in order; each card's detail page is fetched as soon
+    as the card is seen, by at most ``concurrency`` tabs at once, with requests
+    to a host spaced ``host_interval`` seconds apart. Images, media, fonts and
+    stylesheets are never downloaded. Jobs are returned in card order.
+
+    With ``db`` the crawl is incremental: postings whose canonical URL is already
+    stored as a JobDescription are skipped before their detail page is opened,
+    pagination stops at the first page with nothing new, and an existing
+    CrawlCursor for (job_title, location) narrows the search to postings since
+    the last crawl. Only new jobs are returned, starting with the ones the last
+    crawl failed to ingest. The cursor is not advanced here: the caller calls
+    ``CrawlResult.save_cursor`` with the jobs it failed to ingest, once it is done.
+    """
+    from playwright.async_api import async_playwright
+
+    key = cursor_key(job_title, job_location)
+    cursor = await asyncio.to_thread(db.get_crawl_cursor, key) if db else None
+    since_seconds = search_window(cursor)
+    seen = set()
+    crawl = CrawlResult(job_title, job_location)
+    outcomes: Counter = Counter()
+
+    limiter = HostRateLimiter(settings.CRAWL_HOST_INTERVAL_SECONDS if host_interval is None else host_interval)
+    semaphore = asyncio.Semaphore(concurrency or settings.CRAWL_CONCURRENCY)
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        for _ in range(max_pages):
-            page = await browser.new_page()
-            url = f"https://www.linkedin.com/jobs/search/?keywords={job_title}&location={job_location}&refresh=true&start={counter}"
-            await page.goto(url, timeout=60000)
-
-            job_cards = await page.locator("li").all()
-            for card in job_cards:
-                title = card.locator(".base-search-card__title")
-                location = card.locator(".job-search-card__location")
-                company = card.locator(".base-search-card__subtitle a")
-                link = card.locator(".base-card__full-link")
-
-                if await title.count() > 0 and await location.count() > 0 and await company.count() > 0 and await link.count() > 0:
-                    job_link = await link.get_attribute("href")
-                    job = {
-                        "title": (await title.inner_text()).strip(),
-                        "company": (await company.inner_text()).strip(),
-                        "location": (await location.inner_text()).strip(),
-                        "link": job_link,
-                        "description": ""
-                    }
-
-                    detail_page = await browser.new_page()
-                    try:
-                        await detail_page.goto(job_link, timeout=60000)
-                        desc_locator = detail_page.locator(".show-more-less-html__markup")
-                        if await desc_locator.count() > 0:
-                            job["description"] = (await desc_locator.inner_text()).strip()
-                        else:
-                            try:
-                                docs = load_file([job_link])
-                                if docs:
-                                    job["description"] = docs[0].text.strip()
-                            except:
-                                pass
-                    except:
-                        pass
-                    await detail_page.close()
-                    results.append(job)
-
-                    await asyncio.sleep(random.randint(sleep_between[0], sleep_between[1]))
-
-            await page.close()
-            counter += 25
-        await browser.close()
-
-    return results
\ No newline at end of file
+        context = await browser.new_context()
+        await context.route("**/*", _block_heavy_resources)
+
+        async def detail(card: dict) -> dict:
+            job = {**card, "description": ""}
+            async with semaphore:
+                try:
+                    job["description"] = await _job_description(context, limiter, outcomes, card["link"])
+                except Exception as e:
+                    logger.warning(f"Could not fetch job description {card['link']}: {e}")
+            return job
+
+        tasks = []
+        try:
+            retries = retry_cards(cursor)
+            if retries:
+                urls = [canonical_url(card["link"]) for card in retries]
+                known = await asyncio.to_thread(db.find_known_jd_urls, urls)
+                for card, url in zip(retries, urls):
+                    if url not in known and url not in seen:
+                        seen.add(url)
+                        tasks.append(asyncio.create_task(detail(card)))
+                logger.info(f"Crawl {key}: retrying {len(tasks)} jobs that failed last time")
+            for page_index in range(max_pages):
+                cards = await _search_page(context, limiter, outcomes, job_title, job_location,
+                                           page_index * PAGE_SIZE, since_seconds)
+                crawl.pages_crawled += 1
+                if not cards:
+                    break
+                urls = [canonical_url(card["link"]) for card in cards]
+                crawl.newest_url = crawl.newest_url or urls[0]
+                known = await asyncio.to_thread(db.find_known_jd_urls, urls) if db else set()
+                new_cards = []
+                for card, url in zip(cards, urls):
+                    if url in known:
+                        crawl.known_jobs += 1
+                    elif url not in seen:
+                        seen.add(url)
+                        new_cards.append(card)
+                tasks.extend(asyncio.create_task(detail(card)) for card in new_cards)
+                if db and not new_cards:
+                    # A whole page already ingested: with newest-first order the rest are older still.
+                    break
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await browser.close()
+
+    blocked = sum(count for outcome, count in outcomes.items() if not outcome.endswith(":ok"))
+    crawl.incomplete = any(outcome.startswith("search:") and not outcome.endswith(":ok") for outcome in outcomes)
+    crawl.jobs = list(results)
+    logger.info(f"Crawl {key}: {crawl.pages_crawled} pages, {len(crawl.jobs)} new jobs, {crawl.known_jobs} "
+                f"already stored, {blocked} page loads blocked or failed {dict(outcomes)}")
+    return crawl
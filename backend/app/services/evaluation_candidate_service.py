@@ -1,67 +1,59 @@
-from app.llms.azure_openai_client import azure_client
+from app.llms.router import get_llm_router
+from functools import lru_cache
 from typing import Dict, Any
+import asyncio
 import logging
-from app.llms.azure_openai_client import AzureOpenAIClient 
+from app.schemas.scoring import ScoringResponse
+from app.prompts.scoring import score_candidate, SCORING_SYSTEM_MESSAGE
+from app.services.fast_scoring_service import get_fast_scorer
 
 logger = logging.getLogger(__name__)
 
 class EvaluationService:
-    """Service class for handling OpenAI API interactions via AzureOpenAIClient."""
+    """Service class for scoring candidates through the LLM router."""
     
-    def __init__(self):
-        self.client = azure_client 
+    @property
+    def client(self):
+        return get_llm_router()
     
     async def score_candidate_qualifications(
         self,
         candidate_resume: str,
-        job_description: str = ""
+        job_description: str = "",
+        mode: str = "llm"
     ) -> Dict[str, Any]:
-        """Score a candidate's resume against job qualifications using Azure OpenAI."""
-        try:
-            logger.info("Starting candidate qualification scoring with Azure OpenAI")
-            
-            prompt_parts = [
-                "You are a professional recruiter tasked with evaluating how well a candidate's resume matches the qualifications for a job.",
-                ""
-            ]
-            
+        """Score a candidate's resume against job qualifications.
 
-            if job_description:
-                prompt_parts.append(f"JOB DESCRIPTION: {job_description}")
-            
-            prompt_parts.extend([
-                "",
-                "CANDIDATE'S RESUME:",
-                candidate_resume,
-                "",
-                "Please evaluate the candidate against each qualification using the following scale:",
-                "0 - Not Met",
-                "1 - Somewhat Met",
-                "2 - Strongly Met",
-                "",
-                "Please evaluate ONLY the following qualifications, and return your response in JSON format with explanations for each score:",
-                ""
-            ])
-            
-            
-            prompt_parts.extend([
-                'Format your response as valid JSON with this structure:',
-                '{',
-                '  "requiredScores": [ { "qualification": "...", "score": 0/1/2, "explanation": "..." } ],',
-                '  "preferredScores": [ { "qualification": "...", "score": 0/1/2, "explanation": "..." } ],',
-                '  "overallFeedback": "..."',
-                '}'
-            ])
+        mode="llm" asks the best available LLM; mode="fast" returns the same schema
+        from embedding similarity alone (see ``FastScorer``).
+        """
+        if mode == "fast":
+            results = await asyncio.to_thread(get_fast_scorer().score_many, job_description, [candidate_resume])
+            return results[0]
+        if mode != "llm":
+            raise ValueError(f"Unknown scoring mode: {mode}")
+
+        try:
+            logger.info("Starting candidate qualification scoring")
             
-            prompt = "\n".join(prompt_parts)
+            # Rubric + JD form a static prefix shared by every candidate for this JD,
+            # so provider prompt caching applies to all but the first call.
+            prompt = score_candidate(candidate_resume, job_description)
             
-            response_text = self.client.invoke_model(prompt, system_message="You are a professional recruiter.")
+            # invoke_model is blocking; run it off the event loop so concurrent scorings overlap.
+            response_text = await asyncio.to_thread(
+                self.client.invoke_model,
+                prompt,
+                task="score",
+                system_message=SCORING_SYSTEM_MESSAGE,
+                response_model=ScoringResponse,
+            )
             if not response_text:
-                raise ValueError("Azure OpenAI returned no response")
+                raise ValueError("LLM returned no response")
             
             logger.info("Parsing response JSON")
             
-            scoring_data = AzureOpenAIClient.parse_json_string(response_text)
+            scoring_data = self.client.parse_json_string(response_text, ScoringResponse)
             
             required_scores = scoring_data.get("requiredScores", [])
             preferred_scores = scoring_data.get("preferredScores", [])
@@ -88,4 +80,13 @@ class EvaluationService:
             logger.error(f"Error scoring candidate qualifications: {e}")
             raise
 
-openai_service = EvaluationService()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_evaluation_service() -> EvaluationService:
+    return EvaluationService()
+
+
+def __getattr__(name):
+    # Keeps `from app.services.evaluation_candidate_service import openai_service` working.
+    if name == "openai_service":
+        return get_evaluation_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
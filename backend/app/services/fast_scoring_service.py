@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from llama_index.core import Settings
+
+from app.core.config import settings
+from app.core.telemetry import embedding_call
+from app.modules.node_parsers import cv_sections, parse_resume
+from app.services.pre_scoring_service import parse_qualifications
+
+logger = logging.getLogger(__name__)
+
+SCORE_LABELS = {0: "Not met", 1: "Somewhat met", 2: "Strongly met"}
+FAST_MODE_FEEDBACK = "Embedding similarity estimate (fast mode, no LLM review)."
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of text embeddings keyed by embedding model + text hash."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _model_name(embed_model) -> str:
+        return getattr(embed_model, "model_name", None) or type(embed_model).__name__
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalized embeddings for ``texts``, one row per text."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        embed_model = Settings.embed_model
+        model = self._model_name(embed_model)
+        keys = [(model, hashlib.sha1(text.encode("utf-8")).hexdigest()) for text in texts]
+
+        vectors: Dict[Tuple[str, str], np.ndarray] = {}
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    vectors[key] = self.entries[key]
+            missing = list(dict.fromkeys(
+                (key, text) for key, text in zip(keys, texts) if key not in vectors
+            ))
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            batch = [text for _, text in missing]
+            with embedding_call(batch, model=model):
+                embeddings = embed_model.get_text_embedding_batch(batch)
+            with self.lock:
+                for (key, _), embedding in zip(missing, embeddings):
+                    vector = np.asarray(embedding, dtype=np.float32)
+                    vector /= np.linalg.norm(vector) or 1.0
+                    vectors[key] = self.entries[key] = vector
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+
+        return np.vstack([vectors[key] for key in keys])
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+def resume_sections(resume_text: str) -> List[str]:
+    """Split a stored resume into the same sections the vector index embeds."""
+    resume = parse_resume(resume_text)
+    if resume is None:
+        return [block.strip() for block in (resume_text or "").split("\n\n") if block.strip()]
+    return [text for _, text in cv_sections(resume) if text.strip()]
+
+
+def calibrate_thresholds(similarities: Sequence[float], llm_scores: Sequence[int]) -> Tuple[float, float]:
+    """Pick (partial, strong) thresholds that best reproduce LLM 0/1/2 scores.
+
+    ``similarities`` are best-section similarities from :meth:`FastScorer.similarity_matrix`
+    and ``llm_scores`` the LLM's scores for the same (qualification, candidate) pairs.
+    """
+    sims = np.asarray(similarities, dtype=np.float32)
+    labels = np.asarray(llm_scores)
+    grid = np.unique(np.round(sims, 3))
+    best, best_accuracy = (settings.FAST_SCORE_THRESHOLD_PARTIAL, settings.FAST_SCORE_THRESHOLD_STRONG), -1.0
+    for i, partial in enumerate(grid):
+        # Broadcast every strong threshold >= partial at once.
+        strong = grid[i:, None]
+        predicted = (sims >= partial).astype(int) + (sims >= strong).astype(int)
+        accuracy = (predicted == labels).mean(axis=1)
+        j = int(accuracy.argmax())
+        if accuracy[j] > best_accuracy:
+            best, best_accuracy = (float(partial), float(strong[j, 0])), float(accuracy[j])
+    logger.info(f"Calibrated fast-score thresholds {best} (agreement {best_accuracy:.2%})")
+    return best
+
+
+class FastScorer:
+    """LLM-free qualification scorer.
+
+    Each JD qualification and each resume section is embedded (through a shared
+    cache); a qualification's score comes from its best-matching section:
+    0 below ``FAST_SCORE_THRESHOLD_PARTIAL``, 2 at or above
+    ``FAST_SCORE_THRESHOLD_STRONG``, 1 in between. Output matches the LLM scorer.
+    """
+
+    def __init__(self, partial: Optional[float] = None, strong: Optional[float] = None):
+        self.partial = settings.FAST_SCORE_THRESHOLD_PARTIAL if partial is None else partial
+        self.strong = settings.FAST_SCORE_THRESHOLD_STRONG if strong is None else strong
+        self.cache = EmbeddingCache(settings.FAST_SCORE_CACHE_SIZE)
+
+    def similarity_matrix(self, qualifications: List[str], resume_texts: List[str]) -> np.ndarray:
+        """Best-section similarity, shape (len(qualifications), len(resume_texts))."""
+        sections = [resume_sections(text) for text in resume_texts]
+        result = np.zeros((len(qualifications), len(resume_texts)), dtype=np.float32)
+        flat = [section for candidate in sections for section in candidate]
+        if not qualifications or not flat:
+            return result
+
+        q = self.cache.embed(qualifications)
+        s = self.cache.embed(flat)
+        sims = q @ s.T
+        # Max over each candidate's slice of sections in one pass.
+        counts = np.array([len(candidate) for candidate in sections])
+        has_sections = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has_sections]
+        result[:, has_sections] = np.maximum.reduceat(sims, starts, axis=1)
+        return result
+
+    def calibrate(self, samples: Sequence[Tuple[str, List[Tuple[str, int]]]]) -> Tuple[float, float]:
+        """Fit and apply thresholds from LLM-scored examples.
+
+        Args:
+            samples: (resume_text, [(qualification, llm_score), ...]) per scored candidate.
+
+        Returns:
+            Tuple[float, float]: The new (partial, strong) thresholds.
+        """
+        similarities, labels = [], []
+        for resume_text, scored in samples:
+            if not scored:
+                continue
+            sims = self.similarity_matrix([qualification for qualification, _ in scored], [resume_text])[:, 0]
+            similarities.extend(sims.tolist())
+            labels.extend(score for _, score in scored)
+        if not labels:
+            return self.partial, self.strong
+        self.partial, self.strong = calibrate_thresholds(similarities, labels)
+        return self.partial, self.strong
+
+    def to_scores(self, similarities: np.ndarray) -> np.ndarray:
+        return (similarities >= self.partial).astype(int) + (similarities >= self.strong).astype(int)
+
+    def score_many(self, job_description: str, resume_texts: List[str]) -> List[dict]:
+        """Score many candidates against one JD; returns one result per resume, in order."""
+        required, preferred = parse_qualifications(job_description)
+        sims = self.similarity_matrix(required + preferred, resume_texts)
+        scores = self.to_scores(sims)
+
+        results = []
+        for col in range(len(resume_texts)):
+            items = [
+                {
+                    "qualification": qualification,
+                    "score": int(scores[row, col]),
+                    "explanation": f"{SCORE_LABELS[int(scores[row, col])]} (similarity {sims[row, col]:.2f})",
+                }
+                for row, qualification in enumerate(required + preferred)
+            ]
+            required_scores, preferred_scores = items[:len(required)], items[len(required):]
+            required_total = sum(item["score"] for item in required_scores)
+            preferred_total = sum(item["score"] for item in preferred_scores)
+            results.append({
+                "requiredScores": required_scores,
+                "preferredScores": preferred_scores,
+                "totalScore": required_total + preferred_total,
+                "overallFeedback": FAST_MODE_FEEDBACK,
+                "scoringBreakdown": {
+                    "requiredTotal": required_total,
+                    "preferredTotal": preferred_total,
+                },
+            })
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_fast_scorer() -> FastScorer:
+    return FastScorer()
@@ -0,0 +1,170 @@
+import os
+import uuid
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.telemetry import start_request_summary
+from app.services.resume_ingest_service import IngestionError, ingest_resume_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileProgress:
+    filename: str
+    file_path: Optional[str] = field(default=None, repr=False)
+    content: Optional[bytes] = field(default=None, repr=False)
+    file_size: Optional[int] = None
+    force: bool = False
+    # Fixed when the file is queued so every retry writes the same candidate.
+    talent_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = "queued"  # queued | processing | retrying | success | error
+    attempts: int = 0
+    error: Optional[str] = None
+    error_detail: Optional[dict] = None
+    metadata: Optional[dict] = None
+    telemetry: Optional[dict] = None
+
+    def as_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if key not in ("file_path", "content")}
+
+
+@dataclass
+class IngestionJob:
+    job_id: str
+    files: List[FileProgress]
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        statuses = {f.status for f in self.files}
+        if statuses <= {"success", "error"}:
+            return "completed" if "error" not in statuses else ("failed" if statuses == {"error"} else "partial")
+        return "queued" if statuses == {"queued"} else "processing"
+
+    def as_dict(self) -> dict:
+        counts = {}
+        for f in self.files:
+            counts[f.status] = counts.get(f.status, 0) + 1
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "total_files": len(self.files),
+            "counts": counts,
+            "files": [f.as_dict() for f in self.files],
+        }
+
+
+class IngestionQueue:
+    """In-process resume ingestion queue.
+
+    Uploads are enqueued per file and processed by ``INGEST_WORKERS`` asyncio
+    workers running the per-file pipeline. Transient failures are retried with
+    jittered exponential backoff. Job state lives in memory (the most recent
+    ``INGEST_MAX_JOBS`` jobs), so it does not survive a restart and is only
+    visible to the process that accepted the upload: the queue requires a single
+    API worker, and ``submit`` raises ``RuntimeError`` when ``API_WORKERS`` > 1.
+    """
+
+    def __init__(self, workers: int = None, max_retries: int = None):
+        self.workers = workers or settings.INGEST_WORKERS
+        self.max_retries = settings.INGEST_MAX_RETRIES if max_retries is None else max_retries
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+
+    def _start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        self.tasks = [task for task in self.tasks if not task.done()]
+        while len(self.tasks) < self.workers:
+            self.tasks.append(asyncio.create_task(self._worker(), name=f"ingest-worker-{len(self.tasks)}"))
+
+    def submit(self, files: List[Dict]) -> IngestionJob:
+        """Enqueue files ({"filename", "content" or "file_path", "file_size", "force"}).
+
+        In-memory content is released and ``file_path`` files are deleted once processed.
+        """
+        if settings.API_WORKERS > 1:
+            raise RuntimeError(
+                f"Background ingestion keeps job state in process memory and needs a single API worker "
+                f"(WEB_CONCURRENCY={settings.API_WORKERS})"
+            )
+        self._start()
+        job = IngestionJob(job_id=str(uuid.uuid4()), files=[FileProgress(**f) for f in files])
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > settings.INGEST_MAX_JOBS:
+            self.jobs.popitem(last=False)
+        for progress in job.files:
+            self.queue.put_nowait((job, progress))
+        logger.info(f"Queued ingestion job {job.job_id} with {len(job.files)} files")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    async def _worker(self):
+        while True:
+            job, progress = await self.queue.get()
+            try:
+                await self._process(progress)
+            except Exception as e:
+                logger.exception(f"Ingestion worker crashed on {progress.filename}: {e}")
+                progress.status, progress.error = "error", str(e)
+            finally:
+                self.queue.task_done()
+                if job.status in ("completed", "partial", "failed") and not job.finished_at:
+                    job.finished_at = datetime.now().isoformat()
+
+    async def _process(self, progress: FileProgress):
+        # Each file gets its own summary; this task's context is private, so it never
+        # leaks into the request that enqueued the job.
+        summary = start_request_summary()
+        try:
+            while True:
+                progress.attempts += 1
+                progress.status = "processing"
+                try:
+                    progress.metadata = await ingest_resume_file(
+                        progress.content if progress.content is not None else progress.file_path,
+                        progress.filename, progress.file_size, force=progress.force,
+                        talent_id=progress.talent_id
+                    )
+                    progress.status, progress.error = "success", None
+                    return
+                except IngestionError as e:
+                    progress.status, progress.error, progress.error_detail = "error", str(e), e.detail
+                    return
+                except Exception as e:
+                    progress.error = f"Error processing file: {e}"
+                    if progress.attempts > self.max_retries:
+                        progress.status = "error"
+                        return
+                    progress.status = "retrying"
+                    delay = min(settings.LLM_BACKOFF_MAX_SECONDS,
+                                settings.LLM_BACKOFF_BASE_SECONDS * 2 ** (progress.attempts - 1))
+                    logger.warning(f"Retrying {progress.filename} in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        finally:
+            progress.telemetry = summary.as_dict()
+            progress.content = None
+            if progress.file_path and os.path.exists(progress.file_path):
+                try:
+                    os.remove(progress.file_path)
+                except Exception as cleanup_error:
+                    print(f"Warning: Could not remove {progress.file_path}: {cleanup_error}")
+
+
+@lru_cache(maxsize=1)
+def get_ingestion_queue() -> IngestionQueue:
+    return IngestionQueue()
@@ -0,0 +1,84 @@
+import re
+import json
+import uuid
+import logging
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.core.telemetry import timed
+from app.db.neo4j import Neo4jDB
+from app.llms.router import get_llm_router
+from app.modules.hashing import content_hash
+from app.prompts.job_description import extract_jd
+from app.schemas.job_description import JobDescriptionSchema
+
+logger = logging.getLogger(__name__)
+
+LINKEDIN_JOB = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)")
+TRACKING_PARAMS = re.compile(r"^(utm_.*|ref|refid|trackingid|trk|trkinfo|position|pagenum|originalsubdomain|ebp)$",
+                             re.IGNORECASE)
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """Stable form of a posting URL: lowercase host, no tracking params or fragment.
+
+    LinkedIn postings collapse to https://www.linkedin.com/jobs/view/<id>/ whatever
+    search page, slug or subdomain they were reached from.
+    """
+    if not url or not url.strip():
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith("linkedin.com"):
+        match = LINKEDIN_JOB.search(parts.path)
+        if match:
+            return f"https://www.linkedin.com/jobs/view/{match.group(1)}/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)))
+    return urlunsplit(((parts.scheme or "https").lower(), host, parts.path.rstrip("/") or "/", query, ""))
+
+
+def ingest_jd(db: Neo4jDB, jd_text: str, url: str = None, file_path: str = None, type_: str = None) -> dict:
+    """Store a JD unless an identical one already exists.
+
+    Returns {"jd_id", "status", "version_of", "jd"} where status is
+    "unchanged" (same content already stored, no LLM call), "updated" (new
+    version of the JD at the same URL) or "created".
+    """
+    digest = content_hash(jd_text)
+    canonical = canonical_url(url)
+
+    with timed("neo4j_read"):
+        existing = db.find_job_description(content_hash=digest, canonical_url=canonical)
+    if existing and existing["match"] == "content_hash":
+        logger.info(f"JD unchanged, reusing {existing['jd_id']}")
+        return {"jd_id": existing["jd_id"], "status": "unchanged", "version_of": None, "jd": existing.get("jd")}
+
+    prompt = extract_jd(jd_text)
+    llm_response = get_llm_router().invoke_model(prompt, task="jd_extract", response_model=JobDescriptionSchema)
+    parsed = json.dumps(get_llm_router().parse_json_string(llm_response, JobDescriptionSchema), ensure_ascii=False)
+
+    previous_jd_id = existing["jd_id"] if existing else None
+    jd_id = str(uuid.uuid4())
+    with timed("neo4j_write"):
+        stored = db.create_job_description(
+            jd_id=jd_id,
+            file_path=file_path,
+            url=url,
+            type_=type_,
+            jd=parsed,
+            content_hash=digest,
+            canonical_url=canonical,
+            previous_jd_id=previous_jd_id
+        )
+    if not stored["created"]:
+        # A concurrent ingest of the same JD stored it first.
+        logger.info(f"JD stored concurrently as {stored['jd_id']}")
+        return {"jd_id": stored["jd_id"], "status": "unchanged", "version_of": None, "jd": stored["jd"]}
+    return {
+        "jd_id": jd_id,
+        "status": "updated" if previous_jd_id else "created",
+        "version_of": previous_jd_id,
+        "jd": parsed,
+    }
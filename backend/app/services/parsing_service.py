@@ -0,0 +1,216 @@
+import os
+import math
+import time
+import signal
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import List, Optional, Union
+
+from llama_index.core.schema import Document
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Extra time the parent waits past the in-worker alarm before killing the pool.
+HARD_TIMEOUT_GRACE_SECONDS = 5
+# How often a worker samples its own resident set size.
+RSS_POLL_SECONDS = 0.1
+
+
+class ParseError(Exception):
+    """Structured document parsing failure.
+
+    code is one of "unsupported", "timeout", "memory_limit", "worker_crashed" or
+    "failed"; only "worker_crashed" is worth retrying.
+    """
+
+    def __init__(self, code: str, message: str, filename: Optional[str] = None):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+        self.filename = filename
+
+    @property
+    def retryable(self) -> bool:
+        return self.code == "worker_crashed"
+
+    def as_dict(self) -> dict:
+        return {"code": self.code, "message": self.message, "filename": self.filename}
+
+
+class _ParseTimeout(BaseException):
+    # BaseException so reader code catching Exception cannot swallow it.
+    pass
+
+
+class _ParseMemoryLimit(BaseException):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _ParseTimeout()
+
+
+def _on_memory_limit(signum, frame):
+    raise _ParseMemoryLimit()
+
+
+def _rss_mb() -> Optional[float]:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Worker-process state: set while a document is being parsed.
+_parsing = threading.Event()
+_max_memory_mb = 0
+
+
+def _watch_rss():
+    # Signals the main thread (SIGUSR1) once per document when RSS crosses the limit.
+    signalled = False
+    while True:
+        time.sleep(RSS_POLL_SECONDS)
+        if not _parsing.is_set():
+            signalled = False
+            continue
+        rss = _rss_mb()
+        if rss is None:
+            return
+        if rss > _max_memory_mb and not signalled:
+            signalled = True
+            os.kill(os.getpid(), signal.SIGUSR1)
+
+
+def _init_worker(max_memory_mb: int):
+    global _max_memory_mb
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+    _max_memory_mb = max_memory_mb
+    if max_memory_mb and hasattr(signal, "SIGUSR1") and _rss_mb() is not None:
+        signal.signal(signal.SIGUSR1, _on_memory_limit)
+        threading.Thread(target=_watch_rss, name="rss-watchdog", daemon=True).start()
+
+
+def _parse_in_worker(source, filename: Optional[str], timeout: float):
+    """Runs inside a pool process; never raises.
+
+    Returns (result, rss_mb) where result is ("ok", docs) or ("error", code, message)
+    and rss_mb is the worker's resident set size after the document (None if unknown).
+    """
+    from app.modules.loaders import UnsupportedFileError, load_file
+
+    has_alarm = hasattr(signal, "SIGALRM")
+    if has_alarm:
+        signal.alarm(max(1, math.ceil(timeout)))
+    _parsing.set()
+    try:
+        result = "ok", load_file(source, filename, raise_errors=True)
+    except _ParseTimeout:
+        result = "error", "timeout", f"Parsing took longer than {timeout:g}s"
+    except (_ParseMemoryLimit, MemoryError):
+        result = "error", "memory_limit", f"Parsing exceeded {_max_memory_mb} MB resident memory"
+    except UnsupportedFileError as e:
+        result = "error", "unsupported", str(e)
+    except Exception as e:
+        result = "error", "failed", f"{type(e).__name__}: {e}"
+    finally:
+        _parsing.clear()
+        if has_alarm:
+            signal.alarm(0)
+    return result, _rss_mb()
+
+
+class ParsingService:
+    """Parses documents in a pool of sandboxed worker processes.
+
+    Each worker samples its resident set size while parsing and aborts a document
+    that pushes it past ``PARSE_MAX_MEMORY_MB`` (Linux only; elsewhere only the
+    timeout applies). A worker still above the limit after a document, e.g. from
+    fragmentation, gets its pool retired: in-flight documents finish and new ones
+    go to a fresh pool. Workers are also replaced after
+    ``PARSE_MAX_TASKS_PER_WORKER`` documents, and a document is aborted after
+    ``PARSE_TIMEOUT_SECONDS``. A worker that ignores the timeout (stuck in C code)
+    or dies is killed along with its pool, which is rebuilt on next use.
+    Failures surface as ``ParseError``.
+    """
+
+    def __init__(self, workers: int = None, timeout: float = None, max_memory_mb: int = None,
+                 max_tasks_per_worker: int = None):
+        self.workers = workers or settings.PARSE_WORKERS
+        self.timeout = timeout or settings.PARSE_TIMEOUT_SECONDS
+        self.max_memory_mb = settings.PARSE_MAX_MEMORY_MB if max_memory_mb is None else max_memory_mb
+        self.max_tasks_per_worker = max_tasks_per_worker or settings.PARSE_MAX_TASKS_PER_WORKER
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.pool is None:
+                # max_tasks_per_child requires a non-fork start method.
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.max_memory_mb,),
+                    max_tasks_per_child=self.max_tasks_per_worker,
+                )
+            return self.pool
+
+    def _recycle(self, pool: ProcessPoolExecutor):
+        with self.lock:
+            if self.pool is pool:
+                self.pool = None
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _retire(self, pool: ProcessPoolExecutor):
+        # Unlike _recycle, lets the documents already submitted to ``pool`` finish.
+        with self.lock:
+            if self.pool is pool:
+                self.pool = None
+        pool.shutdown(wait=False)
+
+    async def parse(self, source: Union[str, bytes], filename: Optional[str] = None) -> List[Document]:
+        """Parse a path or raw bytes (with ``filename``) into Documents."""
+        name = filename or (source if isinstance(source, str) else None)
+        # One retry when the pool broke under us, e.g. another document got it killed.
+        for attempt in range(2):
+            pool = self._get_pool()
+            try:
+                future = pool.submit(_parse_in_worker, source, filename, self.timeout)
+                result = await asyncio.wait_for(asyncio.wrap_future(future),
+                                                self.timeout + HARD_TIMEOUT_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"Parser worker stuck on {name}; killing pool")
+                self._recycle(pool)
+                raise ParseError("timeout", f"Parsing took longer than {self.timeout:g}s", name)
+            except BrokenProcessPool:
+                self._recycle(pool)
+                if attempt == 0:
+                    continue
+                raise ParseError("worker_crashed", "Parser worker died (out of memory or crashed)", name)
+
+            result, rss_mb = result
+            if self.max_memory_mb and rss_mb is not None and rss_mb > self.max_memory_mb:
+                logger.info(f"Parser worker at {rss_mb:.0f} MB RSS after {name}; retiring pool")
+                self._retire(pool)
+            if result[0] == "ok":
+                return result[1]
+            _, code, message = result
+            raise ParseError(code, message, name)
+
+
+@lru_cache(maxsize=1)
+def get_parsing_service() -> ParsingService:
+    return ParsingService()
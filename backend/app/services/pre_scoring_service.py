@@ -0,0 +1,212 @@
+import re
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+YEARS_REQUIRED = re.compile(r"(\d+)\s*\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+# A years figure only counts as a requirement when phrased as one: "at least 3 years",
+# "5+ years of backend experience", "3年以上". Company age ("founded 20 years ago") does not.
+MIN_YEARS_REQUIRED = re.compile(
+    r"\b(?:at least|minimum(?: of)?|min\.?|over|more than)\s+(\d{1,2})\s*\+?\s*(?:years?|yrs?)\b"
+    r"|\b(\d{1,2})\s*\+?\s*(?:years?|yrs?)(?:['’]s?)?\s+(?:of\s+)?(?:[\w/+#.-]+\s+){0,4}?experience"
+    r"|(\d{1,2})\s*年以上",
+    re.IGNORECASE,
+)
+YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+PRESENT = re.compile(r"\b(present|current|now)\b|現在|至今", re.IGNORECASE)
+
+# Free-text JD section headings.
+REQUIRED_HEADING = re.compile(
+    r"requirement|qualification|must[- ]have|what you(?:'ll| will)? need|looking for|who you are"
+    r"|skills|experience|yêu cầu|必須|応募資格",
+    re.IGNORECASE,
+)
+PREFERRED_HEADING = re.compile(r"nice[- ]to[- ]have|preferred|bonus|plus|ưu tiên|歓迎", re.IGNORECASE)
+# Lines that read as a requirement even outside a requirements section.
+REQUIREMENT_PHRASE = re.compile(
+    r"\bexperience (?:in|with)\b|\bproficien|\bknowledge of\b|\bfamiliar(?:ity)? with\b"
+    r"|\bdegree\b|\bmust\b|\brequired\b|\bability to\b|\bhands-on\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class GateDecision:
+    score: float
+    passed: bool
+    details: dict = field(default_factory=dict)
+
+
+def _is_heading(line: str) -> bool:
+    return len(line) <= 60 and (line.endswith(":") or (line.isupper() and len(line.split()) <= 6)
+                                or bool(REQUIRED_HEADING.fullmatch(line) or PREFERRED_HEADING.fullmatch(line)))
+
+
+def _free_text_qualifications(job_description: str) -> Tuple[List[str], List[str]]:
+    """Requirement lines of a free-text JD.
+
+    Lines under a requirements / nice-to-have heading are taken as required /
+    preferred; other sections (company blurb, responsibilities, benefits) are
+    ignored. A JD without such headings falls back to lines phrased as requirements.
+    """
+    required, preferred, section, has_sections = [], [], None, False
+    for raw in job_description.splitlines():
+        line = raw.strip(" -*•\t")
+        if not line:
+            continue
+        if _is_heading(line):
+            heading = line.rstrip(":")
+            if PREFERRED_HEADING.search(heading):
+                section = "preferred"
+            elif REQUIRED_HEADING.search(heading):
+                section = "required"
+            else:
+                section = None
+            has_sections = has_sections or section is not None
+            continue
+        if section == "required":
+            required.append(line)
+        elif section == "preferred":
+            preferred.append(line)
+    if not has_sections:
+        required = [line.strip(" -*•\t") for line in job_description.splitlines()
+                    if REQUIREMENT_PHRASE.search(line) or MIN_YEARS_REQUIRED.search(line)]
+    return required, preferred
+
+
+def parse_qualifications(job_description: str) -> Tuple[List[str], List[str]]:
+    """Required and preferred qualifications from a JD.
+
+    Accepts the JSON produced by JD extraction or free text (see
+    ``_free_text_qualifications``).
+    """
+    if not job_description:
+        return [], []
+    try:
+        jd = json.loads(job_description)
+        if not isinstance(jd, dict):
+            jd = {}
+        required = jd.get("required_qualifications") or []
+        preferred = jd.get("preferred_qualifications") or []
+    except (TypeError, ValueError):
+        required, preferred = _free_text_qualifications(job_description)
+
+    def clean(items):
+        return [q.strip() for q in items if isinstance(q, str) and q.strip()]
+
+    return clean(required), clean(preferred)
+
+
+def parse_requirements(job_description: str) -> Tuple[List[str], Optional[float]]:
+    """Required qualifications and minimum years of experience from a JD."""
+    qualifications, _ = parse_qualifications(job_description)
+    years = [int(next(g for g in m.groups() if g)) for q in qualifications for m in MIN_YEARS_REQUIRED.finditer(q)]
+    return qualifications, (max(years) if years else None)
+
+
+def candidate_skills(resume: dict) -> List[str]:
+    tech = resume.get("technical_skills") or {}
+    skills = []
+    for key in ("programming_languages", "frameworks", "skills"):
+        skills.extend(s.lower().strip() for s in tech.get(key) or [] if isinstance(s, str) and s.strip())
+    return skills
+
+
+def experience_years(resume: dict) -> float:
+    """Approximate total years of experience from experience[].duration strings."""
+    total = 0.0
+    this_year = date.today().year
+    for exp in resume.get("experience") or []:
+        duration = str(exp.get("duration") or "")
+        explicit = YEARS_REQUIRED.search(duration)
+        if explicit:
+            total += float(explicit.group(1))
+            continue
+        years = [int(y) for y in YEAR.findall(duration)]
+        if PRESENT.search(duration):
+            years.append(this_year)
+        if len(years) >= 2:
+            total += max(0, max(years) - min(years))
+    return total
+
+
+def skill_overlap(qualifications: List[str], skills: List[str]) -> float:
+    """Share of required qualifications that mention at least one of the candidate's skills."""
+    if not qualifications:
+        return 1.0
+    if not skills:
+        return 0.0
+    patterns = [re.compile(rf"(?<!\w){re.escape(skill)}(?!\w)") for skill in set(skills)]
+    matched = sum(1 for q in qualifications if any(p.search(q.lower()) for p in patterns))
+    return matched / len(qualifications)
+
+
+class PreScoringGate:
+    """Cheap deterministic filter run before LLM qualification scoring.
+
+    gate score = w_sim * similarity + w_skill * required-skill overlap + w_exp * experience fit
+    The matcher retrieves ``PRESCORE_OVERFETCH`` times the requested candidates,
+    keeps the best ``limit`` by gate score, and of those sends to the LLM the
+    ones whose gate score reaches ``threshold`` or that are within the ``top_m``
+    best gate scores.
+    """
+
+    def __init__(self, threshold: float = None, top_m: int = None):
+        self.threshold = settings.PRESCORE_THRESHOLD if threshold is None else threshold
+        self.top_m = settings.PRESCORE_TOP_M if top_m is None else top_m
+        self.weights = (
+            settings.PRESCORE_WEIGHT_SIMILARITY,
+            settings.PRESCORE_WEIGHT_SKILLS,
+            settings.PRESCORE_WEIGHT_EXPERIENCE,
+        )
+
+    def score(self, similarity: float, resume_text: Optional[str],
+              qualifications: List[str], required_years: Optional[float]) -> Tuple[float, dict]:
+        try:
+            resume = json.loads(resume_text) if resume_text else {}
+        except ValueError:
+            resume = {}
+        if not isinstance(resume, dict):
+            resume = {}
+
+        overlap = skill_overlap(qualifications, candidate_skills(resume))
+        years = experience_years(resume)
+        experience_fit = 1.0 if not required_years else min(1.0, years / required_years)
+
+        w_sim, w_skill, w_exp = self.weights
+        gate_score = (w_sim * float(similarity or 0.0) + w_skill * overlap + w_exp * experience_fit) / (w_sim + w_skill + w_exp)
+        return gate_score, {
+            "similarity": similarity,
+            "skillOverlap": round(overlap, 3),
+            "experienceYears": years,
+            "requiredYears": required_years,
+        }
+
+    def select(self, job_description: str, candidates: List[Tuple[float, Optional[str]]],
+               limit: Optional[int] = None) -> List[Optional[GateDecision]]:
+        """Gate decisions for (similarity, resume_text) pairs, in input order.
+
+        With ``limit``, only the ``limit`` best candidates by gate score get a
+        decision; the rest are None and should be dropped from the shortlist.
+        """
+        qualifications, required_years = parse_requirements(job_description)
+        scored = [self.score(sim, text, qualifications, required_years) for sim, text in candidates]
+
+        ranking = sorted(range(len(scored)), key=lambda i: scored[i][0], reverse=True)
+        shortlist = set(ranking[:limit] if limit else ranking)
+        top = set(ranking[:self.top_m])
+        decisions = [
+            GateDecision(score=round(s, 4), passed=s >= self.threshold or i in top, details=details)
+            if i in shortlist else None
+            for i, (s, details) in enumerate(scored)
+        ]
+        passed = sum(1 for d in decisions if d and d.passed)
+        logger.info(f"Pre-scoring gate: {len(shortlist)}/{len(decisions)} candidates shortlisted, "
+                    f"{passed} sent to LLM scoring")
+        return decisions
@@ -0,0 +1,240 @@
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from llama_index.core.schema import Document
+
+from app.core.config import settings
+from app.core.telemetry import timed
+from app.db.neo4j import Neo4jDB, get_db
+from app.db.qdrant import get_vector_search
+from app.llms.router import get_llm_router
+from app.modules.hashing import content_hash
+from app.modules.node_parsers import CVSectionNodeParser
+from app.prompts.resumes import extract_resume
+from app.services.parsing_service import ParseError, get_parsing_service
+from app.schemas.resume import ResumeSchema
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionError(Exception):
+    """A file that will fail the same way on every attempt (unreadable, empty)."""
+
+    def __init__(self, message: str, detail: Optional[dict] = None):
+        super().__init__(message)
+        self.detail = detail
+
+
+class VectorIndexError(Exception):
+    """Neo4j holds the new resume but its Qdrant point could not be written."""
+
+    def __init__(self, talent_id: str, cause: Exception):
+        super().__init__(f"Candidate {talent_id} updated in the graph but not in the vector index: {cause}")
+        self.talent_id = talent_id
+
+
+# Semaphores bind to the loop they are first awaited on, so each event loop
+# (the server's, each asyncio.run in a script) gets its own pair.
+_loop_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[asyncio.Semaphore, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _limits() -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    limits = _loop_limits.get(loop)
+    if limits is None:
+        limits = (asyncio.Semaphore(settings.INGEST_LLM_CONCURRENCY),
+                  asyncio.Semaphore(settings.INGEST_IO_CONCURRENCY))
+        _loop_limits[loop] = limits
+    return limits
+
+
+def _duplicate(existing: dict, filename: str) -> dict:
+    logger.info(f"{filename} matches existing candidate {existing['talent_id']} by {existing['match']}")
+    return {
+        "source_file": filename,
+        "talent_id": existing["talent_id"],
+        "full_name": existing.get("full_name"),
+        "duplicate": True,
+        "matched_on": existing["match"],
+    }
+
+
+async def ingest_resume_file(source: Union[str, bytes], filename: str, file_size: Optional[int] = None,
+                             db: Optional[Neo4jDB] = None, force: bool = False,
+                             talent_id: Optional[str] = None) -> dict:
+    """Parse one resume (a path or its raw bytes), extract it with the LLM, write Neo4j and embed into Qdrant.
+
+    Parsing runs in the sandboxed parser pool; the LLM call and the Neo4j/Qdrant writes run
+    in threads under the ``INGEST_LLM_CONCURRENCY`` / ``INGEST_IO_CONCURRENCY``
+    limits, so many files can be in flight at once.
+
+    A file whose raw bytes, or whose normalized text, matches an existing candidate
+    is not processed again: the existing talent_id is returned with
+    ``"duplicate": True``. ``force=True`` skips that check.
+
+    Callers that retry should pass the same ``talent_id`` on every attempt: the
+    Neo4j write is keyed on it, so a retry after a partial write updates the same
+    candidate instead of creating a second one. The dedupe hashes are stored last,
+    once the Qdrant point exists.
+
+    Returns the document metadata of the new candidate. Raises ``IngestionError``
+    for files that cannot be ingested and lets transient errors propagate.
+    """
+    llm_limit, io_limit = _limits()
+    talent_id = talent_id or str(uuid.uuid4())
+    raw = source if isinstance(source, (bytes, bytearray)) else await asyncio.to_thread(Path(source).read_bytes)
+    file_hash = hashlib.sha256(raw).hexdigest()
+
+    own_db = db is None
+    db = db or get_db()
+    try:
+        if not force:
+            async with io_limit:
+                existing = await asyncio.to_thread(db.find_employee_by_hash, file_hash=file_hash)
+            # A match on our own talent_id is an earlier attempt of this same job, not a duplicate.
+            if existing and existing["talent_id"] != talent_id:
+                return _duplicate(existing, filename)
+
+        with timed("parse"):
+            try:
+                documents = await get_parsing_service().parse(source, filename)
+            except ParseError as e:
+                if e.retryable:
+                    raise
+                raise IngestionError(str(e), e.as_dict()) from e
+        if not documents:
+            raise IngestionError("No documents found in file")
+
+        text_hash = content_hash("\n".join(doc.text for doc in documents))
+        if not force:
+            async with io_limit:
+                existing = await asyncio.to_thread(db.find_employee_by_hash, text_hash=text_hash)
+            if existing and existing["talent_id"] != talent_id:
+                return _duplicate(existing, filename)
+
+        prompt = extract_resume(documents)
+        async with llm_limit:
+            llm_response = await asyncio.to_thread(
+                get_llm_router().invoke_model, prompt, task="resume_extract", response_model=ResumeSchema
+            )
+        if not llm_response:
+            raise RuntimeError("LLM returned no response")
+        parse_json_llm = get_llm_router().parse_json_string(llm_response, ResumeSchema)
+        full_name = parse_json_llm.get("full_name")
+
+        async with io_limit:
+            with timed("neo4j_write"):
+                await asyncio.to_thread(db.process_cv, parse_json_llm, talent_id, full_name)
+
+        doc_metadata = {
+            "source_file": filename,
+            "talent_id": talent_id,
+            "full_name": full_name,
+            "processing_timestamp": datetime.now().isoformat(),
+            "file_type": filename.split('.')[-1].lower() if '.' in filename else "unknown",
+            "file_size": file_size if file_size is not None else len(raw),
+            "file_hash": file_hash,
+            "text_hash": text_hash,
+        }
+        docs = [Document(id_=talent_id, text=json.dumps(parse_json_llm, ensure_ascii=False), metadata=doc_metadata)]
+        async with io_limit:
+            await asyncio.to_thread(get_vector_search().create_vector_index, docs, settings.QDRANT_COLLECTION_NAME,
+                                    [CVSectionNodeParser()])
+            # Only now can the file count as a duplicate: a failed Qdrant write leaves no
+            # hashes behind, so the retry processes it again instead of skipping it.
+            await asyncio.to_thread(db.set_employee_hashes, talent_id, file_hash=file_hash, text_hash=text_hash)
+    finally:
+        if own_db:
+            db.close()
+    return doc_metadata
+
+
+async def update_resume_file(talent_id: str, source: Union[str, bytes], filename: str,
+                             file_size: Optional[int] = None, db: Optional[Neo4jDB] = None,
+                             force: bool = False) -> dict:
+    """Re-extract a new version of an existing candidate's resume and apply it in place.
+
+    Only the Neo4j relationships that changed are written (one transaction), and
+    the candidate's Qdrant point is re-embedded under its existing id. A file whose
+    bytes or normalized text match what is already stored is a no-op unless
+    ``force`` is set.
+
+    Returns the document metadata plus ``"changes"`` (added/removed edge counts),
+    or ``"unchanged": True``. Raises ``VectorIndexError`` if the graph was updated
+    but the Qdrant point was not; uploading the same file again completes it.
+    """
+    llm_limit, io_limit = _limits()
+    raw = source if isinstance(source, (bytes, bytearray)) else await asyncio.to_thread(Path(source).read_bytes)
+    file_hash = hashlib.sha256(raw).hexdigest()
+
+    own_db = db is None
+    db = db or get_db()
+    try:
+        async with io_limit:
+            employee = await asyncio.to_thread(db.get_employee, talent_id)
+        if employee is None:
+            raise IngestionError(f"talent_id {talent_id} not found", {"code": "not_found", "talent_id": talent_id})
+        unchanged = {"source_file": filename, "talent_id": talent_id,
+                     "full_name": employee.get("full_name"), "unchanged": True}
+        if not force and employee.get("file_hash") == file_hash:
+            return unchanged
+
+        with timed("parse"):
+            try:
+                documents = await get_parsing_service().parse(source, filename)
+            except ParseError as e:
+                if e.retryable:
+                    raise
+                raise IngestionError(str(e), e.as_dict()) from e
+        if not documents:
+            raise IngestionError("No documents found in file")
+        text_hash = content_hash("\n".join(doc.text for doc in documents))
+        if not force and employee.get("text_hash") == text_hash:
+            return unchanged
+
+        prompt = extract_resume(documents)
+        async with llm_limit:
+            llm_response = await asyncio.to_thread(
+                get_llm_router().invoke_model, prompt, task="resume_extract", response_model=ResumeSchema
+            )
+        if not llm_response:
+            raise RuntimeError("LLM returned no response")
+        parse_json_llm = get_llm_router().parse_json_string(llm_response, ResumeSchema)
+        full_name = parse_json_llm.get("full_name")
+
+        # The old hashes stay until Qdrant is updated too, so if the upsert fails the
+        # same upload is not mistaken for "unchanged" and can simply be retried.
+        async with io_limit:
+            with timed("neo4j_write"):
+                changes = await asyncio.to_thread(db.update_cv, parse_json_llm, talent_id, full_name)
+
+        doc_metadata = {
+            "source_file": filename,
+            "talent_id": talent_id,
+            "full_name": full_name,
+            "processing_timestamp": datetime.now().isoformat(),
+            "file_type": filename.split('.')[-1].lower() if '.' in filename else "unknown",
+            "file_size": file_size if file_size is not None else len(raw),
+            "file_hash": file_hash,
+            "text_hash": text_hash,
+        }
+        async with io_limit:
+            try:
+                await asyncio.to_thread(get_vector_search().upsert_candidate, settings.QDRANT_COLLECTION_NAME,
+                                        talent_id, json.dumps(parse_json_llm, ensure_ascii=False), doc_metadata)
+            except Exception as e:
+                logger.error(f"Qdrant upsert failed for {talent_id} after its Neo4j update: {e}")
+                raise VectorIndexError(talent_id, e) from e
+            await asyncio.to_thread(db.set_employee_hashes, talent_id, file_hash=file_hash, text_hash=text_hash)
+    finally:
+        if own_db:
+            db.close()
+    return {**doc_metadata, "changes": changes}
@@ -0,0 +1,66 @@
+"""
+Measure cold-start time of the API.
+
+Imports `app.main` in a fresh interpreter several times and reports the wall
+time plus which heavy SDKs were pulled in at startup.
+
+Usage (from backend/):
+    python scripts/benchmark_startup.py --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "openai",
+    "boto3",
+    "google.genai",
+    "llama_index.llms.azure_openai",
+    "llama_index.llms.bedrock",
+    "llama_index.llms.gemini",
+    "llama_index.vector_stores.qdrant",
+    "neo4j_graphrag",
+    "playwright",
+    "selenium",
+    "unstructured",
+    "llama_index.readers.file",
+]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    timings = [r["seconds"] for r in results]
+    print(f"runs: {args.runs}")
+    print(f"median: {statistics.median(timings):.3f}s  min: {min(timings):.3f}s  max: {max(timings):.3f}s")
+    print(f"heavy modules loaded at startup: {', '.join(results[-1]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Bulk-import resumes from a directory or a zip archive.
+
+Streams every supported file through parsing, LLM extraction, Neo4j and Qdrant
+with a fixed number of files in flight, appending each outcome to a JSONL
+checkpoint as soon as it completes so an interrupted run picks up where it
+stopped. Reports docs/s and LLM tokens/s as it goes.
+
+Usage (from backend/):
+    python scripts/bulk_import.py /data/resumes.zip --concurrency 32
+    python scripts/bulk_import.py /data/resumes/ --state import.state.jsonl --retry-failed
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Callable, Iterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import init_settings  # noqa: E402
+from app.core.telemetry import start_request_summary  # noqa: E402
+from app.db.neo4j import get_db  # noqa: E402
+from app.modules.loaders import LOADERS  # noqa: E402
+from app.services.resume_ingest_service import IngestionError, ingest_resume_file  # noqa: E402
+
+SUPPORTED = {ext for ext in LOADERS if ext != ".url"}
+
+
+def iter_sources(source: Path) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """Yield (key, read_bytes) for every supported file, in a stable order."""
+    if zipfile.is_zipfile(source):
+        archive = zipfile.ZipFile(source)
+        for info in sorted(archive.infolist(), key=lambda i: i.filename):
+            if not info.is_dir() and Path(info.filename).suffix.lower() in SUPPORTED:
+                yield info.filename, (lambda name=info.filename: archive.read(name))
+        return
+    for path in sorted(p for p in source.rglob("*") if p.is_file()):
+        if path.suffix.lower() in SUPPORTED:
+            yield str(path.relative_to(source)), path.read_bytes
+
+
+def load_state(state_path: Path, retry_failed: bool) -> set:
+    """Keys already handled by a previous run."""
+    if not state_path.exists():
+        return set()
+    outcome = {}
+    with state_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # line torn by a crash mid-write
+            outcome[entry["key"]] = entry["status"]
+    return {key for key, status in outcome.items() if status == "success" or not retry_failed}
+
+
+async def import_one(key: str, read_bytes, db, retries: int, force: bool = False) -> dict:
+    talent_id = str(uuid.uuid4())  # shared by every attempt, so a retry never creates a second candidate
+    for attempt in range(retries + 1):
+        try:
+            metadata = await ingest_resume_file(read_bytes(), Path(key).name, db=db, force=force,
+                                                talent_id=talent_id)
+            return {"key": key, "status": "success", "talent_id": metadata["talent_id"],
+                    "duplicate": metadata.get("duplicate", False)}
+        except IngestionError as e:
+            return {"key": key, "status": "error", "error": str(e), "detail": e.detail}
+        except Exception as e:
+            if attempt == retries:
+                return {"key": key, "status": "error", "error": f"{type(e).__name__}: {e}"}
+            await asyncio.sleep(min(30, 2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+# Print a progress line every this many completed files.
+PROGRESS_EVERY = 32
+
+
+async def run(args):
+    source = Path(args.source)
+    state_path = Path(args.state or f"{source.name}.import-state.jsonl")
+    done = load_state(state_path, args.retry_failed)
+    pending = ((key, read) for key, read in iter_sources(source) if key not in done)
+    print(f"Importing from {source}; {len(done)} files already done per {state_path}")
+
+    init_settings()
+    summary = start_request_summary()
+    db = get_db()
+    start = time.perf_counter()
+    processed = succeeded = started = 0
+
+    def report():
+        elapsed = time.perf_counter() - start
+        tokens = summary.prompt_tokens + summary.completion_tokens
+        print(f"{processed} processed ({succeeded} ok, {processed - succeeded} failed) | "
+              f"{processed / elapsed:.2f} docs/s | {tokens / elapsed:.0f} tokens/s | "
+              f"${summary.cost_usd:.4f}")
+
+    async def worker(state):
+        nonlocal processed, succeeded, started
+        # Workers pull from the shared generator, so a slow file never holds up the others.
+        while not (args.limit and started >= args.limit):
+            item = next(pending, None)
+            if item is None:
+                return
+            started += 1
+            result = await import_one(*item, db, args.retries, args.force)
+            state.write(json.dumps(result, ensure_ascii=False) + "\n")
+            state.flush()
+            os.fsync(state.fileno())
+            processed += 1
+            succeeded += result["status"] == "success"
+            if processed % PROGRESS_EVERY == 0:
+                report()
+
+    try:
+        with state_path.open("a", encoding="utf-8") as state:
+            await asyncio.gather(*[worker(state) for _ in range(args.concurrency)])
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {processed} files in {elapsed:.1f}s ({succeeded} ok, {processed - succeeded} failed)")
+    print(json.dumps(summary.as_dict(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="Directory or .zip of resumes")
+    parser.add_argument("--state", help="Checkpoint file (default: <source>.import-state.jsonl)")
+    parser.add_argument("--concurrency", "--batch-size", type=int, default=32, help="Files in flight at once")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per file on transient errors")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry files that failed in earlier runs")
+    parser.add_argument("--force", action="store_true", help="Re-process files matching an existing candidate")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after this many files")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
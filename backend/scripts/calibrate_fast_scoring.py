@@ -0,0 +1,77 @@
+"""
+Calibrate the fast (embedding) scorer's thresholds against stored LLM scores.
+
+Reads the LLM-scored matching results saved in Neo4j, embeds each scored
+qualification against the candidate's resume, and picks the
+FAST_SCORE_THRESHOLD_PARTIAL / FAST_SCORE_THRESHOLD_STRONG pair that best
+reproduces the LLM's 0/1/2 scores. Prints the values to put in .env.
+
+Usage (from backend/):
+    python scripts/calibrate_fast_scoring.py --limit 500
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import init_settings  # noqa: E402
+from app.db.neo4j import get_db  # noqa: E402
+from app.db.qdrant import get_vector_search  # noqa: E402
+from app.services.fast_scoring_service import FAST_MODE_FEEDBACK, get_fast_scorer  # noqa: E402
+
+
+def llm_scored(results_json) -> list:
+    """(talent_id, [(qualification, score), ...]) for results scored by the LLM."""
+    samples = []
+    for raw in results_json:
+        try:
+            result = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        details = result.get("scoringDetails") or {}
+        if not isinstance(details, dict) or details.get("overallFeedback") == FAST_MODE_FEEDBACK:
+            continue
+        scored = [
+            (item["qualification"], int(item["score"]))
+            for item in (details.get("requiredScores") or []) + (details.get("preferredScores") or [])
+            if isinstance(item, dict) and item.get("qualification") and item.get("score") in (0, 1, 2)
+        ]
+        if scored and result.get("talent_id"):
+            samples.append((result["talent_id"], scored))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=0, help="Use at most this many scored candidates")
+    args = parser.parse_args()
+
+    init_settings()
+    db = get_db()
+    try:
+        samples = llm_scored(db.get_matching_results())
+    finally:
+        db.close()
+    if args.limit:
+        samples = samples[:args.limit]
+
+    vector_search = get_vector_search()
+    pairs = []
+    for talent_id, scored in samples:
+        resume_text = vector_search.get_resume_text_by_talent_id(talent_id)
+        if resume_text:
+            pairs.append((resume_text, scored))
+    if not pairs:
+        print("No LLM-scored matching results with a stored resume; nothing to calibrate.")
+        return
+
+    partial, strong = get_fast_scorer().calibrate(pairs)
+    print(f"Calibrated on {len(pairs)} candidates, {sum(len(s) for _, s in pairs)} qualification scores")
+    print(f"FAST_SCORE_THRESHOLD_PARTIAL={partial:.3f}")
+    print(f"FAST_SCORE_THRESHOLD_STRONG={strong:.3f}")
+
+
+if __name__ == "__main__":
+    main()
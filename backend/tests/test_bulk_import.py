@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import json
+import zipfile
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("llama_index.core")
+pytest.importorskip("prometheus_client")
+pytest.importorskip("qdrant_client")
+pytest.importorskip("neo4j")
+
+from scripts import bulk_import  # noqa: E402
+
+
+class FakeDB:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _write_state(path, entries):
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in entries) + '{"key": "torn', encoding="utf-8")
+
+
+def test_load_state_skips_successes_and_optionally_failures(tmp_path):
+    state = tmp_path / "state.jsonl"
+    _write_state(state, [
+        {"key": "a.pdf", "status": "error"},
+        {"key": "a.pdf", "status": "success"},
+        {"key": "b.pdf", "status": "error"},
+    ])
+    assert bulk_import.load_state(state, retry_failed=False) == {"a.pdf", "b.pdf"}
+    assert bulk_import.load_state(state, retry_failed=True) == {"a.pdf"}
+    assert bulk_import.load_state(tmp_path / "missing.jsonl", retry_failed=False) == set()
+
+
+def test_iter_sources_reads_directories_and_zips_in_order(tmp_path):
+    folder = tmp_path / "resumes"
+    (folder / "sub").mkdir(parents=True)
+    (folder / "b.pdf").write_bytes(b"B")
+    (folder / "sub" / "a.docx").write_bytes(b"A")
+    (folder / "notes.bin").write_bytes(b"skip")
+    assert [(key, read()) for key, read in bulk_import.iter_sources(folder)] == [("b.pdf", b"B"), ("sub/a.docx", b"A")]
+
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("z.pdf", b"Z")
+        zf.writestr("a.txt", b"T")
+        zf.writestr("skip.bin", b"S")
+    assert [(key, read()) for key, read in bulk_import.iter_sources(archive)] == [("a.txt", b"T"), ("z.pdf", b"Z")]
+
+
+def test_run_checkpoints_every_outcome_and_respects_limit(tmp_path, monkeypatch):
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    for i in range(5):
+        (folder / f"{i}.txt").write_bytes(b"x")
+    state = tmp_path / "state.jsonl"
+    db = FakeDB()
+
+    async def fake_import_one(key, read_bytes, db, retries, force=False):
+        await asyncio.sleep(0.01 * (5 - int(key[0])))  # later files finish first
+        return {"key": key, "status": "error" if key == "1.txt" else "success"}
+
+    monkeypatch.setattr(bulk_import, "init_settings", lambda: None)
+    monkeypatch.setattr(bulk_import, "get_db", lambda: db)
+    monkeypatch.setattr(bulk_import, "import_one", fake_import_one)
+    args = argparse.Namespace(source=str(folder), state=str(state), concurrency=2, retries=0,
+                              retry_failed=False, force=False, limit=4)
+
+    asyncio.run(bulk_import.run(args))
+
+    outcomes = [json.loads(line) for line in state.read_text(encoding="utf-8").splitlines()]
+    assert sorted(outcome["key"] for outcome in outcomes) == ["0.txt", "1.txt", "2.txt", "3.txt"]
+    assert db.closed
+
+    # A second run only picks up what is left.
+    asyncio.run(bulk_import.run(argparse.Namespace(**{**vars(args), "limit": 0})))
+    outcomes = [json.loads(line) for line in state.read_text(encoding="utf-8").splitlines()]
+    assert [outcome["key"] for outcome in outcomes[4:]] == ["4.txt"]
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("llama_index.core")
+pytest.importorskip("prometheus_client")
+pytest.importorskip("neo4j")
+
+from app.services.crawl_jd_service import (  # noqa: E402
+    CURSOR_OVERLAP_SECONDS,
+    CrawlResult,
+    cursor_key,
+    retry_cards,
+    search_window,
+)
+
+
+class FakeDB:
+    def __init__(self):
+        self.saved = []
+
+    def save_crawl_cursor(self, *args):
+        self.saved.append(args)
+
+
+def test_first_crawl_has_no_window():
+    assert search_window(None) is None
+    assert search_window({"key": "linkedin:x:y"}) is None
+
+
+def test_window_covers_time_since_last_crawl_plus_overlap():
+    assert search_window({"last_crawled_epoch": 1_000_000}, now=1_003_600) == 3600 + CURSOR_OVERLAP_SECONDS
+
+
+def test_window_never_negative_with_clock_skew():
+    assert search_window({"last_crawled_epoch": 1_000_100}, now=1_000_000) == CURSOR_OVERLAP_SECONDS
+
+
+def test_cursor_key_normalizes_case_and_whitespace():
+    assert cursor_key("  Software   Engineer ", "Viet Nam") == cursor_key("software engineer", "viet  nam")
+
+
+def test_retry_cards_ignores_bad_entries():
+    cursor = {"retry_jobs": json.dumps([{"title": "A", "link": "https://x/1"}, {"title": "B"}, "junk"])}
+    assert retry_cards(cursor) == [{"title": "A", "link": "https://x/1"}]
+    assert retry_cards({"retry_jobs": "not json"}) == []
+    assert retry_cards(None) == []
+
+
+def test_save_cursor_keeps_failed_jobs_for_retry():
+    db = FakeDB()
+    crawl = CrawlResult("Software Engineer", "Vietnam", jobs=[{"link": "https://x/1"}, {"link": "https://x/2"}],
+                        pages_crawled=2, known_jobs=3, newest_url="https://x/1")
+    failed = {"title": "A", "company": "C", "location": "Hanoi", "link": "https://x/2", "description": ""}
+
+    asyncio.run(crawl.save_cursor(db, failed=[failed]))
+
+    [args] = db.saved
+    assert args[:7] == (crawl.key, "Software Engineer", "Vietnam", 2, 2, 3, "https://x/1")
+    assert json.loads(args[7]) == [{"title": "A", "company": "C", "location": "Hanoi", "link": "https://x/2"}]
+
+
+def test_blocked_crawl_keeps_previous_cursor():
+    db = FakeDB()
+    asyncio.run(CrawlResult("Software Engineer", "Vietnam", incomplete=True).save_cursor(db))
+    assert db.saved == []
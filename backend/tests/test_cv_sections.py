@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core import Document  # noqa: E402
+from llama_index.core.schema import MetadataMode  # noqa: E402
+
+from app.modules.node_parsers import CVSectionNodeParser, cv_sections, profile_id, section_id  # noqa: E402
+
+RESUME = {
+    "full_name": "Jane Doe",
+    "experience": [
+        {"company": "Acme", "position": "Backend Engineer", "duration": "2021 - present", "description": "APIs"},
+        {"company": "Initech", "position": "Developer", "duration": "2018 - 2021"},
+    ],
+    "education": [{"degree": "BSc", "major": "Computer Science", "school": "HUST"}],
+    "technical_skills": {"programming_languages": ["Python"], "frameworks": ["FastAPI"], "skills": []},
+    "key_accomplishments": ["Cut p95 latency by 40%"],
+}
+
+
+def _nodes(resume=RESUME, talent_id="t-1"):
+    document = Document(id_=talent_id, text=json.dumps(resume),
+                        metadata={"talent_id": talent_id, "full_name": resume.get("full_name"), "file_hash": "abc"})
+    return CVSectionNodeParser().get_nodes_from_documents([document])
+
+
+def test_one_section_per_entry_profile_first():
+    assert [section for section, _ in cv_sections(RESUME)] == [
+        "profile", "experience", "experience", "education", "skills", "skills", "accomplishments",
+    ]
+    assert cv_sections(RESUME)[0][1] == "Candidate: Jane Doe\nPositions held: Backend Engineer, Developer"
+
+
+def test_node_ids_are_deterministic_and_unique():
+    first, second = _nodes(), _nodes()
+    assert [node.id_ for node in first] == [node.id_ for node in second]
+    assert len({node.id_ for node in first}) == len(first)
+    assert first[0].id_ == profile_id("t-1")
+    assert first[2].id_ == section_id("t-1", "experience", 1)
+    assert _nodes(talent_id="t-2")[0].id_ != first[0].id_
+
+
+def test_nodes_carry_metadata_but_embed_only_section_text():
+    nodes = _nodes()
+    for node in nodes:
+        assert node.metadata["talent_id"] == "t-1"
+        assert "resume_json" not in node.metadata
+        embedded = node.get_content(metadata_mode=MetadataMode.EMBED)
+        assert "t-1" not in embedded and "abc" not in embedded
+    assert [node.metadata["section_index"] for node in nodes[:3]] == [0, 0, 1]
+
+
+def test_non_resume_documents_pass_through():
+    document = Document(text="plain text resume", metadata={"talent_id": "t-3"})
+    [node] = CVSectionNodeParser().get_nodes_from_documents([document])
+    assert node.get_content() == "plain text resume"
+
+
+def test_fast_scoring_uses_the_same_sections():
+    pytest.importorskip("dotenv")
+    pytest.importorskip("numpy")
+    from app.services.fast_scoring_service import resume_sections
+
+    assert resume_sections(json.dumps(RESUME)) == [text for _, text in cv_sections(RESUME)]
+    assert resume_sections("first block\n\nsecond block") == ["first block", "second block"]
+
+
+def test_best_section_per_candidate():
+    pytest.importorskip("dotenv")
+    pytest.importorskip("qdrant_client")
+    pytest.importorskip("neo4j")
+    from app.db.qdrant import VectorSearchQdant
+
+    records = [
+        ({"talent_id": "a", "section": "skills"}, 0.71),
+        ({"talent_id": "b", "section": "profile"}, 0.80),
+        ({"talent_id": "a", "section": "experience"}, 0.90),
+        ({"talent_id": "c", "section": "skills"}, 0.60),
+        ({"talent_id": "b", "section": "skills"}, 0.50),
+    ]
+    best = VectorSearchQdant._best_per_candidate(records, number_candidate=2)
+    assert [(record[0]["talent_id"], record[1]) for record in best] == [("a", 0.90), ("b", 0.80)]
@@ -0,0 +1,43 @@
+import pytest
+
+from app.modules.hashing import content_hash
+
+
+def test_content_hash_ignores_case_whitespace_and_unicode_form():
+    assert content_hash("Senior  Python\nEngineer ") == content_hash("senior python engineer")
+    # NFKC folds full-width and compatibility characters.
+    assert content_hash("Ｐｙｔｈｏｎ ﬁle") == content_hash("python file")
+
+
+def test_content_hash_distinguishes_content():
+    assert content_hash("python engineer") != content_hash("java engineer")
+    assert content_hash(None) == content_hash("")
+
+
+@pytest.fixture
+def canonical_url():
+    pytest.importorskip("dotenv")
+    pytest.importorskip("llama_index.core")
+    pytest.importorskip("neo4j")
+    from app.services.jd_service import canonical_url
+
+    return canonical_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/jobs/view/senior-engineer-at-acme-3912345678?refId=abc&trackingId=xyz",
+    "https://vn.linkedin.com/jobs/view/3912345678/",
+    "https://linkedin.com/jobs/view/3912345678#top",
+])
+def test_linkedin_postings_collapse_to_job_id(canonical_url, url):
+    assert canonical_url(url) == "https://www.linkedin.com/jobs/view/3912345678/"
+
+
+def test_tracking_params_fragment_and_host_case_are_dropped(canonical_url):
+    assert (canonical_url("HTTPS://WWW.Example.com/careers/42/?utm_source=x&b=2&a=1#apply")
+            == "https://example.com/careers/42?a=1&b=2")
+
+
+def test_blank_url_has_no_canonical_form(canonical_url):
+    assert canonical_url(None) is None
+    assert canonical_url("   ") is None
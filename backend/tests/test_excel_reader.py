@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("llama_index.core")
+
+from app.loaders.excel import PandasExcelReader  # noqa: E402
+
+
+def test_frame_rows_joins_cells_and_drops_empty_rows():
+    df = pd.DataFrame({
+        "name": [" Jane ", None, "Bob"],
+        "skill": ["Python", None, None],
+        "years": ["5 years", None, "3"],
+    })
+    assert PandasExcelReader._frame_rows(df) == ["Jane Python 5 years", "Bob 3"]
+
+
+def test_frame_rows_of_empty_frame():
+    assert PandasExcelReader._frame_rows(pd.DataFrame()) == []
+
+
+def test_documents_are_chunked_by_rows():
+    reader = PandasExcelReader(rows_per_document=2)
+    docs = list(reader._documents(["r1", "r2", "r3"], "Sheet1", "people.xlsx", {"source": "upload"}))
+    assert [doc.text for doc in docs] == ["r1\nr2", "r3"]
+    assert docs[0].metadata == {"file_name": "people.xlsx", "sheet_name": "Sheet1", "source": "upload"}
+
+
+def test_streamed_xlsx_matches_rows():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "People"
+    sheet.append(["name", "skill"])
+    sheet.append(["Jane", "Python"])
+    sheet.append([None, None])
+    sheet.append(["Bob", " SQL "])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    docs = PandasExcelReader(stream=True, rows_per_document=2).load_data(buffer)
+
+    assert [doc.text for doc in docs] == ["name skill\nJane Python", "Bob SQL"]
+    assert {doc.metadata["sheet_name"] for doc in docs} == {"People"}
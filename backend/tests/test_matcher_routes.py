@@ -0,0 +1,113 @@
+"""Route-level smoke tests for /find_matching_candidates_score/ in every scoring mode.
+
+Retrieval, scoring and Neo4j are replaced with in-memory fakes; the request
+still goes through the route, the pre-scoring gate and the response assembly.
+"""
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("llama_index.core")
+pytest.importorskip("qdrant_client")
+pytest.importorskip("neo4j")
+pytest.importorskip("numpy")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.v1.routes import matcher  # noqa: E402
+from app.core.security import get_current_user  # noqa: E402
+from app.db.neo4j import get_db  # noqa: E402
+
+RESUME = json.dumps({
+    "full_name": "Jane Doe",
+    "experience": [{"company": "Acme", "position": "Backend Engineer", "duration": "2019 - present",
+                    "description": "Built Python services"}],
+    "technical_skills": {"programming_languages": ["Python"], "frameworks": ["FastAPI"], "skills": ["SQL"]},
+})
+JOB_DESCRIPTION = "Requirements:\n- 3+ years of Python experience\n- FastAPI"
+
+
+class FakeVectorSearch:
+    def retrieve_from_qdrant_neo4j(self, query_text, number_candidate):
+        return [({"talent_id": "t-1", "full_name": "Jane Doe"}, 0.82)]
+
+    def get_resume_text_by_talent_id(self, talent_id):
+        return RESUME
+
+
+class FakeEvaluationService:
+    async def score_candidate_qualifications(self, candidate_resume, job_description, mode="llm"):
+        return {"totalScore": 7, "requiredScores": [], "preferredScores": []}
+
+
+class FakeFastScorer:
+    def score_many(self, job_description, resume_texts):
+        return [{"totalScore": 5} for _ in resume_texts]
+
+
+class FakeDB:
+    def __init__(self):
+        self.uploaded = []
+
+    def upload_matching_results(self, results):
+        self.uploaded.append(results)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(matcher, "get_vector_search", FakeVectorSearch)
+    monkeypatch.setattr(matcher, "get_evaluation_service", FakeEvaluationService)
+    monkeypatch.setattr(matcher, "get_fast_scorer", FakeFastScorer)
+    return FakeDB()
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(matcher.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: "tester"
+    return TestClient(app)
+
+
+def _request(scoring_mode: str) -> dict:
+    return {"question": "python backend engineer", "number_candidate": 1, "job_description": JOB_DESCRIPTION,
+            "use_gate": True, "scoring_mode": scoring_mode}
+
+
+def _events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.parametrize("scoring_mode, score", [("llm", 7), ("fast", 5)])
+def test_score_route(client, db, scoring_mode, score):
+    response = client.post("/api/v1/find_matching_candidates_score/", json=_request(scoring_mode))
+
+    assert response.status_code == 200
+    [result] = response.json()["results"]
+    assert result["talent_id"] == "t-1"
+    assert result["qualificationScore"] == score
+    assert "preScore" in result
+    assert db.uploaded == [{"results": response.json()["results"]}]
+
+
+def test_score_stream_route(client, db):
+    response = client.post("/api/v1/find_matching_candidates_score/stream", json=_request("llm"))
+
+    assert response.status_code == 200
+    events = _events(response.text)
+    assert [name for name, _ in events] == ["candidates", "shortlist", "score", "done"]
+    assert events[0][1]["results"][0]["talent_id"] == "t-1"
+    assert events[1][1] == {"ranks": [0]}
+    assert events[2][1]["rank"] == 0 and events[2][1]["qualificationScore"] == 7
+    scored = {key: value for key, value in events[2][1].items() if key != "rank"}
+    assert events[3][1]["results"] == [scored]
+    assert db.uploaded == [{"results": [scored]}]